@@ -36,3 +36,19 @@ def mock_chrome(mock_tab, monkeypatch):
     mock_chrome_cls = MagicMock(return_value=chrome_instance)
     monkeypatch.setattr("web_inspector_mcp.browser_session.Chrome", mock_chrome_cls)
     return chrome_instance
+
+
+@pytest.fixture(autouse=True)
+def clear_capture_cache():
+    from web_inspector_mcp.capture_cache import capture_cache
+
+    capture_cache.clear()
+    yield
+    capture_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def har_dir(tmp_path, monkeypatch):
+    # Saved captures are confined to a directory; tests use their own
+    monkeypatch.setattr('web_inspector_mcp.har_files.HAR_DIR', str(tmp_path))
+    return tmp_path
@@ -0,0 +1,64 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from web_inspector_mcp.tools.analyze_page import analyze_page
+
+
+@pytest.fixture
+def recorded_page(mock_tab):
+    mock_capture = MagicMock()
+    mock_capture.entries = [
+        {
+            'request': {'url': 'http://example.com/api/users', 'method': 'GET'},
+            'response': {
+                'status': 200,
+                'bodySize': 100,
+                'content': {'text': json.dumps([{'id': 1}])},
+            },
+            '_resourceType': 'Fetch',
+            'startedDateTime': '2023-01-01T00:00:00Z',
+            'time': 12.0,
+        },
+        {
+            'request': {'url': 'http://example.com/logo.png', 'method': 'GET'},
+            'response': {'status': 200, 'bodySize': 500},
+            '_resourceType': 'Image',
+            'startedDateTime': '2023-01-01T00:00:01Z',
+            'time': 30.0,
+        },
+    ]
+    mock_record_ctx = AsyncMock()
+    mock_record_ctx.__aenter__.return_value = mock_capture
+    mock_tab.request.record.return_value = mock_record_ctx
+    return mock_tab
+
+
+@pytest.mark.asyncio
+async def test_analyze_page_runs_all_analyses_on_one_load(mock_chrome, recorded_page):
+    res = await analyze_page("http://example.com", wait=0)
+
+    recorded_page.go_to.assert_awaited_once()
+    assert res['total_requests'] == 2
+    assert res['analyses'] == ['network', 'intercept', 'endpoints', 'performance', 'schema', 'audit', 'connections']
+    assert res['network']['total_requests'] == 2
+    assert res['intercept']['matched_count'] == 1
+    assert res['endpoints']['total_endpoints'] == 1
+    assert res['performance']['total_transfer_bytes'] == 600
+    assert res['schema']['apis_found'] == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_page_subset_skips_timing(mock_chrome, recorded_page):
+    res = await analyze_page("http://example.com", ['endpoints', 'schema'], wait=0)
+
+    assert set(res) == {'page_url', 'total_requests', 'analyses', 'from_cache', 'endpoints', 'schema'}
+    recorded_page.execute_script.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_analyze_page_unknown_analysis(mock_chrome, recorded_page):
+    with pytest.raises(ValueError):
+        await analyze_page("http://example.com", ['screenshots'], wait=0)
+    recorded_page.go_to.assert_not_awaited()
@@ -0,0 +1,128 @@
+import base64
+import gzip
+
+import pytest
+
+from web_inspector_mcp.audit import (
+    REVALIDATION_BYTES,
+    AuditAggregator,
+    audit_capture,
+    cache_lifetime,
+    compressed_sizes,
+)
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.tools.measure_performance import measure_performance
+
+SCRIPT = ('function add(a, b) { return a + b; }\n' * 200).encode()
+
+
+def _entry(url, type_, mime, size, headers=None, text=None, encoding=None, status=200):
+    content = {'mimeType': mime}
+    if text is not None:
+        content['text'] = text
+    if encoding:
+        content['encoding'] = encoding
+    return {
+        'request': {'url': url, 'method': 'GET'},
+        'response': {
+            'status': status,
+            'bodySize': size,
+            'headers': [{'name': k, 'value': v} for k, v in (headers or {}).items()],
+            'content': content,
+        },
+        '_resourceType': type_,
+    }
+
+
+def test_cache_lifetime():
+    assert cache_lifetime({'cache-control': 'public, max-age=31536000'}) == 31536000
+    assert cache_lifetime({'cache-control': 'max-age=600, no-cache'}) == 0
+    assert cache_lifetime({'cache-control': 'no-store'}) == 0
+    assert cache_lifetime({'cache-control': 'max-age=soon'}) == 0
+    assert cache_lifetime({
+        'expires': 'Wed, 02 Oct 2024 10:00:00 GMT', 'date': 'Wed, 02 Oct 2024 09:00:00 GMT',
+    }) == 3600
+    assert cache_lifetime({'expires': '0'}) == 0
+    assert cache_lifetime({}) is None
+
+
+def test_compressed_sizes_scale_long_bodies(monkeypatch):
+    assert compressed_sizes(SCRIPT)['gzip'] == len(gzip.compress(SCRIPT, 6))
+    half = len(SCRIPT) // 2
+    monkeypatch.setattr('web_inspector_mcp.audit.SAMPLE_BYTES', half)
+    assert compressed_sizes(SCRIPT)['gzip'] == len(gzip.compress(SCRIPT[:half], 6)) * 2
+
+
+def test_audit_ranks_findings():
+    long_cache = {'Cache-Control': 'max-age=31536000', 'Content-Encoding': 'gzip'}
+    png = base64.b64encode(b'\x89PNG' + b'\x00' * 100).decode()
+    entries = [
+        # Served uncompressed, cached for an hour
+        _entry('https://a.com/app.js', 'Script', 'application/javascript', len(SCRIPT),
+               {'Cache-Control': 'max-age=3600', 'ETag': '"1"'}, SCRIPT.decode()),
+        # Compressed and cached: nothing to fix
+        _entry('https://a.com/lib.js', 'Script', 'text/javascript; charset=utf-8', 2000, long_cache, SCRIPT.decode()),
+        # The same image twice, heavy and in a legacy format
+        _entry('https://a.com/hero.png', 'Image', 'image/png', 300 * 1024, long_cache, png, 'base64'),
+        _entry('https://cdn.a.com/hero.png', 'Image', 'image/png', 300 * 1024, long_cache, png, 'base64'),
+        # No cache headers at all, body not recorded
+        _entry('https://a.com/font.woff2', 'Font', 'font/woff2', 40000),
+        _entry('https://a.com/missing.js', 'Script', 'application/javascript', 0, status=404),
+    ]
+
+    result = audit_capture(PageCapture(url='https://a.com/', entries=entries))
+
+    assert result['audited_responses'] == 5
+    assert result['responses_without_body'] == 1
+    by_check = {(f['check'], f['url']): f for f in result['findings']}
+    uncompressed = by_check[('uncompressed', 'https://a.com/app.js')]
+    assert uncompressed['wasted_bytes'] == len(SCRIPT) - uncompressed['compressed_bytes']['gzip']
+    cache = by_check[('cache_lifetime', 'https://a.com/app.js')]
+    assert cache['ttl_s'] == 3600 and cache['validator']
+    # Revalidated with its ETag, so only a 304's headers are wasted
+    assert cache['wasted_bytes'] == REVALIDATION_BYTES
+    assert by_check[('cache_lifetime', 'https://a.com/font.woff2')]['ttl_s'] is None
+    duplicate = by_check[('duplicate', 'https://a.com/hero.png')]
+    assert duplicate['wasted_bytes'] == 300 * 1024
+    assert duplicate['other_urls'] == ['https://cdn.a.com/hero.png']
+    assert by_check[('large_image', 'https://a.com/hero.png')]['wasted_bytes'] == 100 * 1024
+    assert by_check[('legacy_image_format', 'https://a.com/hero.png')]['format'] == 'image/png'
+    assert not any(f['url'] == 'https://a.com/lib.js' for f in result['findings'])
+
+    wasted = [f['wasted_bytes'] for f in result['findings']]
+    assert wasted == sorted(wasted, reverse=True)
+    # 300 KB at 1600 kbit/s
+    assert duplicate['wasted_ms'] == 1500
+    assert result['by_check']['large_image']['findings'] == 2
+    # Each resource counts once, by its largest saving
+    assert result['total_wasted_bytes'] == 300 * 1024 + 100 * 1024 + 40000 + uncompressed['wasted_bytes']
+
+
+def test_audit_revalidation_costs_the_304_headers():
+    entry = _entry('https://a.com/app.css', 'Stylesheet', 'text/css', 50000,
+                   {'Cache-Control': 'no-cache', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+    entry['response']['headersSize'] = 250
+    aggregator = AuditAggregator()
+    aggregator.add(entry)
+
+    finding, = aggregator.result()['findings']
+    assert finding['ttl_s'] == 0
+    assert finding['wasted_bytes'] == 250
+
+
+def test_audit_summary():
+    aggregator = AuditAggregator()
+    aggregator.add(_entry('https://a.com/font.woff2', 'Font', 'font/woff2', 40000))
+    assert aggregator.summary() == '1 responses audited, 1 findings'
+
+
+@pytest.mark.asyncio
+async def test_measure_performance_audit_uses_throttled_throughput(mock_chrome, mock_tab):
+    mock_tab.request.record.return_value.__aenter__.return_value.entries = [
+        _entry('https://a.com/font.woff2', 'Font', 'font/woff2', 40000),
+    ]
+
+    result = await measure_performance('https://a.com/', wait=0, audit=True, throttle=['fast-4g'])
+
+    assert result['audit']['throughput_kbps'] == 8100
+    assert result['audit']['findings'][0]['check'] == 'cache_lifetime'
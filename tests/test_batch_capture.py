@@ -0,0 +1,98 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from web_inspector_mcp.tools.analyze_page import ANALYSES
+from web_inspector_mcp.tools.batch_capture import batch_capture
+
+
+@pytest.fixture
+def shared_tab(mock_chrome, mock_tab):
+    mock_chrome.new_tab.return_value = mock_tab
+    mock_capture = MagicMock()
+    mock_capture.entries = [
+        {
+            'request': {'url': 'http://api.domain.com/data', 'method': 'GET'},
+            'response': {'status': 200, 'bodySize': 10},
+            '_resourceType': 'Fetch',
+            'startedDateTime': '2023-01-01T00:00:00Z',
+        },
+        {
+            'request': {'url': 'http://cdn.domain.com/app.js', 'method': 'GET'},
+            'response': {'status': 200, 'bodySize': 20},
+            '_resourceType': 'Script',
+            'startedDateTime': '2023-01-01T00:00:01Z',
+        },
+    ]
+    mock_record_ctx = AsyncMock()
+    mock_record_ctx.__aenter__.return_value = mock_capture
+    mock_tab.request.record.return_value = mock_record_ctx
+    return mock_tab
+
+
+@pytest.mark.asyncio
+async def test_batch_capture_aggregates(mock_chrome, shared_tab):
+    async def go_to(url):
+        if 'broken' in url:
+            raise RuntimeError('net::ERR_NAME_NOT_RESOLVED')
+
+    shared_tab.go_to.side_effect = go_to
+    streamed = []
+
+    async def on_result(item, done, total):
+        streamed.append((item['url'], done, total))
+
+    urls = ['http://a.com', 'http://broken.com', 'http://b.com']
+    res = await batch_capture(urls, concurrency=2, wait=0, on_result=on_result)
+
+    # One shared browser, one isolated context per URL
+    assert mock_chrome.start.await_count == 1
+    assert mock_chrome.create_browser_context.await_count == 3
+    assert mock_chrome.delete_browser_context.await_count == 3
+
+    assert res['total_urls'] == 3
+    assert res['succeeded'] == 2
+    assert res['failed'] == 1
+    assert res['failures'] == [{'url': 'http://broken.com', 'error': 'RuntimeError: net::ERR_NAME_NOT_RESOLVED'}]
+    assert res['total_requests'] == 4
+    assert res['by_domain'] == {'api.domain.com': 2, 'cdn.domain.com': 2}
+
+    # Results keep input order; partial results were streamed as they finished
+    assert [r['url'] for r in res['results']] == urls
+    assert res['results'][0]['network']['total_requests'] == 2
+    assert sorted(u for u, _, _ in streamed) == sorted(urls)
+    assert [d for _, d, _ in streamed] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_batch_capture_reports_failed_analysis(mock_chrome, shared_tab, monkeypatch):
+    def network(capture, pattern):
+        if 'b.com' in capture.url:
+            raise KeyError('response')
+        return {'total_requests': len(capture.entries)}
+
+    monkeypatch.setitem(ANALYSES, 'network', network)
+
+    res = await batch_capture(['http://a.com', 'http://b.com'], wait=0)
+
+    assert res['succeeded'] == 1
+    assert res['failures'] == [{'url': 'http://b.com', 'error': "KeyError: 'response'"}]
+    assert res['total_requests'] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_capture_uses_cache(mock_chrome, shared_tab):
+    await batch_capture(['http://a.com'], ['endpoints'], wait=0)
+    res = await batch_capture(['http://a.com'], ['endpoints'], wait=0)
+
+    assert res['results'][0]['from_cache'] is True
+    assert res['results'][0]['endpoints']['total_endpoints'] == 1
+    assert shared_tab.go_to.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_capture_validates_arguments(mock_chrome):
+    with pytest.raises(ValueError):
+        await batch_capture(['http://a.com'], ['screenshots'])
+    with pytest.raises(ValueError):
+        await batch_capture(['http://a.com'], concurrency=0)
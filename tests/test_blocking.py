@@ -0,0 +1,105 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from web_inspector_mcp.blocking import (
+    AD_HOSTS,
+    ANALYTICS_HOSTS,
+    RequestBlocker,
+    blocked_summary,
+    resolve_block,
+)
+from web_inspector_mcp.tools.discover_endpoints import discover_endpoints
+
+
+def test_resolve_block_types_profiles_and_patterns():
+    types, patterns = resolve_block(['Image', 'font', 'tracker.example.com', '*://cdn.test/*.js'])
+    assert types == {'Image', 'Font'}
+    assert patterns == ('*tracker.example.com/*', '*://cdn.test/*.js')
+
+    types, patterns = resolve_block(['api', 'static'])
+    assert {'Image', 'Font', 'Media', 'Stylesheet'} <= types
+    assert patterns == (*ANALYTICS_HOSTS, *AD_HOSTS)
+
+    assert resolve_block(None) == (frozenset(), ())
+
+
+def test_resolve_block_rejects_unknown_words():
+    with pytest.raises(ValueError, match='Unknown block entry'):
+        resolve_block(['images'])
+
+
+@pytest.mark.asyncio
+async def test_request_blocker_applies_and_clears_blocking(mock_tab):
+    async with RequestBlocker(mock_tab, *resolve_block(['image', 'ads'])) as blocker:
+        commands = [c.args[0] for c in mock_tab._execute_command.await_args_list]
+        assert commands[0]['method'] == 'Network.setBlockedURLs'
+        assert commands[0]['params']['urls'] == AD_HOSTS
+        assert commands[1]['method'] == 'Fetch.enable'
+        assert commands[1]['params']['patterns'] == [
+            {'urlPattern': '*', 'resourceType': 'Image', 'requestStage': 'Request'},
+        ]
+        event, handler = mock_tab.on.await_args.args
+        assert event == 'Fetch.requestPaused'
+
+        await handler({'params': {'requestId': 'interception-1'}})
+        failed = mock_tab._execute_command.await_args.args[0]
+        assert failed['method'] == 'Fetch.failRequest'
+        assert failed['params'] == {'requestId': 'interception-1', 'errorReason': 'BlockedByClient'}
+
+    assert blocker.types == {'Image'}
+    methods = [c.args[0]['method'] for c in mock_tab._execute_command.await_args_list[-2:]]
+    assert methods == ['Fetch.disable', 'Network.setBlockedURLs']
+    mock_tab.remove_callback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_request_blocker_without_rules_is_a_no_op(mock_tab):
+    async with RequestBlocker(mock_tab):
+        pass
+    mock_tab._execute_command.assert_not_awaited()
+    mock_tab.on.assert_not_awaited()
+
+
+def test_blocked_summary():
+    blocked = {'statusText': 'net::ERR_BLOCKED_BY_CLIENT'}
+    entries = [
+        {'_resourceType': 'Image', 'response': blocked},
+        {'_resourceType': 'Image', 'response': blocked},
+        {'response': blocked},
+        {'_resourceType': 'Fetch', 'response': {'statusText': 'OK'}},
+    ]
+    assert blocked_summary(entries) == {'total': 3, 'by_type': {'Image': 2, 'Other': 1}}
+
+
+@pytest.mark.asyncio
+async def test_discover_endpoints_reports_blocked(mock_chrome, mock_tab, monkeypatch):
+    capture = MagicMock(entries=[
+        {
+            'request': {'url': 'http://example.com/api/items', 'method': 'GET'},
+            '_resourceType': 'XHR',
+            'response': {'statusText': 'OK'},
+        },
+        {
+            'request': {'url': 'http://example.com/logo.png', 'method': 'GET'},
+            '_resourceType': 'Image',
+            'response': {'statusText': 'net::ERR_BLOCKED_BY_CLIENT'},
+        },
+    ])
+    record_ctx = AsyncMock()
+    record_ctx.__aenter__.return_value = capture
+    record = MagicMock(return_value=record_ctx)
+    monkeypatch.setattr('web_inspector_mcp.capture.record', record)
+
+    res = await discover_endpoints("http://example.com", wait=0, block=['static'])
+    # Metadata only: no response bodies are fetched
+    assert record.call_args.kwargs['fetch_bodies'] is False
+
+    assert res['total_endpoints'] == 1
+    assert res['blocked'] == {'total': 1, 'by_type': {'Image': 1}}
+    methods = [c.args[0]['method'] for c in mock_tab._execute_command.await_args_list]
+    assert 'Fetch.enable' in methods
+
+    unblocked = await discover_endpoints("http://example.com", wait=0)
+    assert 'blocked' not in unblocked
+    assert unblocked['from_cache'] is False  # blocked captures aren't shared
@@ -1,10 +1,17 @@
+import asyncio
+
 import pytest
 
 from web_inspector_mcp.browser_session import (
+    BrowserPool,
     _default_options,
+    browser_pool,
     browser_session,
     extract_result,
+    get_pool,
+    isolated_tab,
     run_js,
+    shared_browser,
 )
 
 
@@ -48,3 +55,111 @@ async def test_run_js(mock_chrome, mock_tab):
     assert result == "some_value"
     mock_tab.go_to.assert_awaited_once_with("http://example.com")
     mock_tab.execute_script.assert_awaited_once_with("return 1;")
+
+
+@pytest.mark.asyncio
+async def test_isolated_tab_disposes_context(mock_chrome):
+    mock_chrome.create_browser_context.return_value = 'ctx-1'
+    async with isolated_tab(mock_chrome) as tab:
+        assert tab is mock_chrome.new_tab.return_value
+    mock_chrome.new_tab.assert_awaited_once_with(browser_context_id='ctx-1')
+    mock_chrome.new_tab.return_value.close.assert_awaited_once()
+    mock_chrome.delete_browser_context.assert_awaited_once_with('ctx-1')
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_leases_isolated_tabs(mock_chrome):
+    async with browser_pool(size=2, max_uses=10) as pool:
+        assert get_pool() is pool
+        assert mock_chrome.start.await_count == 2
+        assert pool.idle_count == 2
+
+        async with browser_session() as tab:
+            assert tab is mock_chrome.new_tab.return_value
+            assert pool.idle_count == 1
+        assert pool.idle_count == 2
+        mock_chrome.delete_browser_context.assert_awaited_once()
+        # Warm browsers are reused: no extra launches
+        assert mock_chrome.start.await_count == 2
+
+    assert get_pool() is None
+    assert mock_chrome.stop.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_recycles_after_max_uses(mock_chrome):
+    pool = BrowserPool(size=1, max_uses=1)
+    await pool.start()
+    async with pool.lease():
+        pass
+    await asyncio.gather(*pool._replenishing)
+    assert mock_chrome.stop.await_count == 1
+    assert mock_chrome.start.await_count == 2
+    assert pool.idle_count == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_relaunches_unhealthy_browser(mock_chrome):
+    pool = BrowserPool(size=1)
+    await pool.start()
+    mock_chrome.get_version.side_effect = [Exception('dead'), {}]
+    async with pool.lease():
+        pass
+    assert mock_chrome.stop.await_count == 1
+    assert mock_chrome.start.await_count == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_launch_failure(mock_chrome):
+    mock_chrome.start.side_effect = Exception('no chrome')
+    pool = BrowserPool(size=1)
+    await pool.start()
+    with pytest.raises(RuntimeError):
+        async with pool.lease():
+            pass
+    # The slot is returned so a later lease can retry the launch
+    assert pool.idle_count == 1
+    await pool.close()
+    with pytest.raises(RuntimeError):
+        async with pool.lease():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_shared_browser_without_pool(mock_chrome):
+    async with shared_browser() as browser:
+        assert browser is mock_chrome
+    mock_chrome.start.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_shared_browser_from_pool(mock_chrome):
+    async with browser_pool(size=1) as pool:
+        async with shared_browser() as browser:
+            assert browser is mock_chrome
+            assert pool.idle_count == 0
+        assert pool.idle_count == 1
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_recycles_cancelled_lease(mock_chrome):
+    pool = BrowserPool(size=1, max_uses=100)
+    await pool.start()
+
+    async def abandoned():
+        async with pool.lease():
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(abandoned())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.gather(*pool._replenishing)
+
+    assert mock_chrome.stop.await_count == 1
+    assert mock_chrome.start.await_count == 2
+    assert pool.idle_count == 1
+    await pool.close()
@@ -0,0 +1,204 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from web_inspector_mcp.capture import PageCapture, capture_page
+
+
+def _record(mock_tab, entries):
+    mock_capture = MagicMock()
+    mock_capture.entries = entries
+    mock_record_ctx = AsyncMock()
+    mock_record_ctx.__aenter__.return_value = mock_capture
+    mock_tab.request.record.return_value = mock_record_ctx
+
+
+@pytest.mark.asyncio
+async def test_capture_page_records_entries_and_timing(mock_chrome, mock_tab):
+    entries = [{'request': {'url': 'http://example.com/api', 'method': 'GET'}}]
+    _record(mock_tab, entries)
+    mock_tab.execute_script.return_value = {
+        'id': 1, 'result': {'result': {'value': json.dumps({'ttfb': 42})}},
+    }
+
+    capture = await capture_page("http://example.com", wait=0)
+
+    assert isinstance(capture, PageCapture)
+    assert capture.url == "http://example.com"
+    assert capture.entries == entries
+    assert capture.timing == {'ttfb': 42}
+    assert capture.settled_by == 'timeout'
+    mock_tab.go_to.assert_awaited_once_with("http://example.com")
+
+
+@pytest.mark.asyncio
+async def test_capture_page_without_timing(mock_chrome, mock_tab):
+    _record(mock_tab, [])
+
+    capture = await capture_page("http://example.com", wait=0, with_timing=False)
+
+    assert capture.timing == {}
+    mock_tab.execute_script.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_capture_page_ignores_non_dict_timing(mock_chrome, mock_tab):
+    _record(mock_tab, [])
+
+    capture = await capture_page("http://example.com", wait=0)
+
+    assert capture.timing == {}
+
+
+@pytest.mark.asyncio
+async def test_capture_page_collects_links(mock_chrome, mock_tab):
+    _record(mock_tab, [])
+    mock_tab.execute_script.return_value = {
+        'id': 1, 'result': {'result': {'value': json.dumps({
+            'url': 'https://www.example.com/', 'links': ['http://example.com/a'],
+        })}},
+    }
+
+    plain = await capture_page("http://example.com", wait=0, with_timing=False)
+    linked = await capture_page("http://example.com", wait=0, with_timing=False, with_links=True)
+    again = await capture_page("http://example.com", wait=0, with_timing=False, with_links=True)
+
+    assert plain.links is None
+    # The cached capture had no links, so the page was loaded again
+    assert not linked.from_cache
+    assert linked.links == ['http://example.com/a']
+    assert linked.final_url == 'https://www.example.com/'
+    assert again.from_cache
+    assert again.links == ['http://example.com/a']
+
+
+@pytest.mark.asyncio
+async def test_capture_page_served_from_cache(mock_chrome, mock_tab):
+    _record(mock_tab, [{'request': {'url': 'http://example.com/api'}}])
+
+    first = await capture_page("http://example.com", wait=0, with_timing=False)
+    second = await capture_page("http://EXAMPLE.com", wait=0, with_timing=False)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.entries == first.entries
+    assert mock_tab.go_to.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_capture_page_fresh_bypasses_cache(mock_chrome, mock_tab):
+    _record(mock_tab, [])
+
+    await capture_page("http://example.com", wait=0, with_timing=False)
+    again = await capture_page("http://example.com", wait=0, with_timing=False, fresh=True)
+
+    assert not again.from_cache
+    assert mock_tab.go_to.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_capture_page_cache_requires_timing(mock_chrome, mock_tab):
+    _record(mock_tab, [])
+    mock_tab.execute_script.return_value = {
+        'id': 1, 'result': {'result': {'value': json.dumps({'ttfb': 7})}},
+    }
+
+    await capture_page("http://example.com", wait=0, with_timing=False)
+    timed = await capture_page("http://example.com", wait=0)
+    untimed = await capture_page("http://example.com", wait=0, with_timing=False)
+
+    assert not timed.from_cache
+    assert timed.timing == {'ttfb': 7}
+    assert untimed.from_cache
+    assert mock_tab.go_to.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_capture_page_early_stop_not_cached(mock_chrome, mock_tab):
+    _record(mock_tab, [])
+
+    await capture_page("http://example.com", wait=0, until=lambda url: True, with_timing=False)
+    again = await capture_page("http://example.com", wait=0, with_timing=False)
+
+    assert not again.from_cache
+
+
+@pytest.mark.asyncio
+async def test_capture_page_bodies_uses_selective_recorder(mock_chrome, mock_tab, monkeypatch):
+    recording = MagicMock(entries=[])
+    recording.stats.return_value = {'bodies_fetched': 0}
+    record_ctx = AsyncMock()
+    record_ctx.__aenter__.return_value = recording
+    record = MagicMock(return_value=record_ctx)
+    monkeypatch.setattr("web_inspector_mcp.capture.record", record)
+
+    capture = await capture_page("http://example.com", wait=0, with_timing=False, bodies='*API*')
+
+    body_filter = record.call_args.kwargs['body_filter']
+    assert body_filter.matches_url('http://example.com/api/v1')
+    assert not body_filter.matches_url('http://example.com/logo.png')
+    assert capture.body_stats == {'bodies_fetched': 0}
+    mock_tab.request.record.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_capture_page_bodies_served_by_full_capture(mock_chrome, mock_tab, monkeypatch):
+    _record(mock_tab, [{'request': {'url': 'http://example.com/api'}}])
+    record = MagicMock()
+    monkeypatch.setattr("web_inspector_mcp.capture.record", record)
+
+    await capture_page("http://example.com", wait=0, with_timing=False)
+    partial = await capture_page("http://example.com", wait=0, with_timing=False, bodies='*api*')
+
+    assert partial.from_cache is True
+    record.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_capture_page_replays_cached_entries_to_on_entry(mock_chrome, mock_tab):
+    entries = [{'request': {'url': 'http://example.com/a'}}, {'request': {'url': 'http://example.com/b'}}]
+    _record(mock_tab, entries)
+    await capture_page("http://example.com", wait=0, with_timing=False)
+
+    seen = []
+    capture = await capture_page(
+        "http://example.com", wait=0, with_timing=False, bodies=False, on_entry=seen.append,
+    )
+
+    assert capture.from_cache is True
+    assert seen == entries
+
+
+@pytest.mark.asyncio
+async def test_capture_page_stopped_early_not_cached(mock_chrome, mock_tab, monkeypatch):
+    load_page = AsyncMock(return_value='stopped')
+    monkeypatch.setattr("web_inspector_mcp.capture.load_page", load_page)
+
+    def stop():
+        return True
+
+    capture = await capture_page(
+        "http://example.com", wait=0, with_timing=False, bodies=False, stop=stop,
+    )
+
+    assert capture.settled_by == 'stopped'
+    assert load_page.await_args.kwargs['stop'] is stop
+    assert capture.body_stats['bodies_fetched'] == 0
+    mock_tab.request.record.assert_not_called()
+    again = await capture_page("http://example.com", wait=0, with_timing=False, bodies=False)
+    assert again.from_cache is False
+
+
+@pytest.mark.asyncio
+async def test_capture_page_in_given_tab_disables_cache(mock_chrome, mock_tab):
+    _record(mock_tab, [])
+
+    await capture_page('http://example.com', wait=0, with_timing=False, tab=mock_tab, disable_cache=True)
+    await capture_page('http://example.com', wait=0, with_timing=False, tab=mock_tab)
+
+    # Loaded in the caller's tab both times: no browser, nothing cached
+    mock_chrome.start.assert_not_awaited()
+    assert mock_tab.go_to.await_count == 2
+    commands = [c.args[0] for c in mock_tab._execute_command.await_args_list]
+    assert [c['params'] for c in commands if c['method'] == 'Network.setCacheDisabled'] == [{'cacheDisabled': True}]
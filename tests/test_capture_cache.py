@@ -0,0 +1,101 @@
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.capture_cache import (
+    CaptureCache,
+    estimate_size,
+    normalize_url,
+)
+
+
+def _capture(body='x'):
+    entry = {
+        'request': {'url': 'http://example.com/api'},
+        'response': {'content': {'text': body}},
+    }
+    return PageCapture(url='http://example.com', entries=[entry])
+
+
+def test_normalize_url():
+    assert normalize_url('HTTP://Example.COM:80/a?b=2&a=1#frag') == 'http://example.com/a?a=1&b=2'
+    assert normalize_url('https://example.com') == 'https://example.com/'
+    assert normalize_url('https://example.com:8443/x') == 'https://example.com:8443/x'
+    assert normalize_url('https://user:pw@example.com/') == 'https://user:pw@example.com/'
+
+
+def test_estimate_size():
+    assert estimate_size('abc') == 3
+    # Two containers and a number at 16 bytes each, plus 'a' and 'xy'
+    assert estimate_size({'a': [1, 'xy']}) == 16 * 3 + 1 + 2
+    assert estimate_size(_capture('x' * 1000).entries) - estimate_size(_capture('').entries) == 1000
+
+
+def test_make_key_ignores_option_order_and_url_form():
+    a = CaptureCache.make_key('http://Example.com/?b=1&a=2', wait=5, idle_ms=500)
+    b = CaptureCache.make_key('http://example.com/?a=2&b=1', idle_ms=500, wait=5)
+    c = CaptureCache.make_key('http://example.com/?a=2&b=1', idle_ms=100, wait=5)
+    assert a == b
+    assert a != c
+
+
+def test_cache_hit_and_miss_counters():
+    cache = CaptureCache()
+    key = cache.make_key('http://example.com')
+    assert cache.get(key) is None
+    capture = _capture()
+    cache.put(key, capture)
+    assert cache.get(key) is capture
+    assert cache.get(key, accept=lambda c: False) is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['entries'] == 1
+    assert stats['hit_rate'] == 0.333
+
+
+def test_cache_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('web_inspector_mcp.capture_cache.time.monotonic', lambda: now[0])
+    cache = CaptureCache(ttl=60)
+    key = cache.make_key('http://example.com')
+    cache.put(key, _capture())
+    now[0] += 61
+    assert cache.get(key) is None
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['bytes'] == 0
+
+
+def test_cache_lru_eviction_by_bytes():
+    one_entry = estimate_size(_capture('a' * 100).entries)
+    cache = CaptureCache(max_bytes=one_entry * 2)
+    k1, k2, k3 = (cache.make_key(f'http://example.com/{i}') for i in range(3))
+    cache.put(k1, _capture('a' * 100))
+    cache.put(k2, _capture('b' * 100))
+    cache.get(k1)  # k1 is now most recently used
+    cache.put(k3, _capture('c' * 100))
+
+    assert cache.get(k2) is None
+    assert cache.get(k1) is not None
+    assert cache.get(k3) is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cache_put_replaces_and_skips_oversized():
+    cache = CaptureCache(max_bytes=1000)
+    key = cache.make_key('http://example.com')
+    cache.put(key, _capture('small'))
+    cache.put(key, _capture('tiny'))
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['bytes'] == estimate_size(_capture('tiny').entries)
+
+    cache.put(cache.make_key('http://big.com'), _capture('x' * 5000))
+    assert cache.stats()['entries'] == 1
+
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+
+
+def test_cache_disabled_with_zero_ttl():
+    cache = CaptureCache(ttl=0)
+    key = cache.make_key('http://example.com')
+    cache.put(key, _capture())
+    assert cache.get(key) is None
@@ -6,7 +6,7 @@ from web_inspector_mcp.tools.capture_network import capture_network
 
 
 @pytest.mark.asyncio
-async def test_capture_network(mock_chrome, mock_tab):
+async def test_capture_network(mock_chrome, mock_tab, monkeypatch):
     mock_capture = MagicMock()
     mock_capture.entries = [
         {
@@ -48,9 +48,12 @@ async def test_capture_network(mock_chrome, mock_tab):
 
     mock_record_ctx = AsyncMock()
     mock_record_ctx.__aenter__.return_value = mock_capture
-    mock_tab.request.record.return_value = mock_record_ctx
+    record = MagicMock(return_value=mock_record_ctx)
+    monkeypatch.setattr('web_inspector_mcp.capture.record', record)
 
     res = await capture_network("http://example.com", wait=0)
+    # Metadata only: no response bodies are fetched
+    assert record.call_args.kwargs['fetch_bodies'] is False
     assert res['page_url'] == "http://example.com"
     assert res['total_requests'] == 3
     assert res['by_type'] == {'Fetch': 1, 'Image': 1, 'Other': 1}
@@ -0,0 +1,120 @@
+import pytest
+
+from web_inspector_mcp.code_coverage import (
+    CoverageRecorder,
+    coverage_report,
+    used_css_bytes,
+    used_js_bytes,
+)
+from web_inspector_mcp.records import RequestRecord
+from web_inspector_mcp.tools.measure_performance import measure_performance
+
+
+def _range(start, end, count):
+    return {'startOffset': start, 'endOffset': end, 'count': count}
+
+
+def test_used_js_bytes_flattens_nested_ranges():
+    functions = [
+        # The script ran; a function inside it never did, except one block
+        {'ranges': [_range(0, 1000, 1)]},
+        {'ranges': [_range(100, 400, 0)]},
+        {'ranges': [_range(200, 250, 1), _range(220, 230, 0)]},
+    ]
+    # 1000 - 300 unexecuted + 50 executed inside it - 10 not
+    assert used_js_bytes(functions) == (1000, 740)
+    assert used_js_bytes([{'ranges': [_range(0, 500, 0)]}]) == (500, 0)
+    assert used_js_bytes([]) == (0, 0)
+
+
+def test_used_css_bytes_counts_overlaps_once():
+    assert used_css_bytes([(50, 80), (0, 10), (5, 20), (60, 70)]) == 50
+    assert used_css_bytes([]) == 0
+
+
+@pytest.fixture
+def coverage_tab(mock_tab):
+    handlers = {}
+
+    async def on(event, handler):
+        handlers[event] = handler
+        return 1
+
+    responses = {
+        'Profiler.takePreciseCoverage': {'result': [
+            {'url': 'https://a.com/app.js', 'functions': [{'ranges': [_range(0, 1000, 1), _range(500, 1000, 0)]}]},
+            {'url': 'https://a.com/', 'functions': [{'ranges': [_range(0, 100, 1)]}]},
+            {'url': 'https://a.com/', 'functions': [{'ranges': [_range(0, 50, 0)]}]},
+            {'url': '', 'functions': [{'ranges': [_range(0, 10, 1)]}]},
+        ]},
+        'CSS.stopRuleUsageTracking': {'ruleUsage': [
+            {'styleSheetId': 's1', 'startOffset': 0, 'endOffset': 100, 'used': True},
+            {'styleSheetId': 's1', 'startOffset': 100, 'endOffset': 900, 'used': False},
+        ]},
+    }
+
+    async def execute(command):
+        if command['method'] == 'CSS.enable':
+            for sheet_id, url, length in (('s1', 'https://a.com/site.css', 1000), ('s2', '', 20)):
+                handlers['CSS.styleSheetAdded']({'params': {'header': {
+                    'styleSheetId': sheet_id, 'sourceURL': url, 'length': length,
+                }}})
+        return {'id': 1, 'result': responses.get(command['method'], {})}
+
+    mock_tab.on.side_effect = on
+    mock_tab._execute_command.side_effect = execute
+    return mock_tab
+
+
+@pytest.mark.asyncio
+async def test_coverage_recorder(coverage_tab):
+    async with CoverageRecorder(coverage_tab) as recorder:
+        pass
+
+    usage = {row['url']: row for row in recorder.usage}
+    assert usage['https://a.com/app.js'] == {
+        'url': 'https://a.com/app.js', 'kind': 'script', 'total_bytes': 1000, 'used_bytes': 500,
+    }
+    # Inline scripts add up under the document's URL; eval'd code is skipped
+    assert usage['https://a.com/']['total_bytes'] == 150
+    assert usage['https://a.com/']['used_bytes'] == 100
+    assert usage['https://a.com/site.css']['used_bytes'] == 100
+    assert len(usage) == 3
+    methods = [c.args[0]['method'] for c in coverage_tab._execute_command.await_args_list]
+    assert methods[-4:] == ['Profiler.stopPreciseCoverage', 'Profiler.disable', 'CSS.disable', 'DOM.disable']
+
+
+def test_coverage_report_ranks_by_unused_bytes():
+    usage = [
+        {'url': 'https://a.com/small.js', 'kind': 'script', 'total_bytes': 100, 'used_bytes': 90},
+        {'url': 'https://a.com/big.js', 'kind': 'script', 'total_bytes': 10000, 'used_bytes': 2500},
+        {'url': 'https://a.com/site.css', 'kind': 'stylesheet', 'total_bytes': 0, 'used_bytes': 0},
+    ]
+    records = [RequestRecord.from_entry({
+        'request': {'url': 'https://a.com/big.js'}, 'response': {'bodySize': 4000},
+    })]
+
+    report = coverage_report(usage, records)
+
+    big = report['resources'][0]
+    assert big['url'] == 'https://a.com/big.js'
+    assert big['unused_pct'] == 75
+    assert big['unused_transfer_bytes'] == 3000
+    assert 'transfer_bytes' not in report['resources'][1]
+    assert report['totals']['script'] == {
+        'total_bytes': 10100, 'used_bytes': 2590, 'unused_bytes': 7510, 'unused_pct': 74.4,
+    }
+    assert report['totals']['stylesheet']['unused_pct'] == 0
+
+
+@pytest.mark.asyncio
+async def test_measure_performance_with_coverage(mock_chrome, coverage_tab, tmp_path):
+    result = await measure_performance('https://a.com/', wait=0, coverage=True)
+
+    assert result['coverage']['resources'][0]['url'] == 'https://a.com/site.css'
+    assert result['coverage']['resources_total'] == 3
+
+    from web_inspector_mcp.har_files import write_har
+    path = str(tmp_path / 'page.har')
+    write_har(path, [], 'https://a.com/')
+    assert 'error' in (await measure_performance(path, coverage=True))['coverage']
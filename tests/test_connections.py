@@ -0,0 +1,98 @@
+import pytest
+
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.connections import ConnectionAggregator, connection_report
+from web_inspector_mcp.records import RequestRecord
+from web_inspector_mcp.request_filter import RequestFilter
+from web_inspector_mcp.tools.analyze_page import run_analysis
+
+
+def _entry(url, start_ms, time, version, connection='', ip='', **timings):
+    seconds, ms = divmod(start_ms, 1000)
+    entry = {
+        'request': {'url': url, 'method': 'GET', 'httpVersion': version},
+        'response': {'status': 200, 'httpVersion': version},
+        'startedDateTime': f'2024-01-01T00:00:{seconds:02d}.{ms:03d}Z',
+        'time': time,
+        'timings': {'blocked': 0, 'dns': -1, 'connect': -1, 'ssl': -1, 'send': 0, 'wait': time, 'receive': 0, **timings},
+    }
+    if connection:
+        entry['connection'] = connection
+    if ip:
+        entry['serverIPAddress'] = ip
+    return entry
+
+
+def _page():
+    entries = [
+        _entry('https://a.com/', 0, 300, 'h2', '1', '10.0.0.1', dns=20, connect=60, ssl=40),
+        _entry('https://a.com/app.js', 310, 100, 'h2', '1', '10.0.0.1'),
+        _entry('https://static.a.com/logo.png', 320, 100, 'h2', '2', '10.0.0.1', connect=30, ssl=20),
+        _entry('https://cdn.com/lib.js', 320, 50, 'http/2.0', '3', '10.0.0.2', dns=10, connect=50, ssl=30),
+    ]
+    # Eight images at once from an HTTP/1.1 origin: six connections, two queued
+    for i in range(8):
+        blocked = 150 if i >= 6 else 0
+        connect = {'connect': 40, 'ssl': 25} if i < 6 else {}
+        entries.append(_entry(
+            f'http://img.com/{i}.jpg', 400 + i, 200, 'HTTP/1.1', str(10 + i % 6), '10.0.0.3',
+            blocked=blocked, **connect,
+        ))
+    entries.append(_entry('data:image/png;base64,xx', 500, 0, ''))
+    return [RequestRecord.from_entry(e) for e in entries]
+
+
+def test_record_keeps_protocol_connection_and_server():
+    record = _page()[3]
+    assert record.protocol == 'h2'
+    assert record.connection == '3'
+    assert record.server_ip == '10.0.0.2'
+    bare = RequestRecord.from_entry({'request': {'url': 'https://a.com/', 'httpVersion': 'h3-29'}})
+    assert (bare.protocol, bare.connection, bare.server_ip) == ('h3', '', '')
+
+
+def test_connections_by_origin():
+    result = connection_report(_page())
+
+    assert result['requests'] == 12
+    assert result['protocols'] == {'h2': 4, 'http/1.1': 8}
+    assert result['connections'] == 9
+    assert result['connection_reuse_ratio'] == 0.25
+    assert result['queued_requests'] == 2
+    assert result['queued_ms'] == 300
+    assert result['setup_ms'] == {'dns': 30, 'tcp': 140, 'tls': 240, 'total': 410}
+
+    by_origin = {row['origin']: row for row in result['by_origin']}
+    assert list(by_origin)[0] == 'http://img.com'
+    img = by_origin['http://img.com']
+    assert (img['connections'], img['reuse_ratio'], img['queued_requests']) == (6, 0.25, 2)
+    page = by_origin['https://a.com']
+    assert page['setup_ms'] == {'dns': 20, 'tcp': 20, 'tls': 40, 'total': 80}
+    assert page['reuse_ratio'] == 0.5
+    assert page['server_ips'] == ['10.0.0.1']
+
+    # The page's own origin is connected to anyway
+    assert [c['origin'] for c in result['preconnect_candidates']] == ['http://img.com', 'https://cdn.com']
+    assert result['shared_servers'] == [
+        {'server_ip': '10.0.0.1', 'origins': ['https://a.com', 'https://static.a.com']},
+    ]
+
+
+def test_connections_without_ids_count_handshakes():
+    aggregator = ConnectionAggregator(top_n=1)
+    for record in _page():
+        record.connection = ''
+        aggregator.add_record(record)
+
+    result = aggregator.result()
+
+    assert result['connections'] == 9
+    assert result['origins_total'] == 4
+    assert len(result['by_origin']) == 1
+
+
+@pytest.mark.asyncio
+async def test_connections_analysis():
+    capture = PageCapture(url='https://a.com/', entries=[_entry('https://a.com/', 0, 100, 'h2', '1')])
+    result = await run_analysis('connections', capture, RequestFilter.coerce('*'))
+    assert result['protocols'] == {'h2': 1}
@@ -0,0 +1,161 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.tools.crawl_site import crawl_site, normalize_url
+
+# path -> (links on the page, API calls it makes)
+SITE = {
+    '/': (['/products', '/about', 'https://other.com/x', '/logo.png', 'mailto:a@b.c'], ['/api/menu']),
+    '/products': (['/products/1', '/products/2', '/', '/products?utm_source=x#top'], ['/api/products']),
+    '/products/1': (['/products/2'], ['/api/products/1', '/api/reviews?product=1']),
+    '/products/2': (['/products/1'], ['/api/products/2', '/api/reviews?product=2']),
+    '/about': (['/team'], ['/api/menu']),
+    '/team': ([], ['/api/menu']),
+}
+# path -> where the page ends up after redirects
+REDIRECTS = {}
+
+
+@pytest.fixture
+def fake_site(monkeypatch):
+    """Serves SITE from http://shop.test in place of a real browser."""
+    loaded = []
+    active = {'now': 0, 'peak': 0}
+
+    async def fake_capture_page(url, wait, wait_until, idle_ms, **options):
+        assert options['with_links'] and options['bodies'] is False
+        path = url.split('://shop.test', 1)[1]
+        loaded.append(path)
+        active['now'] += 1
+        active['peak'] = max(active['peak'], active['now'])
+        await asyncio.sleep(0.01)
+        active['now'] -= 1
+        if path not in SITE:
+            raise RuntimeError('404')
+        links, apis = SITE[path]
+        entries = [
+            {'request': {'url': f'http://shop.test{api}', 'method': 'GET'}, 'response': {'status': 200}, '_resourceType': 'Fetch'}
+            for api in apis
+        ]
+        return PageCapture(url=url, entries=entries, links=links, final_url=REDIRECTS.get(path, url))
+
+    @asynccontextmanager
+    async def fake_browser():
+        yield object()
+
+    monkeypatch.setattr("web_inspector_mcp.tools.crawl_site.capture_page", fake_capture_page)
+    monkeypatch.setattr("web_inspector_mcp.tools.crawl_site.shared_browser", fake_browser)
+    return loaded, active
+
+
+def test_normalize_url():
+    assert normalize_url('HTTP://Shop.Test:80/a?b=2&a=1&utm_medium=x#frag') == 'http://shop.test/a?a=1&b=2'
+    assert normalize_url('../c', 'https://shop.test/a/b/') == 'https://shop.test/a/c'
+    assert normalize_url('https://shop.test') == 'https://shop.test/'
+    assert normalize_url('https://shop.test:8443/') == 'https://shop.test:8443/'
+    assert normalize_url('mailto:a@b.c') is None
+    assert normalize_url('http://[::1') is None
+
+
+@pytest.mark.asyncio
+async def test_crawl_merges_endpoints_across_pages(fake_site):
+    loaded, active = fake_site
+
+    res = await crawl_site('http://shop.test', max_pages=20, stop_after=0, concurrency=3)
+
+    assert sorted(loaded) == sorted(SITE)  # every page once, nothing off-site
+    assert res['stopped_by'] == 'exhausted'
+    assert res['pages_visited'] == len(SITE)
+    assert active['peak'] > 1
+    templates = {e['url']: e for e in res['endpoints']}
+    assert set(templates) == {
+        'http://shop.test/api/menu',
+        'http://shop.test/api/products',
+        'http://shop.test/api/products/{id}',
+        'http://shop.test/api/reviews',
+    }
+    assert templates['http://shop.test/api/menu']['count'] == 3
+    assert templates['http://shop.test/api/reviews']['query_keys'] == ['product']
+
+
+@pytest.mark.asyncio
+async def test_crawl_respects_depth_and_page_budget(fake_site):
+    loaded, _ = fake_site
+
+    res = await crawl_site('http://shop.test/', max_depth=1, stop_after=0, concurrency=1)
+    assert sorted(loaded) == ['/', '/about', '/products']
+    assert {p['depth'] for p in res['pages']} == {0, 1}
+
+    loaded.clear()
+    res = await crawl_site('http://shop.test/', max_pages=2, stop_after=0, concurrency=1)
+    assert loaded == ['/', '/products']
+    assert res['stopped_by'] == 'max_pages'
+
+
+@pytest.mark.asyncio
+async def test_crawl_stops_when_no_new_endpoints(fake_site):
+    loaded, _ = fake_site
+
+    res = await crawl_site('http://shop.test/', stop_after=1, concurrency=1)
+
+    # '/about' only calls /api/menu, already seen on '/'
+    assert loaded == ['/', '/products', '/about']
+    assert res['stopped_by'] == 'no_new_endpoints'
+
+
+@pytest.mark.asyncio
+async def test_crawl_reports_failed_pages(fake_site):
+    SITE['/'][0].append('/missing')
+    pages = []
+
+    async def on_page(page, done, total):
+        pages.append((page['url'], done))
+
+    try:
+        res = await crawl_site('http://shop.test/', stop_after=0, on_page=on_page)
+    finally:
+        SITE['/'][0].remove('/missing')
+
+    failed = [p for p in res['pages'] if not p['ok']]
+    assert [p['url'] for p in failed] == ['http://shop.test/missing']
+    assert failed[0]['error'] == 'RuntimeError: 404'
+    assert [done for _, done in pages] == list(range(1, len(SITE) + 2))
+
+
+@pytest.mark.asyncio
+async def test_crawl_follows_start_redirect_and_reports_off_site_ones(fake_site, monkeypatch):
+    # The start page moves to https; /about leaves for another site
+    monkeypatch.setitem(REDIRECTS, '/', 'https://shop.test/')
+    monkeypatch.setitem(REDIRECTS, '/about', 'https://jobs.other.com/')
+
+    res = await crawl_site('http://shop.test/', max_depth=1, stop_after=0)
+
+    by_url = {p['url']: p for p in res['pages']}
+    assert by_url['http://shop.test/']['redirected_to'] == 'https://shop.test/'
+    assert 'https://shop.test/products' in by_url
+    about = by_url['https://shop.test/about']
+    assert about['redirected_to'] == 'https://jobs.other.com/'
+    assert about['links_queued'] == 0
+
+
+@pytest.mark.asyncio
+async def test_crawl_survives_a_failing_callback(fake_site):
+    async def on_page(page, done, total):
+        raise RuntimeError('client went away')
+
+    res = await crawl_site('http://shop.test/', stop_after=0, on_page=on_page)
+
+    assert res['pages_visited'] == len(SITE)
+    assert all(p['ok'] for p in res['pages'])
+    assert res['pages'][0]['callback_error'] == 'RuntimeError: client went away'
+
+
+@pytest.mark.asyncio
+async def test_crawl_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        await crawl_site('ftp://shop.test')
+    with pytest.raises(ValueError):
+        await crawl_site('http://shop.test', concurrency=0)
@@ -2,11 +2,15 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from web_inspector_mcp.tools.discover_endpoints import discover_endpoints
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.tools.discover_endpoints import (
+    analyze_endpoints,
+    discover_endpoints,
+)
 
 
 @pytest.mark.asyncio
-async def test_discover_endpoints(mock_chrome, mock_tab):
+async def test_discover_endpoints(mock_chrome, mock_tab, monkeypatch):
     mock_capture = MagicMock()
     mock_capture.entries = [
         {
@@ -33,9 +37,12 @@ async def test_discover_endpoints(mock_chrome, mock_tab):
 
     mock_record_ctx = AsyncMock()
     mock_record_ctx.__aenter__.return_value = mock_capture
-    mock_tab.request.record.return_value = mock_record_ctx
+    record = MagicMock(return_value=mock_record_ctx)
+    monkeypatch.setattr('web_inspector_mcp.capture.record', record)
 
     res = await discover_endpoints("http://example.com", wait=0)
+    # Metadata only: no response bodies are fetched
+    assert record.call_args.kwargs['fetch_bodies'] is False
     assert res['page_url'] == "http://example.com"
     assert res['total_endpoints'] == 2 # v1/users and invalid-url
     assert 'api.domain.com' in res['by_domain']
@@ -44,3 +51,20 @@ async def test_discover_endpoints(mock_chrome, mock_tab):
     assert endpoints[0]['count'] == 2 # v1/users is hit twice
     assert endpoints[0]['url'] == 'http://api.domain.com/v1/users'
     assert endpoints[0]['method'] == 'GET'
+
+
+def test_analyze_endpoints_groups_paths_into_templates():
+    entries = [
+        {'request': {'url': f'https://shop.com/api/orders/{i}?page={i}', 'method': 'GET'}, '_resourceType': 'Fetch'}
+        for i in range(1, 6)
+    ]
+
+    res = analyze_endpoints(PageCapture(url='https://shop.com', entries=entries))
+
+    assert res['total_endpoints'] == 1
+    endpoint = res['endpoints'][0]
+    assert endpoint['url'] == 'https://shop.com/api/orders/{id}'
+    assert endpoint['count'] == 5
+    assert endpoint['query_keys'] == ['page']
+    assert endpoint['full_url'] == 'https://shop.com/api/orders/1?page=1'
+    assert len(endpoint['examples']) == 3
@@ -3,27 +3,29 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from web_inspector_mcp.capture import PageCapture
 from web_inspector_mcp.tools.extract_api_schema import (
-    _infer_schema,
-    _infer_type,
+    SchemaAggregator,
+    analyze_api_schemas,
     extract_api_schema,
 )
 
 
-def test_infer_type():
-    assert _infer_type(None) == 'null'
-    assert _infer_type(True) == 'boolean'
-    assert _infer_type(42) == 'integer'
-    assert _infer_type(3.14) == 'number'
-    assert _infer_type("hello") == 'string'
-    assert _infer_type([1, 2]) == 'array<integer>'
-    assert _infer_type([]) == 'array<unknown>'
-    assert _infer_type({"a": 1}) == 'object'
+def _json_entry(url, body, method='GET'):
+    return {
+        'request': {'url': url, 'method': method},
+        'response': {'content': {'text': json.dumps(body)}},
+    }
 
 
-def test_infer_schema():
+@pytest.mark.asyncio
+async def test_analyze_api_schemas_infers_nested_types():
     data = {"user": {"id": 1, "name": "Alice", "roles": ["admin", "user"]}}
-    schema = _infer_schema(data)
+    capture = PageCapture('http://a.com', [_json_entry('http://a.com/api/me', data)])
+
+    result = await analyze_api_schemas(capture, '*api*')
+
+    schema = result['schemas'][0]['response_schema']
     assert schema['type'] == 'object'
     assert schema['properties']['user']['type'] == 'object'
     assert schema['properties']['user']['properties']['id']['type'] == 'integer'
@@ -32,7 +34,32 @@ def test_infer_schema():
 
 
 @pytest.mark.asyncio
-async def test_extract_api_schema(mock_chrome, mock_tab):
+async def test_schema_aggregator_merges_responses_per_endpoint():
+    aggregator = SchemaAggregator()
+    await aggregator.add_offloaded(_json_entry('http://a.com/api/items?page=1', {'items': [{'id': 1}], 'next': 'x'}))
+    await aggregator.add_offloaded(
+        _json_entry('http://a.com/api/items?page=2', {'items': [{'id': 2, 'tag': None}], 'next': None})
+    )
+    await aggregator.add_offloaded(_json_entry('http://a.com/api/items', {'oops': 1}, method='POST'))
+    await aggregator.add_offloaded(
+        {'request': {'url': 'http://a.com/api/x', 'method': 'GET'}, 'response': {'content': {'text': '<html>'}}}
+    )
+
+    result = aggregator.result('http://a.com')
+
+    assert result['apis_found'] == 2
+    assert aggregator.summary() == '3 JSON responses from 2 endpoints'
+    get = result['schemas'][0]
+    assert get['responses'] == 2
+    assert get['full_url'] == 'http://a.com/api/items?page=1'
+    assert get['sample_keys'] == ['items', 'next']
+    schema = get['response_schema']
+    assert schema['properties']['next'] == {'type': 'string', 'nullable': True, 'count': 2}
+    assert schema['properties']['items']['items']['properties']['tag']['optional'] is True
+
+
+@pytest.mark.asyncio
+async def test_extract_api_schema(mock_chrome, mock_tab, monkeypatch):
     response_data = {"id": 1, "name": "Test"}
 
     mock_capture = MagicMock()
@@ -45,7 +72,8 @@ async def test_extract_api_schema(mock_chrome, mock_tab):
 
     mock_record_ctx = AsyncMock()
     mock_record_ctx.__aenter__.return_value = mock_capture
-    mock_tab.request.record.return_value = mock_record_ctx
+    record = MagicMock(return_value=mock_record_ctx)
+    monkeypatch.setattr("web_inspector_mcp.capture.record", record)
 
     res = await extract_api_schema("http://example.com", "*api*", wait=0)
 
@@ -60,7 +88,7 @@ async def test_extract_api_schema(mock_chrome, mock_tab):
 
 
 @pytest.mark.asyncio
-async def test_extract_api_schema_invalid_json(mock_chrome, mock_tab):
+async def test_extract_api_schema_invalid_json(mock_chrome, mock_tab, monkeypatch):
     mock_capture = MagicMock()
     mock_capture.entries = [
         {
@@ -70,8 +98,21 @@ async def test_extract_api_schema_invalid_json(mock_chrome, mock_tab):
     ]
     mock_record_ctx = AsyncMock()
     mock_record_ctx.__aenter__.return_value = mock_capture
-    mock_tab.request.record.return_value = mock_record_ctx
+    record = MagicMock(return_value=mock_record_ctx)
+    monkeypatch.setattr("web_inspector_mcp.capture.record", record)
 
     res = await extract_api_schema("http://example.com", "*api*", wait=0)
 
     assert res['apis_found'] == 0
+
+
+@pytest.mark.asyncio
+async def test_extract_api_schema_min_matches(mock_chrome, mock_tab, monkeypatch):
+    load_page = AsyncMock(return_value='matched')
+    monkeypatch.setattr("web_inspector_mcp.capture.load_page", load_page)
+
+    await extract_api_schema("http://example.com", "*graphql*", wait=3, min_matches=1)
+
+    kwargs = load_page.await_args.kwargs
+    assert kwargs['until_count'] == 1
+    assert kwargs['until']('http://example.com/graphql')
@@ -0,0 +1,237 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from web_inspector_mcp import har_files
+from web_inspector_mcp.capture import capture_page, read_har_capture
+from web_inspector_mcp.har_files import (
+    HarReader,
+    har_path,
+    page_timing,
+    resolve_har_path,
+    write_har,
+)
+from web_inspector_mcp.tools.capture_network import capture_network
+from web_inspector_mcp.tools.export_har import export_har
+from web_inspector_mcp.tools.extract_api_schema import extract_api_schema
+
+
+def _entry(i, url=None):
+    return {
+        'request': {'url': url or f'https://a.com/api/items/{i}', 'method': 'GET'},
+        'response': {
+            'status': 200,
+            'bodySize': 1000 + i,
+            'content': {'mimeType': 'application/json', 'text': json.dumps({'id': i, 'ok': True, 'score': 1.5})},
+        },
+        '_resourceType': 'Fetch',
+        'startedDateTime': '2024-01-01T00:00:00Z',
+        'time': 12.5,
+    }
+
+
+def _har(entries):
+    return {
+        'log': {
+            'version': '1.2',
+            'creator': {'name': 'Chrome', 'entries': 'not these'},
+            'pages': [{'title': 'https://a.com/', 'pageTimings': {'onContentLoad': 120, 'onLoad': -1}}],
+            'entries': entries,
+        },
+        'comment': 'trailing',
+    }
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Forces values to straddle buffer boundaries
+    monkeypatch.setattr(har_files, 'CHUNK_SIZE', 7)
+
+
+def test_har_path():
+    assert har_path('/tmp/x.har') == '/tmp/x.har'
+    assert har_path('capture.HAR.GZ') == 'capture.HAR.GZ'
+    assert har_path('file:///tmp/my%20page.jsonl') == '/tmp/my page.jsonl'
+    assert har_path('https://a.com/export.har') is None
+    assert har_path('https://a.com/') is None
+    # A local page, not a capture: the browser loads it
+    assert har_path('file:///srv/site/index.html') is None
+
+
+def test_resolve_har_path_limits_files(tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match='Not a HAR'):
+        resolve_har_path('/etc/passwd')
+    with pytest.raises(ValueError, match='Not a HAR'):
+        write_har(str(tmp_path / 'notes.txt'), [])
+    root = os.path.realpath(tmp_path)
+    assert resolve_har_path('page.har') == os.path.join(root, 'page.har')
+    assert resolve_har_path(f'file://{tmp_path}/a/page.jsonl') == os.path.join(root, 'a', 'page.jsonl')
+    with pytest.raises(ValueError, match='outside'):
+        resolve_har_path('../elsewhere.har')
+    with pytest.raises(ValueError, match='outside'):
+        HarReader('/tmp/x.har')
+
+    # Relative paths land in the capture directory, created as needed
+    write_har('runs/page.ndjson', [_entry(0)])
+    assert list(HarReader(str(tmp_path / 'runs' / 'page.ndjson'))) == [_entry(0)]
+
+    # Only an explicit '*' allows any path
+    monkeypatch.setattr('web_inspector_mcp.har_files.HAR_DIR', None)
+    assert resolve_har_path('/tmp/x.har') == '/tmp/x.har'
+
+
+def test_reads_har_incrementally(tmp_path, small_chunks):
+    entries = [_entry(i) for i in range(20)]
+    path = tmp_path / 'page.har'
+    path.write_text(json.dumps(_har(entries), indent=1))
+
+    reader = HarReader(str(path))
+
+    assert list(reader) == entries
+    assert reader.log['creator']['name'] == 'Chrome'
+    assert page_timing(reader.pages) == {'dom_content_loaded': 120}
+
+
+def test_reads_gzip_and_ndjson(tmp_path, small_chunks):
+    entries = [_entry(i) for i in range(5)]
+    har = tmp_path / 'page.har.gz'
+    with gzip.open(har, 'wt') as f:
+        json.dump(_har(entries), f)
+    ndjson = tmp_path / 'page.ndjson'
+    ndjson.write_text('\n'.join(json.dumps(e) for e in entries) + '\n\n{"not": "an entry"}\n')
+
+    assert list(HarReader(str(har))) == entries
+    assert list(HarReader(str(ndjson))) == entries
+
+
+def test_empty_and_malformed_files(tmp_path):
+    empty = tmp_path / 'empty.har'
+    empty.write_text('{"log": {"entries": []}}')
+    assert list(HarReader(str(empty))) == []
+
+    broken = tmp_path / 'broken.har'
+    broken.write_text('{"log": {"entries": [{"request": ')
+    with pytest.raises(ValueError):
+        list(HarReader(str(broken)))
+
+    bad_line = tmp_path / 'bad.jsonl'
+    bad_line.write_text('{"request": {}}\nnope\n')
+    with pytest.raises(ValueError, match='line 2'):
+        list(HarReader(str(bad_line)))
+
+
+@pytest.mark.parametrize('name', ['out.har', 'out.har.gz', 'out.ndjson', 'out.jsonl.gz'])
+def test_write_round_trip(tmp_path, name):
+    entries = [_entry(i) for i in range(3)]
+    path = str(tmp_path / name)
+
+    write_har(path, iter(entries), 'https://a.com/', {'dom_content_loaded': 80, 'load_event': 200})
+
+    reader = HarReader(path)
+    assert list(reader) == entries
+    if 'har' in name:
+        assert page_timing(reader.pages) == {'dom_content_loaded': 80, 'load_event': 200}
+
+
+@pytest.mark.asyncio
+async def test_read_har_capture_drops_unwanted_bodies(tmp_path):
+    path = tmp_path / 'page.har'
+    path.write_text(json.dumps(_har([_entry(1), _entry(2, 'https://a.com/static/app.js')])))
+
+    capture = await read_har_capture(str(path), bodies='*api*', batch_size=1)
+
+    assert capture.url == 'https://a.com/'
+    assert capture.settled_by == 'har'
+    assert 'text' in capture.entries[0]['response']['content']
+    assert 'text' not in capture.entries[1]['response']['content']
+    assert capture.entries[1]['_bodyOmitted'] == 'filtered'
+
+
+@pytest.mark.asyncio
+async def test_read_har_capture_streams_and_stops(tmp_path):
+    path = tmp_path / 'page.jsonl'
+    path.write_text('\n'.join(json.dumps(_entry(i)) for i in range(10)))
+    seen = []
+
+    capture = await read_har_capture(str(path), bodies=False, on_entry=seen.append, stop=lambda: len(seen) >= 4)
+
+    assert len(seen) == 4
+    # Kept like a live capture's entries, so later joins on records work
+    assert capture.entries == seen
+    assert len(capture.records) == 4
+    assert capture.settled_by == 'stopped'
+    assert capture.url == str(path)
+    assert all('text' not in e['response']['content'] for e in seen)
+
+
+@pytest.mark.asyncio
+async def test_tools_analyze_saved_captures_without_chrome(tmp_path):
+    path = tmp_path / 'page.har.gz'
+    write_har(str(path), [_entry(i, f'https://a.com/api/items?page={i}') for i in range(3)], 'https://a.com/')
+
+    network = await capture_network(str(path))
+    schema = await extract_api_schema(f'file://{path}', '*items*')
+
+    assert network['total_requests'] == 3
+    assert network['page_url'] == 'https://a.com/'
+    assert schema['apis_found'] == 1
+    assert schema['schemas'][0]['responses'] == 3
+    assert schema['schemas'][0]['response_schema']['properties']['score']['type'] == 'number'
+
+
+@pytest.mark.asyncio
+async def test_network_capture_keeps_no_bodies_of_saved_captures(tmp_path, monkeypatch):
+    from web_inspector_mcp import pipeline
+
+    path = tmp_path / 'page.har'
+    write_har(str(path), [_entry(i) for i in range(3)], 'https://a.com/')
+    captures = []
+
+    async def spy(*args, **kwargs):
+        captures.append(await capture_page(*args, **kwargs))
+        return captures[-1]
+
+    monkeypatch.setattr(pipeline, 'capture_page', spy)
+
+    network = await capture_network(str(path))
+
+    assert network['total_requests'] == 3
+    kept = captures[0].entries
+    assert len(kept) == 3
+    assert all('text' not in e['response']['content'] for e in kept)
+    assert all(e['_bodyOmitted'] == 'disabled' for e in kept)
+
+
+@pytest.mark.asyncio
+async def test_export_har(mock_chrome, mock_tab, tmp_path):
+    entries = [_entry(1)]
+    mock_capture = type('Recording', (), {'entries': entries})()
+
+    class Ctx:
+        async def __aenter__(self):
+            return mock_capture
+
+        async def __aexit__(self, *exc):
+            return False
+
+    mock_tab.request.record.return_value = Ctx()
+    path = str(tmp_path / 'saved.har')
+
+    res = await export_har('https://a.com/', path, wait=0)
+
+    assert res['entries'] == 1
+    assert list(HarReader(path)) == entries
+    # Saving again from the cache still writes the file
+    second = str(tmp_path / 'again.ndjson')
+    assert (await capture_page('https://a.com/', wait=0, with_timing=False, save_har=second)).from_cache
+    assert list(HarReader(second)) == entries
+
+
+@pytest.mark.asyncio
+async def test_save_har_rejects_non_har_path_before_loading(mock_chrome, mock_tab, tmp_path):
+    with pytest.raises(ValueError, match='Not a HAR'):
+        await capture_page('https://a.com/', wait=0, with_timing=False, save_har=str(tmp_path / 'notes.txt'))
+
+    mock_tab.go_to.assert_not_awaited()
@@ -6,7 +6,7 @@ from web_inspector_mcp.tools.intercept_api import intercept_api
 
 
 @pytest.mark.asyncio
-async def test_intercept_api(mock_chrome, mock_tab):
+async def test_intercept_api(mock_chrome, mock_tab, monkeypatch):
     mock_capture = MagicMock()
     mock_capture.entries = [
         {
@@ -30,7 +30,8 @@ async def test_intercept_api(mock_chrome, mock_tab):
 
     mock_record_ctx = AsyncMock()
     mock_record_ctx.__aenter__.return_value = mock_capture
-    mock_tab.request.record.return_value = mock_record_ctx
+    record = MagicMock(return_value=mock_record_ctx)
+    monkeypatch.setattr("web_inspector_mcp.capture.record", record)
 
     res = await intercept_api("http://example.com", "*api*", wait=0)
 
@@ -44,7 +45,7 @@ async def test_intercept_api(mock_chrome, mock_tab):
     assert match['is_json'] is True
 
 @pytest.mark.asyncio
-async def test_intercept_api_error_response(mock_chrome, mock_tab):
+async def test_intercept_api_error_response(mock_chrome, mock_tab, monkeypatch):
     mock_capture = MagicMock()
     mock_capture.entries = [
         {
@@ -58,9 +59,23 @@ async def test_intercept_api_error_response(mock_chrome, mock_tab):
 
     mock_record_ctx = AsyncMock()
     mock_record_ctx.__aenter__.return_value = mock_capture
-    mock_tab.request.record.return_value = mock_record_ctx
+    record = MagicMock(return_value=mock_record_ctx)
+    monkeypatch.setattr("web_inspector_mcp.capture.record", record)
 
     res = await intercept_api("http://example.com", "*api*", wait=0)
 
     assert res['matched_count'] == 1
     assert res['results'][0]['response_body'] is None
+
+
+@pytest.mark.asyncio
+async def test_intercept_api_min_matches(mock_chrome, mock_tab, monkeypatch):
+    load_page = AsyncMock(return_value='matched')
+    monkeypatch.setattr("web_inspector_mcp.capture.load_page", load_page)
+
+    await intercept_api("http://example.com", "*api*", wait=3, min_matches=2)
+
+    kwargs = load_page.await_args.kwargs
+    assert kwargs['until_count'] == 2
+    assert kwargs['until']('http://example.com/API/v1')
+    assert not kwargs['until']('http://example.com/img.png')
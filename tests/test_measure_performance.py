@@ -7,7 +7,7 @@ from web_inspector_mcp.tools.measure_performance import measure_performance
 
 
 @pytest.mark.asyncio
-async def test_measure_performance(mock_chrome, mock_tab):
+async def test_measure_performance(mock_chrome, mock_tab, monkeypatch):
     mock_tab.execute_script.return_value = {
         'id': 1,
         'result': {
@@ -47,9 +47,12 @@ async def test_measure_performance(mock_chrome, mock_tab):
 
     mock_record_ctx = AsyncMock()
     mock_record_ctx.__aenter__.return_value = mock_capture
-    mock_tab.request.record.return_value = mock_record_ctx
+    record = MagicMock(return_value=mock_record_ctx)
+    monkeypatch.setattr('web_inspector_mcp.capture.record', record)
 
     res = await measure_performance("http://example.com", wait=0)
+    # Metadata only: no response bodies are fetched
+    assert record.call_args.kwargs['fetch_bodies'] is False
 
     assert res['page_url'] == "http://example.com"
     assert res['total_requests'] == 2
@@ -57,3 +60,124 @@ async def test_measure_performance(mock_chrome, mock_tab):
     assert res['timing']['ttfb'] == 100
     assert len(res['slowest_resources']) == 2
     assert res['slowest_resources'][0]['duration_ms'] == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_measure_performance_multiple_runs(mock_chrome, monkeypatch):
+    from web_inspector_mcp.capture import PageCapture
+
+    loads = iter([800, 820, 790, 5000, 810, 300, 320, 310, 305, 900, 315])
+    calls = []
+
+    async def fake_capture(url, tab=None, disable_cache=False, **options):
+        calls.append((tab, disable_cache, options['fresh']))
+        load = next(loads)
+        if load == 900:
+            raise RuntimeError('tab crashed')
+        return PageCapture(
+            url=url,
+            timing={'load_event': load, 'ttfb': 50},
+            entries=[{
+                'request': {'url': 'https://a.com/app.js', 'method': 'GET'},
+                'response': {'status': 200, 'bodySize': 0 if load < 500 else 1000},
+                '_resourceType': 'Script',
+                'time': load / 4,
+            }],
+        )
+
+    monkeypatch.setattr('web_inspector_mcp.tools.measure_performance.capture_page', fake_capture)
+    progress = AsyncMock()
+
+    result = await measure_performance('https://a.com/', runs=5, on_progress=progress)
+
+    cold, warm = result['cold'], result['warm']
+    assert cold['runs'] == 5
+    assert cold['metrics']['load_event']['median'] == 805
+    assert cold['metrics']['load_event']['outliers'] == [5000]
+    assert cold['metrics']['total_transfer_bytes']['median'] == 1000
+    assert cold['slowest_resources'][0]['url'] == 'https://a.com/app.js'
+    assert warm['runs'] == 4
+    assert warm['failed_runs'] == ['RuntimeError: tab crashed']
+    assert warm['metrics']['load_event']['median'] == 312.5
+    assert warm['metrics']['total_transfer_bytes']['max'] == 0
+
+    # Five cold loads in their own tabs with the cache off, then a priming
+    # load and five warm loads sharing one tab
+    assert [c[1] for c in calls] == [True] * 5 + [False] * 6
+    assert len({id(c[0]) for c in calls[5:]}) == 1
+    assert all(c[2] for c in calls)
+    assert progress.await_count == 10
+
+
+@pytest.mark.asyncio
+async def test_measure_performance_rejects_bad_run_options():
+    with pytest.raises(ValueError, match='cache'):
+        await measure_performance('https://a.com/', runs=3, cache='hot')
+    from web_inspector_mcp.tools.measure_performance import measure_runs
+    with pytest.raises(ValueError, match='runs'):
+        await measure_runs('https://a.com/', runs=0)
+    with pytest.raises(ValueError, match='coverage, fresh'):
+        await measure_performance('https://a.com/', runs=3, coverage=True, fresh=True)
+    with pytest.raises(ValueError, match='audit'):
+        await measure_performance('https://a.com/', runs=3, audit=True)
+
+
+@pytest.mark.asyncio
+async def test_measure_runs_failed_priming_keeps_cold_results(mock_chrome, monkeypatch):
+    from web_inspector_mcp.capture import PageCapture
+
+    async def fake_capture(url, tab=None, disable_cache=False, **options):
+        if not disable_cache:
+            raise RuntimeError('net::ERR_TIMED_OUT')
+        return PageCapture(url=url, timing={'load_event': 500}, entries=[])
+
+    monkeypatch.setattr('web_inspector_mcp.tools.measure_performance.capture_page', fake_capture)
+
+    result = await measure_performance('https://a.com/', runs=2)
+
+    assert result['cold']['runs'] == 2
+    assert result['warm']['runs'] == 0
+    assert result['warm']['failed_runs'] == ['cache priming load: RuntimeError: net::ERR_TIMED_OUT']
+
+
+@pytest.mark.asyncio
+async def test_measure_runs_rejects_saved_capture(mock_chrome, tmp_path):
+    path = tmp_path / 'page.har'
+    path.write_text(json.dumps({'log': {'entries': []}}))
+
+    with pytest.raises(ValueError, match='saved capture'):
+        await measure_performance(str(path), runs=2)
+
+    mock_chrome.start.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_measure_performance_with_vitals(mock_chrome, mock_tab, tmp_path):
+    handlers = {}
+
+    async def on(event, handler):
+        handlers[event] = handler
+        return len(handlers)
+
+    async def execute(command):
+        if command['method'] == 'Tracing.end':
+            handlers['Tracing.dataCollected']({'params': {'value': [
+                {'name': 'navigationStart', 'ts': 0, 'pid': 1, 'tid': 1, 'args': {
+                    'frame': 'F', 'data': {'documentLoaderURL': 'https://a.com/', 'isLoadingMainFrame': True},
+                }},
+                {'name': 'largestContentfulPaint::Candidate', 'ts': 900_000, 'args': {'data': {'size': 10, 'type': 'text'}}},
+            ]}})
+            handlers['Tracing.tracingComplete']({'params': {}})
+
+    mock_tab.on.side_effect = on
+    mock_tab._execute_command.side_effect = execute
+
+    result = await measure_performance('https://a.com/', wait=0, vitals=True)
+
+    assert result['web_vitals']['lcp_ms'] == 900
+    assert result['web_vitals']['complete']
+
+    from web_inspector_mcp.har_files import write_har
+    path = str(tmp_path / 'page.har')
+    write_har(path, [], 'https://a.com/')
+    offline = await measure_performance(path, vitals=True)
+    assert 'error' in offline['web_vitals']
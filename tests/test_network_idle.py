@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from web_inspector_mcp.network_idle import NetworkIdle, load_page
+
+
+def _event(request_id, url=None):
+    params = {'requestId': request_id}
+    if url is not None:
+        params['request'] = {'url': url}
+    return {'params': params}
+
+
+@pytest.mark.asyncio
+async def test_network_idle_registers_and_removes_callbacks(mock_tab):
+    async with NetworkIdle(mock_tab):
+        assert mock_tab.on.await_count == 3
+    assert mock_tab.remove_callback.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_network_idle_waits_for_in_flight_requests(mock_tab):
+    async with NetworkIdle(mock_tab, idle_ms=20) as idle:
+        idle._on_request(_event('1', 'http://example.com/a'))
+        assert idle.in_flight == 1
+        assert not idle.is_idle()
+
+        async def finish():
+            await asyncio.sleep(0.05)
+            idle._on_done(_event('1'))
+
+        task = asyncio.create_task(finish())
+        assert await idle.wait(timeout=2) == 'idle'
+        await task
+        assert idle.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_network_idle_allows_max_inflight(mock_tab):
+    async with NetworkIdle(mock_tab, max_inflight=2, idle_ms=0) as idle:
+        idle._on_request(_event('1', 'http://example.com/poll'))
+        idle._on_request(_event('2', 'http://example.com/socket'))
+        assert await idle.wait(timeout=1) == 'idle'
+
+
+@pytest.mark.asyncio
+async def test_network_idle_times_out(mock_tab):
+    async with NetworkIdle(mock_tab, idle_ms=10) as idle:
+        idle._on_request(_event('1', 'http://example.com/hang'))
+        assert await idle.wait(timeout=0.05) == 'timeout'
+
+
+@pytest.mark.asyncio
+async def test_network_idle_until_predicate(mock_tab):
+    async with NetworkIdle(
+        mock_tab,
+        idle_ms=10_000,
+        until=lambda url: '/api/' in url,
+        until_count=2,
+    ) as idle:
+        idle._on_request(_event('1', 'http://example.com/api/a'))
+        idle._on_request(_event('2', 'http://example.com/img.png'))
+        idle._on_request(_event('3', 'http://example.com/api/b'))
+        idle._on_done(_event('1'))
+        idle._on_done(_event('2'))
+        idle._on_done(_event('unknown'))
+        assert not idle.is_satisfied()
+        idle._on_done(_event('3'))
+        assert idle.matched == 2
+        assert await idle.wait(timeout=1) == 'matched'
+
+
+@pytest.mark.asyncio
+async def test_load_page_fixed(mock_tab):
+    assert await load_page(mock_tab, 'http://example.com', 0, 'fixed') == 'fixed'
+    mock_tab.go_to.assert_awaited_once_with('http://example.com')
+    mock_tab.on.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_load_page_network_idle(mock_tab):
+    reason = await load_page(mock_tab, 'http://example.com', 1, 'networkidle2', idle_ms=0)
+    assert reason == 'idle'
+    mock_tab.go_to.assert_awaited_once_with('http://example.com')
+
+
+@pytest.mark.asyncio
+async def test_load_page_unknown_strategy(mock_tab):
+    with pytest.raises(ValueError):
+        await load_page(mock_tab, 'http://example.com', 1, 'load')
+
+
+@pytest.mark.asyncio
+async def test_network_idle_stop_predicate(mock_tab):
+    seen = []
+    async with NetworkIdle(mock_tab, idle_ms=10_000, stop=lambda: len(seen) >= 2) as idle:
+        idle._on_request(_event('1', 'http://example.com/a'))
+        seen.extend(['a', 'b'])
+        assert await idle.wait(timeout=1) == 'stopped'
@@ -0,0 +1,68 @@
+import json
+import os
+import threading
+
+import pytest
+
+from web_inspector_mcp import offload
+from web_inspector_mcp.tools.extract_api_schema import infer_body_schema
+
+
+def _where():
+    return os.getpid(), threading.get_ident()
+
+
+@pytest.fixture
+def thresholds(monkeypatch):
+    monkeypatch.setattr(offload, 'INLINE_BYTES', 10)
+    monkeypatch.setattr(offload, 'PROCESS_BYTES', 100)
+    yield
+    offload.shutdown()
+
+
+def test_loads():
+    assert offload.loads('{"a": [1, null]}') == {'a': [1, None]}
+    with pytest.raises(ValueError):
+        offload.loads('<html>')
+
+
+@pytest.mark.asyncio
+async def test_small_work_runs_inline(thresholds):
+    assert await offload.run_sized(_where, size=5) == _where()
+
+
+@pytest.mark.asyncio
+async def test_medium_work_runs_in_a_thread(thresholds):
+    pid, thread = await offload.run_sized(_where, size=50)
+    assert pid == os.getpid()
+    assert thread != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_large_work_runs_in_a_process(thresholds, monkeypatch):
+    monkeypatch.setattr(offload, 'CPU_WORKERS', 1)
+    pid, _ = await offload.run_sized(_where, size=500)
+    assert pid != os.getpid()
+
+    # Work that has to come back unpickled stays in-process
+    pid, _ = await offload.run_sized(_where, size=500, processes=False)
+    assert pid == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_schema_inferred_in_a_worker(thresholds, monkeypatch):
+    monkeypatch.setattr(offload, 'CPU_WORKERS', 1)
+    body = json.dumps({'items': [{'id': i} for i in range(50)]})
+
+    schema, keys = await offload.run_sized(infer_body_schema, body, {}, size=len(body))
+
+    assert keys == ['items']
+    assert schema.to_dict()['properties']['items']['items']['count'] == 50
+
+
+@pytest.mark.asyncio
+async def test_no_workers_falls_back_to_threads(thresholds, monkeypatch):
+    monkeypatch.setattr(offload, 'CPU_WORKERS', 0)
+    pid, thread = await offload.run_sized(_where, size=500)
+    assert pid == os.getpid()
+    assert thread != threading.get_ident()
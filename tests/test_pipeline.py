@@ -0,0 +1,114 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.pipeline import aggregate_page
+from web_inspector_mcp.tools.capture_network import NetworkAggregator, capture_network
+from web_inspector_mcp.tools.discover_endpoints import discover_endpoints
+from web_inspector_mcp.tools.measure_performance import PerformanceAggregator
+
+
+def _entry(url, resource_type='XHR', size=0, time=0.0):
+    return {
+        'request': {'url': url, 'method': 'GET'},
+        'response': {'status': 200, 'bodySize': size},
+        '_resourceType': resource_type,
+        'startedDateTime': '2024-01-01T00:00:00Z',
+        'time': time,
+    }
+
+
+def _streaming_capture(monkeypatch, entries, delay=0.0):
+    """Replaces capture_page with one that streams ``entries`` to on_entry."""
+    calls = {}
+
+    async def fake_capture_page(url, on_entry=None, stop=None, **options):
+        calls.update(options, stop=stop)
+        settled_by = 'idle'
+        for entry in entries:
+            on_entry(entry)
+            await asyncio.sleep(delay)
+            if stop is not None and stop():
+                settled_by = 'stopped'
+                break
+        return PageCapture(url=url, entries=[], settled_by=settled_by)
+
+    monkeypatch.setattr("web_inspector_mcp.pipeline.capture_page", fake_capture_page)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_aggregate_page_without_streaming(monkeypatch):
+    entries = [_entry('http://a.com/1'), _entry('http://b.com/2')]
+    monkeypatch.setattr(
+        "web_inspector_mcp.pipeline.capture_page",
+        AsyncMock(return_value=PageCapture(url='http://a.com', entries=entries)),
+    )
+    aggregator = NetworkAggregator()
+
+    await aggregate_page('http://a.com', aggregator)
+
+    assert aggregator.summary() == '2 requests from 2 domains'
+
+
+@pytest.mark.asyncio
+async def test_aggregate_page_streams_progress(monkeypatch):
+    entries = [_entry(f'http://a.com/{i}') for i in range(5)]
+    calls = _streaming_capture(monkeypatch, entries, delay=0.02)
+    on_progress = AsyncMock()
+
+    await aggregate_page('http://a.com', NetworkAggregator(), on_progress, interval=0.01)
+
+    assert calls['bodies'] is False
+    counts = [c.args[0] for c in on_progress.await_args_list]
+    assert counts == sorted(counts)
+    assert len(counts) >= 2  # partial results arrived before the end
+    on_progress.assert_awaited_with(5, '5 requests from 1 domains')
+
+
+@pytest.mark.asyncio
+async def test_capture_network_stops_at_max_requests(monkeypatch):
+    entries = [_entry(f'http://a.com/{i}') for i in range(10)]
+    _streaming_capture(monkeypatch, entries)
+
+    res = await capture_network('http://a.com', wait=0, max_requests=3)
+
+    assert res['total_requests'] == 3
+    assert res['settled_by'] == 'stopped'
+
+
+@pytest.mark.asyncio
+async def test_discover_endpoints_stops_at_max_endpoints(monkeypatch):
+    entries = [
+        _entry('http://a.com/api/users?page=1'),
+        _entry('http://a.com/api/users?page=2'),
+        _entry('http://a.com/logo.png', resource_type='Image'),
+        _entry('http://a.com/api/orders'),
+        _entry('http://a.com/api/cart'),
+    ]
+    _streaming_capture(monkeypatch, entries)
+
+    res = await discover_endpoints('http://a.com', wait=0, max_endpoints=2)
+
+    assert res['total_endpoints'] == 2
+    assert res['endpoints'][0]['count'] == 2
+    assert res['settled_by'] == 'stopped'
+
+
+def test_performance_aggregator_keeps_bounded_tops():
+    aggregator = PerformanceAggregator(top_n=3)
+    for i in range(20):
+        aggregator.add(_entry(f'http://a.com/{i}', size=i % 7 * 100, time=float(i % 5)))
+
+    result = aggregator.result('http://a.com', {})
+
+    assert result['total_requests'] == 20
+    assert [r['duration_ms'] for r in result['slowest_resources']] == [4.0, 4.0, 4.0]
+    # Ties keep arrival order
+    assert [r['url'] for r in result['slowest_resources']] == [
+        'http://a.com/4', 'http://a.com/9', 'http://a.com/14',
+    ]
+    assert [r['size_bytes'] for r in result['largest_resources']] == [600, 600, 500]
+    assert len(aggregator._slowest) == 3
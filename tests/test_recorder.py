@@ -0,0 +1,126 @@
+import base64
+
+import pytest
+from pydoll.browser.requests.har_recorder import HarCapture, HarRecorder
+
+from web_inspector_mcp.recorder import SelectiveHarRecorder, record
+from web_inspector_mcp.request_filter import RequestFilter
+
+
+def test_pydoll_recorder_internals_are_present(mock_tab):
+    # SelectiveHarRecorder overrides and calls these private pydoll members;
+    # if an upgrade renames them, recording silently loses bodies or entries
+    recorder = HarRecorder(mock_tab)
+    for name in ('_finalize_entry', '_build_entry', '_fetch_response_body'):
+        assert callable(getattr(HarRecorder, name, None)), name
+    for name in ('_pending', '_entries', '_body_tasks'):
+        assert hasattr(recorder, name), name
+    assert HarCapture(recorder)._recorder is recorder
+
+
+def _load(recorder, request_id, url, body_bytes=100):
+    """Fires the CDP events of one completed request at the recorder."""
+    recorder._on_request_will_be_sent({'params': {
+        'requestId': request_id,
+        'request': {'url': url, 'method': 'GET', 'headers': {}},
+        'wallTime': 1700000000.0,
+        'timestamp': 1.0,
+        'type': 'Fetch',
+    }})
+    recorder._on_response_received({'params': {
+        'requestId': request_id,
+        'timestamp': 1.1,
+        'response': {'status': 200, 'statusText': 'OK', 'mimeType': 'application/json'},
+    }})
+    recorder._data_received_sizes[request_id] = body_bytes
+    recorder._on_loading_finished({'params': {
+        'requestId': request_id, 'encodedDataLength': body_bytes, 'timestamp': 1.2,
+    }})
+
+
+def _serve_bodies(mock_tab, bodies, base64_encoded=False):
+    async def execute(command, **kwargs):
+        return {'result': {'body': bodies[command['params']['requestId']], 'base64Encoded': base64_encoded}}
+
+    mock_tab._execute_command.side_effect = execute
+
+
+@pytest.mark.asyncio
+async def test_record_fetches_only_matching_bodies(mock_tab):
+    _serve_bodies(mock_tab, {'1': '{"ok": true}', '2': 'PNG...'})
+
+    async with record(mock_tab, body_filter=RequestFilter(include='*/api/*')) as capture:
+        _load(capture._recorder, '1', 'http://example.com/api/data')
+        _load(capture._recorder, '2', 'http://example.com/logo.png')
+
+    entries = {e['request']['url']: e for e in capture.entries}
+    api = entries['http://example.com/api/data']
+    image = entries['http://example.com/logo.png']
+    assert api['response']['content']['text'] == '{"ok": true}'
+    assert 'text' not in image['response']['content']
+    assert image['_bodyOmitted'] == 'filtered'
+    assert image['response']['bodySize'] == 100  # metadata is still recorded
+
+    # Only the matching body cost a CDP round-trip
+    assert mock_tab._execute_command.await_count == 1
+    assert capture.stats() == {
+        'bodies_fetched': 1, 'bodies_skipped': 1, 'bodies_truncated': 0, 'body_bytes': 12,
+    }
+
+
+@pytest.mark.asyncio
+async def test_recorder_caps_each_body_and_the_total(mock_tab):
+    _serve_bodies(mock_tab, {'1': 'a' * 50, '2': 'b' * 20, '3': 'c' * 20})
+    recorder = SelectiveHarRecorder(mock_tab, max_body_bytes=30, max_total_bytes=40)
+
+    for request_id in ('1', '2', '3'):
+        _load(recorder, request_id, f'http://example.com/{request_id}')
+        await recorder._body_tasks[-1]
+
+    first, second, third = recorder._entries
+    assert first['response']['content']['text'] == 'a' * 30
+    assert first['_bodyTruncated'] is True
+    assert second['response']['content']['text'] == 'b' * 10  # what's left of the budget
+    assert third['_bodyOmitted'] == 'budget'
+    assert recorder.stats()['body_bytes'] == 40
+    assert recorder.stats()['bodies_truncated'] == 2
+
+
+@pytest.mark.asyncio
+async def test_recorder_truncates_base64_on_a_block_boundary(mock_tab):
+    encoded = base64.b64encode(b'x' * 30).decode()
+    _serve_bodies(mock_tab, {'1': encoded}, base64_encoded=True)
+    recorder = SelectiveHarRecorder(mock_tab, max_body_bytes=10)
+
+    _load(recorder, '1', 'http://example.com/img')
+    await recorder._body_tasks[-1]
+
+    text = recorder._entries[0]['response']['content']['text']
+    assert len(text) == 8
+    base64.b64decode(text)
+
+
+@pytest.mark.asyncio
+async def test_recorder_caps_bodies_in_utf8_bytes(mock_tab):
+    _serve_bodies(mock_tab, {'1': 'é' * 10})
+    recorder = SelectiveHarRecorder(mock_tab, max_body_bytes=7)
+
+    _load(recorder, '1', 'http://example.com/text')
+    await recorder._body_tasks[-1]
+
+    # Two bytes per character: three fit, the fourth would be split
+    assert recorder._entries[0]['response']['content']['text'] == 'ééé'
+    assert recorder.stats()['body_bytes'] == 6
+
+
+@pytest.mark.asyncio
+async def test_recorder_streams_entries_without_bodies(mock_tab):
+    seen = []
+    recorder = SelectiveHarRecorder(mock_tab, fetch_bodies=False, on_entry=seen.append)
+
+    _load(recorder, '1', 'http://example.com/api/data')
+    await recorder._body_tasks[-1]
+
+    assert [e['request']['url'] for e in seen] == ['http://example.com/api/data']
+    assert seen[0]['_bodyOmitted'] == 'disabled'
+    mock_tab._execute_command.assert_not_awaited()
@@ -0,0 +1,55 @@
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.records import RequestRecord, to_records
+from web_inspector_mcp.request_filter import RequestFilter
+
+
+def _entry(url, method='GET', body_size=10, transfer_size=0):
+    return {
+        'request': {'url': url, 'method': method},
+        'response': {
+            'status': 200,
+            'bodySize': body_size,
+            '_transferSize': transfer_size,
+            'content': {'mimeType': 'application/json; charset=utf-8'},
+        },
+        '_resourceType': 'Fetch',
+        'startedDateTime': '2024-01-01T00:00:00Z',
+        'time': 12.34,
+    }
+
+
+def test_from_entry():
+    record = RequestRecord.from_entry(_entry('https://api.example.com:8443/v1/items?page=2#top'))
+
+    assert record.domain == 'api.example.com:8443'
+    assert record.clean_url == 'https://api.example.com:8443/v1/items'
+    assert record.has_query is True
+    assert record.mime_type == 'application/json'
+    assert record.time_ms == 12.34
+    assert not hasattr(record, '__dict__')
+
+
+def test_repeated_strings_are_interned():
+    first, second = to_records([
+        _entry(''.join(['https://', 'example.com/a'])),
+        _entry(''.join(['https://', 'example.com/b'])),
+    ])
+    assert first.domain is second.domain
+    assert first.method is second.method
+
+
+def test_transfer_bytes_falls_back():
+    assert RequestRecord.from_entry(_entry('http://a/', body_size=-1, transfer_size=70)).transfer_bytes == 70
+    assert RequestRecord.from_entry(_entry('http://a/', body_size=-1, transfer_size=-1)).transfer_bytes == 0
+
+
+def test_capture_records_built_once():
+    capture = PageCapture(url='http://a/', entries=[_entry('http://a/1')])
+    assert capture.records is capture.records
+    assert capture.records[0].url == 'http://a/1'
+
+
+def test_request_filter_matches_record():
+    record = RequestRecord.from_entry(_entry('http://a/api/items', method='POST'))
+    assert RequestFilter(include='*api*', methods='POST', content_types='*json').matches_record(record)
+    assert not RequestFilter(methods='GET').matches_record(record)
@@ -0,0 +1,153 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from web_inspector_mcp.capture import capture_page
+from web_inspector_mcp.har_files import write_har
+from web_inspector_mcp.replay import ReplayArchive, RequestReplayer
+
+
+def _entry(url, text='{}', status=200, time=0, method='GET', encoding=None):
+    content = {'mimeType': 'application/json', 'text': text}
+    if encoding:
+        content['encoding'] = encoding
+    return {
+        'request': {'url': url, 'method': method},
+        'response': {
+            'status': status,
+            'statusText': 'OK',
+            'headers': [
+                {'name': 'Content-Type', 'value': 'application/json'},
+                {'name': 'Content-Encoding', 'value': 'gzip'},
+                {'name': 'Content-Length', 'value': '99'},
+            ],
+            'content': content,
+        },
+        'time': time,
+    }
+
+
+def _paused(url, request_id='r1', method='GET'):
+    return {'params': {'requestId': request_id, 'request': {'url': url, 'method': method}}}
+
+
+def _commands(mock_tab):
+    return [c.args[0] for c in mock_tab._execute_command.await_args_list]
+
+
+def test_archive_replays_in_recorded_order():
+    archive = ReplayArchive.from_entries([
+        _entry('https://a.com/api?page=1', '"first"'),
+        _entry('https://a.com/api?page=1', '"second"'),
+        _entry('https://a.com/api?page=2', '"other"'),
+    ])
+
+    bodies = [base64.b64decode(archive.match('GET', 'https://a.com/api?page=1#x')['body']) for _ in range(3)]
+
+    assert bodies == [b'"first"', b'"second"', b'"second"']
+    # Unrecorded query falls back to the same path; other methods don't match
+    assert base64.b64decode(archive.match('get', 'https://a.com/api?page=9')['body']) == b'"first"'
+    assert archive.match('POST', 'https://a.com/api?page=1') is None
+    assert len(archive) == 3
+
+
+@pytest.mark.asyncio
+async def test_replayer_fulfills_from_archive(mock_tab):
+    archive = ReplayArchive.from_entries([
+        _entry('https://a.com/', 'héllo'),
+        _entry('https://a.com/logo.png', base64.b64encode(b'\x89PNG').decode(), encoding='base64'),
+        _entry('https://a.com/broken', status=0),
+    ])
+
+    async with RequestReplayer(mock_tab, archive, latency=0) as replayer:
+        enable = _commands(mock_tab)[0]
+        assert enable['method'] == 'Fetch.enable'
+        assert enable['params']['patterns'] == [{'urlPattern': '*', 'requestStage': 'Request'}]
+        event, handler = mock_tab.on.await_args.args
+        assert event == 'Fetch.requestPaused'
+
+        for i, url in enumerate(['https://a.com/', 'https://a.com/logo.png', 'https://a.com/broken', 'https://a.com/missing']):
+            await handler(_paused(url, f'r{i}'))
+        await asyncio.sleep(0.01)
+
+    sent = {c['params']['requestId']: c for c in _commands(mock_tab) if 'requestId' in c.get('params', {})}
+    page = sent['r0']
+    assert page['method'] == 'Fetch.fulfillRequest'
+    assert page['params']['responseCode'] == 200
+    assert base64.b64decode(page['params']['body']).decode() == 'héllo'
+    assert page['params']['responseHeaders'] == [{'name': 'Content-Type', 'value': 'application/json'}]
+    assert base64.b64decode(sent['r1']['params']['body']) == b'\x89PNG'
+    assert sent['r2']['method'] == 'Fetch.failRequest'
+    assert sent['r3']['params']['errorReason'] == 'InternetDisconnected'
+    assert replayer.stats() == {'served': 3, 'unmatched': 1}
+    assert _commands(mock_tab)[-1]['method'] == 'Fetch.disable'
+    mock_tab.remove_callback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_replayer_delays_and_passthrough(mock_tab):
+    archive = ReplayArchive.from_entries([_entry('https://a.com/slow', time=50), _entry('https://a.com/fast', time=0)])
+
+    async with RequestReplayer(mock_tab, archive, unmatched='passthrough'):
+        _, handler = mock_tab.on.await_args.args
+        await handler(_paused('https://a.com/slow', 'slow'))
+        await handler(_paused('https://a.com/fast', 'fast'))
+        await handler(_paused('https://b.com/', 'live'))
+        await asyncio.sleep(0.01)
+        answered = [c['params']['requestId'] for c in _commands(mock_tab)[1:]]
+        # The slow response hasn't been sent yet and doesn't hold up the others
+        assert answered == ['fast', 'live']
+        await asyncio.sleep(0.06)
+        assert _commands(mock_tab)[-1]['params']['requestId'] == 'slow'
+
+    assert _commands(mock_tab)[2]['method'] == 'Fetch.continueRequest'
+
+
+@pytest.mark.asyncio
+async def test_replayer_cancels_pending_responses(mock_tab):
+    archive = ReplayArchive.from_entries([_entry('https://a.com/', time=10_000)])
+
+    async with RequestReplayer(mock_tab, archive) as replayer:
+        _, handler = mock_tab.on.await_args.args
+        await handler(_paused('https://a.com/'))
+        assert len(replayer._tasks) == 1
+
+    assert not replayer._tasks
+    assert 'Fetch.fulfillRequest' not in [c['method'] for c in _commands(mock_tab)]
+
+
+def test_replayer_validates_options(mock_tab):
+    with pytest.raises(ValueError):
+        RequestReplayer(mock_tab, ReplayArchive(), unmatched='ignore')
+    with pytest.raises(ValueError):
+        RequestReplayer(mock_tab, ReplayArchive(), latency='fast')
+
+
+@pytest.mark.asyncio
+async def test_capture_page_replays_saved_capture(mock_chrome, mock_tab, tmp_path):
+    path = str(tmp_path / 'baseline.har')
+    write_har(path, [_entry('https://a.com/', json.dumps({'ok': True}))], 'https://a.com/')
+    mock_tab.request.record.return_value.__aenter__.return_value.entries = []
+
+    capture = await capture_page('https://a.com/', wait=0, with_timing=False, replay=path, replay_latency=0)
+
+    assert capture.replay_stats == {'served': 0, 'unmatched': 0}
+    assert 'Fetch.enable' in [c['method'] for c in _commands(mock_tab)]
+
+    with pytest.raises(ValueError, match='replay'):
+        await capture_page('https://a.com/', wait=0, replay=path, block=['image'])
+
+
+@pytest.mark.asyncio
+async def test_measure_performance_reports_replay(mock_chrome, mock_tab, tmp_path):
+    from web_inspector_mcp.tools.measure_performance import measure_performance
+
+    path = str(tmp_path / 'baseline.ndjson')
+    write_har(path, [_entry('https://a.com/')])
+    mock_tab.request.record.return_value.__aenter__.return_value.entries = []
+
+    result = await measure_performance('https://a.com/', wait=0, replay=path, replay_latency=0)
+
+    assert result['replay'] == {'served': 0, 'unmatched': 0}
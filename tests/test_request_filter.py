@@ -0,0 +1,115 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from web_inspector_mcp.request_filter import RequestFilter
+from web_inspector_mcp.tools.intercept_api import intercept_api
+
+
+def _entry(url, method='GET', status=200, resource_type='XHR', mime='application/json'):
+    return {
+        'request': {'url': url, 'method': method},
+        'response': {'status': status, 'content': {'mimeType': mime}},
+        '_resourceType': resource_type,
+    }
+
+
+def test_include_and_exclude_globs():
+    f = RequestFilter(include=['*api*', 'https://CDN.example.com/data/*'], exclude=['*/api/health*'])
+
+    assert f._include_prefixes == ('https://cdn.example.com/data/',)
+    assert f.matches_url('http://example.com/API/users')
+    assert f.matches_url('https://cdn.example.com/data/x.json')
+    assert not f.matches_url('http://example.com/api/health')
+    assert not f.matches_url('http://example.com/logo.png')
+
+
+def test_regexes():
+    f = RequestFilter(regex=[r'/v\d+/'], exclude_regex=[r'\.png$'])
+
+    assert f.matches_url('http://example.com/V2/items')
+    assert not f.matches_url('http://example.com/v2/logo.png')
+    assert not f.matches_url('http://example.com/items')
+
+
+def test_no_rules_matches_everything():
+    assert RequestFilter().matches(_entry('http://example.com/anything'))
+
+
+def test_request_predicates():
+    f = RequestFilter(
+        methods=['post'],
+        status=['2xx', '304', '400-401'],
+        resource_types=['fetch', 'XHR'],
+        content_types=['*json*'],
+    )
+
+    assert f.matches(_entry('http://x/a', 'POST', 201, 'Fetch'))
+    assert f.matches(_entry('http://x/a', 'POST', 401))
+    assert not f.matches(_entry('http://x/a', 'GET'))
+    assert not f.matches(_entry('http://x/a', 'POST', 404))
+    assert not f.matches(_entry('http://x/a', 'POST', resource_type='Image'))
+    assert not f.matches(_entry('http://x/a', 'POST', mime='text/html'))
+    # Status is unknown before the response arrives
+    assert f.matches_request('http://x/a', 'POST', None, 'XHR', 'application/json')
+
+
+def test_content_type_falls_back_to_headers():
+    f = RequestFilter(content_types=['application/json'])
+    entry = _entry('http://x/a', mime='')
+    entry['response']['headers'] = [{'name': 'Content-Type', 'value': 'application/json; charset=utf-8'}]
+
+    assert f.matches(entry)
+
+
+def test_apply_filters_in_one_pass():
+    f = RequestFilter(include=['*api*'], methods=['GET'])
+    entries = [
+        _entry('http://x/api/1'),
+        _entry('http://x/api/2', 'POST'),
+        _entry('http://x/img.png'),
+    ]
+
+    assert f.apply(entries) == entries[:1]
+
+
+def test_from_spec():
+    f = RequestFilter.from_spec({'methods': ['GET']}, pattern='*graphql*')
+    assert f.spec['include'] == ['*graphql*']
+    assert f.describe() == {'include': ['*graphql*'], 'methods': ['GET']}
+
+    # Explicit include rules replace the pattern
+    f = RequestFilter.from_spec({'include': '*v1*'}, pattern='*api*')
+    assert f.describe() == '*v1*'
+    assert f.key == (('include', ('*v1*',)),)
+
+    with pytest.raises(ValueError, match='Unknown filter keys'):
+        RequestFilter.from_spec({'method': 'GET'})
+    with pytest.raises(ValueError):
+        RequestFilter(status=['abc'])
+
+
+def test_coerce():
+    f = RequestFilter(include='*a*')
+    assert RequestFilter.coerce(f) is f
+    assert RequestFilter.coerce('*api*').describe() == '*api*'
+    assert RequestFilter.coerce({'methods': 'GET'}).spec['methods'] == ['GET']
+
+
+@pytest.mark.asyncio
+async def test_intercept_api_with_match(mock_chrome, mock_tab, monkeypatch):
+    recording = MagicMock(entries=[
+        _entry('http://example.com/api/items', 'GET'),
+        _entry('http://example.com/api/items', 'POST', 500),
+    ])
+    record_ctx = AsyncMock()
+    record_ctx.__aenter__.return_value = recording
+    record = MagicMock(return_value=record_ctx)
+    monkeypatch.setattr("web_inspector_mcp.capture.record", record)
+
+    res = await intercept_api("http://example.com", wait=0, match={'status': '2xx'})
+
+    assert res['matched_count'] == 1
+    assert res['results'][0]['method'] == 'GET'
+    assert res['pattern'] == {'include': ['*api*'], 'status': ['2xx']}
+    assert record.call_args.kwargs['body_filter'].spec['status'] == ['2xx']
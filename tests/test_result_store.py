@@ -0,0 +1,89 @@
+import pytest
+
+from web_inspector_mcp.capture_cache import estimate_size
+from web_inspector_mcp.result_store import ResultStore
+
+
+def _rows(n):
+    return [{'url': f'http://a/{i}', 'status': 200, 'response': {'body': str(i), 'size': i}} for i in range(n)]
+
+
+def test_page_walks_rows():
+    store = ResultStore()
+    handle = store.put(_rows(5), {'source': 'requests'})
+
+    first = store.page(handle, limit=2)
+    assert [r['url'] for r in first['rows']] == ['http://a/0', 'http://a/1']
+    assert first['total'] == 5
+    assert first['next_offset'] == 2
+    assert first['source'] == 'requests'
+
+    last = store.page(handle, offset=4, limit=2)
+    assert len(last['rows']) == 1
+    assert last['next_offset'] is None
+
+
+def test_page_projects_fields():
+    store = ResultStore()
+    handle = store.put(_rows(2))
+
+    page = store.page(handle, fields=['url', 'response.size', 'missing'])
+
+    assert page['rows'][1] == {'url': 'http://a/1', 'response.size': 1}
+
+
+def test_handles_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('web_inspector_mcp.result_store.time.monotonic', lambda: now[0])
+    store = ResultStore(ttl=60)
+    handle = store.put(_rows(1))
+
+    assert store.page(handle)['total'] == 1
+    now[0] += 61
+    with pytest.raises(ValueError, match='expired'):
+        store.page(handle)
+
+
+def test_least_recently_used_handle_is_evicted():
+    store = ResultStore(max_handles=2)
+    first = store.put(_rows(1))
+    second = store.put(_rows(1))
+    store.page(first)
+    store.put(_rows(1))
+
+    store.page(first)
+    with pytest.raises(ValueError):
+        store.page(second)
+
+
+def test_byte_budget_evicts_oldest_handles():
+    body = 'x' * 1000
+    store = ResultStore(max_bytes=2500)
+    first = store.put([{'body': body}])
+    second = store.put([{'body': body}])
+    third = store.put([{'body': body}])
+
+    with pytest.raises(ValueError):
+        store.page(first)
+    assert store.page(second)['total'] == 1
+    assert store.page(third)['total'] == 1
+    assert store.bytes == 2 * estimate_size([{'body': body}])
+
+    # A result over the whole budget is still readable until the next one
+    huge = store.put([{'body': body * 5}])
+    assert store.page(huge)['total'] == 1
+    assert store.bytes == estimate_size([{'body': body * 5}])
+    store.clear()
+    assert store.bytes == 0
+
+
+def test_paginate_only_when_oversized():
+    store = ResultStore()
+    small = {'requests': _rows(3), 'total_requests': 3}
+    assert store.paginate(small, 'requests', 3) is small
+
+    big = store.paginate({'requests': _rows(10), 'total_requests': 10}, 'requests', 4)
+
+    assert len(big['requests']) == 4
+    assert big['total_rows'] == 10
+    assert store.page(big['handle'], offset=4, limit=10)['rows'][0]['url'] == 'http://a/4'
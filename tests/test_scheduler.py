@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from web_inspector_mcp.scheduler import Scheduler
+
+
+async def _job(log, name, gate):
+    log.append(f'start {name}')
+    await gate.wait()
+    log.append(f'end {name}')
+    return {'job': name}
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_and_reports_stats():
+    scheduler = Scheduler(max_concurrent=2)
+
+    async def work():
+        return {'ok': True}
+
+    result, stats = await scheduler.run('a', work)
+    assert result == {'ok': True}
+    assert stats['queue_depth'] == 0
+    assert stats['active_at_arrival'] == 0
+    assert 'queued_ms' in stats and 'run_ms' in stats
+    assert scheduler.stats() == {'active': 0, 'max_concurrent': 2, 'queued': 0, 'clients': {}}
+
+
+@pytest.mark.asyncio
+async def test_scheduler_global_cap_queues_calls():
+    scheduler = Scheduler(max_concurrent=1, max_per_client=5)
+    gate = asyncio.Event()
+    log = []
+
+    first = asyncio.create_task(scheduler.run('a', lambda: _job(log, 1, gate)))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(scheduler.run('b', lambda: _job(log, 2, gate)))
+    await asyncio.sleep(0.01)
+
+    assert log == ['start 1']
+    assert scheduler.stats()['queued'] == 1
+    assert scheduler.stats()['clients']['b'] == {'active': 0, 'queued': 1}
+
+    gate.set()
+    _, stats = await second
+    await first
+    assert log == ['start 1', 'end 1', 'start 2', 'end 2']
+    assert stats['queue_depth'] == 0
+    assert stats['active_at_arrival'] == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_round_robin_across_clients():
+    scheduler = Scheduler(max_concurrent=1, max_per_client=5)
+    order = []
+    blocker = asyncio.Event()
+
+    async def job(name):
+        order.append(name)
+        if name == 'busy':
+            await blocker.wait()
+        return {}
+
+    tasks = [asyncio.create_task(scheduler.run('a', lambda: job('busy')))]
+    await asyncio.sleep(0)
+    # Client a floods the queue before client b arrives
+    for i in range(3):
+        tasks.append(asyncio.create_task(scheduler.run('a', lambda i=i: job(f'a{i}'))))
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(scheduler.run('b', lambda: job('b0'))))
+    await asyncio.sleep(0.01)
+
+    blocker.set()
+    await asyncio.gather(*tasks)
+    # b is admitted after a single call of a, not after all of a's backlog
+    assert order.index('b0') < order.index('a1')
+
+
+@pytest.mark.asyncio
+async def test_scheduler_per_client_limit():
+    scheduler = Scheduler(max_concurrent=4, max_per_client=1)
+    gate = asyncio.Event()
+    log = []
+
+    tasks = [
+        asyncio.create_task(scheduler.run('a', lambda: _job(log, 'a1', gate))),
+        asyncio.create_task(scheduler.run('a', lambda: _job(log, 'a2', gate))),
+        asyncio.create_task(scheduler.run('b', lambda: _job(log, 'b1', gate))),
+    ]
+    await asyncio.sleep(0.01)
+    assert sorted(log) == ['start a1', 'start b1']
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert 'start a2' in log
+
+
+@pytest.mark.asyncio
+async def test_scheduler_weight_occupies_slots():
+    scheduler = Scheduler(max_concurrent=3, max_per_client=5)
+    gate = asyncio.Event()
+    log = []
+
+    heavy = asyncio.create_task(scheduler.run('a', lambda: _job(log, 'batch', gate), weight=10))
+    await asyncio.sleep(0)
+    light = asyncio.create_task(scheduler.run('b', lambda: _job(log, 'single', gate)))
+    await asyncio.sleep(0.01)
+
+    # The batch is clamped to the whole capacity, so the single call waits
+    assert scheduler.stats()['active'] == 3
+    assert log == ['start batch']
+    gate.set()
+    await asyncio.gather(heavy, light)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_deadline_cancels_work():
+    scheduler = Scheduler(max_concurrent=1)
+    cancelled = asyncio.Event()
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        await scheduler.run('a', hang, deadline=0.05)
+    assert cancelled.is_set()
+    assert scheduler.stats()['active'] == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_deadline_while_queued():
+    scheduler = Scheduler(max_concurrent=1)
+    gate = asyncio.Event()
+    log = []
+
+    running = asyncio.create_task(scheduler.run('a', lambda: _job(log, 1, gate)))
+    await asyncio.sleep(0)
+    with pytest.raises(TimeoutError):
+        await scheduler.run('b', lambda: _job(log, 2, gate), deadline=0.05)
+    assert scheduler.stats()['queued'] == 0
+
+    gate.set()
+    await running
+    assert log == ['start 1', 'end 1']
+    assert scheduler.stats() == {'active': 0, 'max_concurrent': 1, 'queued': 0, 'clients': {}}
@@ -0,0 +1,93 @@
+import sys
+
+from web_inspector_mcp.schema import SchemaNode, json_type
+
+
+def test_json_type():
+    assert json_type(None) == 'null'
+    assert json_type(True) == 'boolean'
+    assert json_type(42) == 'integer'
+    assert json_type(3.14) == 'number'
+    assert json_type("hello") == 'string'
+    assert json_type([1, 2]) == 'array'
+    assert json_type({"a": 1}) == 'object'
+
+
+def test_merges_every_array_item():
+    data = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': None}, {'id': '3', 'extra': True}]
+
+    schema = SchemaNode.from_value(data).to_dict()
+
+    assert schema['min_length'] == schema['max_length'] == 3
+    items = schema['items']
+    assert items['count'] == 3
+    assert items['properties']['id']['type'] == ['integer', 'string']
+    assert items['properties']['id']['type_counts'] == {'integer': 2, 'string': 1}
+    assert 'optional' not in items['properties']['id']
+    assert items['properties']['name'] == {'optional': True, 'type': 'string', 'nullable': True, 'count': 2}
+    assert items['properties']['extra']['optional'] is True
+
+
+def test_long_arrays_are_sampled():
+    data = [{'n': i} for i in range(10_000)]
+
+    schema = SchemaNode.from_value(data, sample_size=50).to_dict()
+
+    assert schema['max_length'] == 10_000
+    assert schema['sampled'] == 50
+    assert schema['items']['count'] == 50
+
+
+def test_sampling_is_repeatable():
+    data = [i if i % 2 else str(i) for i in range(1000)]
+    first = SchemaNode.from_value(data, sample_size=10).to_dict()
+    second = SchemaNode.from_value(data, sample_size=10).to_dict()
+    assert first == second
+
+
+def test_property_count_is_bounded():
+    schema = SchemaNode.from_value({f'k{i}': i for i in range(10)}, max_properties=4).to_dict()
+
+    assert list(schema['properties']) == ['k0', 'k1', 'k2', 'k3']
+    assert schema['untracked_keys'] == 6
+
+
+def test_deep_nesting_does_not_recurse():
+    data = current = {}
+    for _ in range(sys.getrecursionlimit() * 2):
+        current['child'] = current = {}
+
+    schema = SchemaNode.from_value(data).to_dict()
+
+    depth = 0
+    while 'properties' in schema:
+        schema = schema['properties']['child']
+        depth += 1
+    assert depth == sys.getrecursionlimit() * 2
+
+
+def test_max_depth():
+    schema = SchemaNode.from_value({'a': {'b': {'c': 1}}}, max_depth=1).to_dict()
+    assert schema['properties']['a'] == {'type': 'object', 'count': 1}
+
+
+def test_merge_matches_observing_both():
+    first = {'id': 1, 'tags': ['a'], 'owner': None}
+    second = {'id': 'x', 'tags': [], 'extra': {'k': 1}}
+
+    merged = SchemaNode.from_value(first)
+    merged.merge(SchemaNode.from_value(second))
+    observed = SchemaNode.from_value(first)
+    observed.observe(second)
+
+    assert merged.to_dict() == observed.to_dict()
+    assert merged.to_dict()['properties']['extra']['optional'] is True
+
+
+def test_merge_respects_property_limit():
+    node = SchemaNode(max_properties=2)
+    node.observe({'a': 1, 'b': 2})
+    node.merge(SchemaNode.from_value({'c': 3, 'a': 4}))
+
+    assert list(node.to_dict()['properties']) == ['a', 'b']
+    assert node.extra_keys == 1
@@ -1,15 +1,28 @@
-from unittest.mock import AsyncMock
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from web_inspector_mcp.server import (
+    _client_id,
+    _max_concurrent,
+    _progress,
     api_interceptor,
     api_schema_extractor,
+    batch_analysis,
+    cache_stats,
     endpoint_discovery,
+    fetch_results,
+    har_export,
+    lifespan,
     main,
     mcp,
     network_capture,
+    page_analysis,
     performance_metrics,
+    server_status,
+    site_crawl,
 )
 
 
@@ -20,34 +33,250 @@ def mock_tools(monkeypatch):
     monkeypatch.setattr("web_inspector_mcp.server.discover_endpoints", AsyncMock(return_value={"discovered": True}))
     monkeypatch.setattr("web_inspector_mcp.server.measure_performance", AsyncMock(return_value={"measured": True}))
     monkeypatch.setattr("web_inspector_mcp.server.extract_api_schema", AsyncMock(return_value={"extracted": True}))
+    monkeypatch.setattr("web_inspector_mcp.server.analyze_page", AsyncMock(return_value={"analyzed": True}))
+    monkeypatch.setattr("web_inspector_mcp.server.export_har", AsyncMock(return_value={"exported": True}))
 
 @pytest.mark.asyncio
 async def test_network_capture_tool(mock_tools):
     res = await network_capture("http://example.com", 2)
-    assert res == {"captured": True}
+    assert res["captured"] is True
+    assert res["scheduler"]["queue_depth"] == 0
 
 @pytest.mark.asyncio
 async def test_api_interceptor_tool(mock_tools):
     res = await api_interceptor("http://example.com", "*api*", 2)
-    assert res == {"intercepted": True}
+    assert res["intercepted"] is True
+    assert res["scheduler"]["queue_depth"] == 0
 
 @pytest.mark.asyncio
 async def test_endpoint_discovery_tool(mock_tools):
     res = await endpoint_discovery("http://example.com", 2)
-    assert res == {"discovered": True}
+    assert res["discovered"] is True
+    assert res["scheduler"]["queue_depth"] == 0
 
 @pytest.mark.asyncio
 async def test_performance_metrics_tool(mock_tools):
     res = await performance_metrics("http://example.com", 2)
-    assert res == {"measured": True}
+    assert res["measured"] is True
+    assert res["scheduler"]["queue_depth"] == 0
 
 @pytest.mark.asyncio
 async def test_api_schema_extractor_tool(mock_tools):
     res = await api_schema_extractor("http://example.com", "*api*", 2)
-    assert res == {"extracted": True}
+    assert res["extracted"] is True
+    assert res["scheduler"]["queue_depth"] == 0
+
+@pytest.mark.asyncio
+async def test_page_analysis_tool(mock_tools):
+    res = await page_analysis("http://example.com", ["network", "schema"])
+    assert res["analyzed"] is True
+    assert res["scheduler"]["queue_depth"] == 0
+
+@pytest.mark.asyncio
+async def test_oversized_results_are_paged(monkeypatch):
+    rows = [{"url": f"http://a/{i}", "status": 200} for i in range(30)]
+    monkeypatch.setattr(
+        "web_inspector_mcp.server.capture_network",
+        AsyncMock(return_value={"total_requests": 30, "requests": rows}),
+    )
+
+    res = await network_capture("http://example.com", page_size=10)
+
+    assert len(res["requests"]) == 10
+    assert res["total_rows"] == 30
+    page = await fetch_results(res["handle"], offset=25, limit=10, fields=["url"])
+    assert page["rows"] == [{"url": f"http://a/{i}"} for i in range(25, 30)]
+    assert page["next_offset"] is None
+
+@pytest.mark.asyncio
+async def test_har_export_tool(mock_tools):
+    res = await har_export("http://example.com", "/tmp/page.har")
+    assert res["exported"] is True
+
+@pytest.mark.asyncio
+async def test_cache_stats_tool():
+    from web_inspector_mcp.capture import PageCapture
+    from web_inspector_mcp.capture_cache import capture_cache
+
+    capture_cache.put(capture_cache.make_key("http://example.com"), PageCapture("http://example.com", []))
+    stats = await cache_stats()
+    assert stats['entries'] == 1
+    stats = await cache_stats(clear=True)
+    assert stats['entries'] == 1
+    assert capture_cache.stats()['entries'] == 0
+
+@pytest.mark.asyncio
+async def test_server_status_tool(mock_chrome):
+    from web_inspector_mcp.browser_session import browser_pool
+
+    status = await server_status()
+    assert status['pool'] is None
+    assert status['scheduler']['active'] == 0
+    assert 'hit_rate' in status['cache']
+
+    async with browser_pool(size=1, max_uses=3):
+        status = await server_status()
+    assert status['pool'] == {'size': 1, 'idle': 1, 'max_uses': 3}
+
+
+def test_max_concurrent_follows_pool_size(monkeypatch):
+    monkeypatch.delenv("WEB_INSPECTOR_MAX_CONCURRENT", raising=False)
+    monkeypatch.setenv("WEB_INSPECTOR_POOL_SIZE", "3")
+    assert _max_concurrent() == 3
+    monkeypatch.setenv("WEB_INSPECTOR_POOL_SIZE", "0")
+    assert _max_concurrent() == 4
+    monkeypatch.setenv("WEB_INSPECTOR_MAX_CONCURRENT", "6")
+    assert _max_concurrent() == 6
+
+
+@pytest.mark.asyncio
+async def test_batch_analysis_tool_reports_progress(monkeypatch):
+    async def fake_batch(*args, on_result, **kwargs):
+        await on_result({'url': 'http://a.com', 'ok': True, 'total_requests': 3}, 1, 2)
+        await on_result({'url': 'http://b.com', 'ok': False, 'error': 'boom'}, 2, 2)
+        return {"batched": True}
+
+    monkeypatch.setattr("web_inspector_mcp.server.batch_capture", fake_batch)
+    ctx = AsyncMock()
+    res = await batch_analysis(["http://a.com", "http://b.com"], ctx=ctx)
+    assert res["batched"] is True
+    assert res["scheduler"]["queue_depth"] == 0
+    ctx.report_progress.assert_any_await(1, 2, "http://a.com: 3 requests")
+    ctx.report_progress.assert_any_await(2, 2, "http://b.com: boom")
+
+    # Without a context (direct calls) progress is simply skipped
+    assert (await batch_analysis(["http://a.com"]))["batched"] is True
+
+@pytest.mark.asyncio
+async def test_site_crawl_tool_reports_progress(monkeypatch):
+    async def fake_crawl(*args, on_page, **kwargs):
+        await on_page({'url': 'http://a.com/', 'ok': True, 'new_endpoints': 2}, 1, 2)
+        await on_page({'url': 'http://a.com/x', 'ok': False, 'error': 'boom'}, 2, 2)
+        return {"endpoints": [{"url": f"http://a.com/api/{i}"} for i in range(3)]}
+
+    monkeypatch.setattr("web_inspector_mcp.server.crawl_site", fake_crawl)
+    ctx = AsyncMock()
+    res = await site_crawl("http://a.com", max_pages=5, page_size=2, ctx=ctx)
+    assert len(res["endpoints"]) == 2
+    assert res["total_rows"] == 3
+    ctx.report_progress.assert_any_await(1, 5, "http://a.com/: 2 new endpoints (2 total)")
+    ctx.report_progress.assert_any_await(2, 5, "http://a.com/x: boom (2 total)")
+
+    assert "handle" in await site_crawl("http://a.com", page_size=2)
+
+@pytest.mark.asyncio
+async def test_batch_analysis_honours_concurrency(mock_chrome, monkeypatch):
+    from web_inspector_mcp.capture import PageCapture
+    from web_inspector_mcp.server import scheduler
+
+    monkeypatch.setattr(scheduler, 'max_concurrent', 2)
+    loading = [0, 0]
+
+    async def fake_capture(url, *args, **kwargs):
+        loading[0] += 1
+        loading[1] = max(loading)
+        await asyncio.sleep(0.01)
+        loading[0] -= 1
+        return PageCapture(url=url, entries=[])
+
+    monkeypatch.setattr("web_inspector_mcp.tools.batch_capture.capture_page", fake_capture)
+    res = await batch_analysis([f"http://a.com/{i}" for i in range(8)], concurrency=5)
+
+    # Not cut to the scheduler's two slots
+    assert res["concurrency"] == 5
+    assert loading[1] == 5
+    assert res["succeeded"] == 8
+
+@pytest.mark.asyncio
+async def test_site_crawl_takes_one_scheduler_slot(monkeypatch):
+    from web_inspector_mcp.server import scheduler
+
+    monkeypatch.setattr(scheduler, 'max_concurrent', 2)
+    seen = {}
+
+    async def fake_crawl(url, max_pages, max_depth, concurrency, *args, **kwargs):
+        seen.update(concurrency=concurrency, active=scheduler.stats()['active'])
+        return {"endpoints": []}
+
+    monkeypatch.setattr("web_inspector_mcp.server.crawl_site", fake_crawl)
+    await site_crawl("http://a.com", concurrency=6)
+
+    # Six tabs in the one leased browser, which is one of the two slots
+    assert seen == {'concurrency': 6, 'active': 1}
+
+@pytest.mark.asyncio
+async def test_tool_deadline_exceeded(monkeypatch):
+    async def slow(*args):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr("web_inspector_mcp.server.capture_network", slow)
+    with pytest.raises(TimeoutError):
+        await network_capture("http://example.com", deadline=0.01)
+
+
+def test_client_id():
+    assert _client_id(None) == 'default'
+
+    ctx = MagicMock(client_id='agent-1')
+    assert _client_id(ctx) == 'agent-1'
+
+    ctx = MagicMock(client_id=None)
+    assert _client_id(ctx) == f'session-{id(ctx.session)}'
+
+    class NoRequest:
+        @property
+        def client_id(self):
+            raise ValueError('Context is not available outside of a request')
+
+    assert _client_id(NoRequest()) == 'default'
+
+
+@pytest.mark.asyncio
+async def test_progress_only_when_client_asks():
+    assert _progress(None) is None
+
+    ctx = MagicMock()
+    ctx.request_context.meta.progressToken = None
+    assert _progress(ctx) is None
+
+    ctx = AsyncMock()
+    ctx.request_context = MagicMock()
+    ctx.request_context.meta.progressToken = 'token-1'
+    report = _progress(ctx)
+    await report(12, '12 requests from 3 domains')
+    ctx.report_progress.assert_awaited_once_with(12, None, '12 requests from 3 domains')
+
+    class NoRequest:
+        @property
+        def request_context(self):
+            raise ValueError('Context is not available outside of a request')
+
+    assert _progress(NoRequest()) is None
 
 def test_main(monkeypatch):
     mock_run = AsyncMock()
     monkeypatch.setattr(mcp, "run", mock_run)
     main()
     mock_run.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_starts_pool(monkeypatch):
+    entered = []
+
+    @asynccontextmanager
+    async def fake_pool(size, max_uses):
+        entered.append((size, max_uses))
+        yield
+
+    monkeypatch.setattr("web_inspector_mcp.server.browser_pool", fake_pool)
+    monkeypatch.setenv("WEB_INSPECTOR_POOL_SIZE", "3")
+    monkeypatch.setenv("WEB_INSPECTOR_POOL_MAX_USES", "7")
+    async with lifespan(mcp):
+        pass
+    assert entered == [(3, 7)]
+
+    monkeypatch.setenv("WEB_INSPECTOR_POOL_SIZE", "0")
+    async with lifespan(mcp):
+        pass
+    assert len(entered) == 1
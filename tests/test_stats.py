@@ -0,0 +1,29 @@
+from web_inspector_mcp.stats import percentile, summarize, trim_outliers
+
+
+def test_percentile_interpolates():
+    values = [10, 20, 30, 40]
+    assert percentile(values, 0) == 10
+    assert percentile(values, 50) == 25
+    assert percentile(values, 100) == 40
+    assert percentile([7], 95) == 7
+
+
+def test_trim_outliers_uses_tukey_fences():
+    kept, outliers = trim_outliers([101, 99, 100, 102, 98, 450])
+    assert outliers == [450]
+    assert kept == [98, 99, 100, 101, 102]
+    # Too few samples to call anything an outlier
+    assert trim_outliers([1, 1000, 2]) == ([1, 2, 1000], [])
+
+
+def test_summarize():
+    summary = summarize([100, 110, 90, 105, 95, 900])
+    assert summary['n'] == 5
+    assert summary['median'] == 100
+    assert summary['min'] == 90 and summary['max'] == 110
+    assert summary['outliers'] == [900]
+    assert summary['stddev'] > 0
+    assert summarize([100, 900, 120, 110], trim=False)['max'] == 900
+    assert summarize([5])['stddev'] == 0.0
+    assert summarize([]) == {'n': 0}
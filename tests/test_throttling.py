@@ -0,0 +1,75 @@
+import pytest
+
+from web_inspector_mcp.capture import capture_page
+from web_inspector_mcp.throttling import Throttler, resolve_throttle
+from web_inspector_mcp.tools.measure_performance import measure_performance
+
+
+def _commands(mock_tab):
+    return [c.args[0] for c in mock_tab._execute_command.await_args_list]
+
+
+def test_resolve_throttle():
+    assert not resolve_throttle(None)
+    assert resolve_throttle('SLOW-4G').network == 'slow-4g'
+
+    mobile = resolve_throttle(['mobile'])
+    assert (mobile.network, mobile.cpu_rate) == ('slow-4g', 4)
+    assert mobile.describe() == {
+        'profiles': ['mobile'],
+        'cpu_slowdown': 4,
+        'network': {'name': 'slow-4g', 'latency_ms': 150, 'download_kbps': 1600, 'upload_kbps': 750},
+    }
+    # The strongest CPU slowdown wins; the same network profile may repeat
+    combined = resolve_throttle(['cpu-2.5x', 'mobile', 'slow-4g'])
+    assert combined.cpu_rate == 4
+    assert combined.names == ('cpu-2.5x', 'mobile', 'slow-4g')
+    assert resolve_throttle(['cpu-2.5x']).cpu_rate == 2.5
+
+
+@pytest.mark.parametrize('throttle', [['edge'], ['cpu-50x'], ['slow-3g', 'fast-4g'], ['mobile', 'fast-3g']])
+def test_resolve_throttle_rejects(throttle):
+    with pytest.raises(ValueError):
+        resolve_throttle(throttle)
+
+
+@pytest.mark.asyncio
+async def test_throttler_applies_and_resets(mock_tab):
+    async with Throttler(mock_tab, resolve_throttle(['fast-3g', 'cpu-4x'])):
+        network, cpu = _commands(mock_tab)
+        assert network['method'] == 'Network.emulateNetworkConditions'
+        assert network['params']['latency'] == 562.5
+        assert network['params']['downloadThroughput'] == 1440 * 1024 / 8
+        assert cpu == {'method': 'Emulation.setCPUThrottlingRate', 'params': {'rate': 4}}
+
+    reset_network, reset_cpu = _commands(mock_tab)[2:]
+    assert reset_network['params']['downloadThroughput'] == -1
+    assert reset_cpu['params'] == {'rate': 1}
+
+
+@pytest.mark.asyncio
+async def test_throttler_without_profile_does_nothing(mock_tab):
+    async with Throttler(mock_tab, resolve_throttle(None)):
+        pass
+    mock_tab._execute_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_capture_page_throttled(mock_chrome, mock_tab):
+    capture = await capture_page('https://a.com/', wait=0, with_timing=False, throttle=['slow-3g'])
+    plain = await capture_page('https://a.com/', wait=0, with_timing=False)
+
+    assert capture.throttle['network']['name'] == 'slow-3g'
+    # Throttled and unthrottled loads are cached apart
+    assert not plain.from_cache
+    assert plain.throttle == {}
+    assert [c['method'] for c in _commands(mock_tab)].count('Network.emulateNetworkConditions') == 2
+
+
+@pytest.mark.asyncio
+async def test_measure_performance_records_profile(mock_chrome, mock_tab):
+    result = await measure_performance('https://a.com/', wait=0, throttle=['cpu-6x'])
+    assert result['throttle'] == {'profiles': ['cpu-6x'], 'cpu_slowdown': 6}
+
+    with pytest.raises(ValueError, match='throttle'):
+        await measure_performance('https://a.com/', runs=3, throttle=['dial-up'])
@@ -0,0 +1,140 @@
+import pytest
+
+from web_inspector_mcp import tracing
+from web_inspector_mcp.records import RequestRecord
+from web_inspector_mcp.tracing import PageTracer, TraceMetrics
+
+MAIN = {'pid': 1, 'tid': 7}
+
+
+def _event(name, ts_ms, dur_ms=None, data=None, **extra):
+    event = {'name': name, 'ts': ts_ms * 1000, **MAIN, 'args': {'data': data or {}}, **extra}
+    if dur_ms is not None:
+        event['dur'] = dur_ms * 1000
+    return event
+
+
+def _trace():
+    return [
+        # The initial about:blank navigation is ignored
+        _event('navigationStart', 0, data={'documentLoaderURL': '', 'isLoadingMainFrame': True}),
+        _event('navigationStart', 1000, data={'documentLoaderURL': 'https://a.com/', 'isLoadingMainFrame': True},
+               args={'frame': 'F1', 'data': {'documentLoaderURL': 'https://a.com/', 'isLoadingMainFrame': True}}),
+        {**_event('firstContentfulPaint', 1400), 'args': {'frame': 'F1'}},
+        {**_event('firstContentfulPaint', 1200), 'args': {'frame': 'iframe'}},
+        _event('largestContentfulPaint::Candidate', 1400, data={'size': 100, 'type': 'text'}),
+        _event('LargestImagePaint::Candidate', 2100, data={'imageUrl': 'https://a.com/hero.jpg'}),
+        _event('largestContentfulPaint::Candidate', 2100, data={'size': 5000, 'type': 'image'}),
+        _event('largestContentfulPaint::Candidate', 2200, data={'size': 9000, 'type': 'text', 'isMainFrame': False}),
+        # Two shift windows: 0.1 + 0.05, then 0.2 more than a second later
+        _event('LayoutShift', 1500, data={'weighted_score_delta': 0.1}),
+        _event('LayoutShift', 1600, data={'weighted_score_delta': 0.05}),
+        _event('LayoutShift', 3000, data={'weighted_score_delta': 0.2}),
+        _event('LayoutShift', 3100, data={'weighted_score_delta': 0.5, 'had_recent_input': True}),
+        # A long task straddling FCP, one after, one on another thread
+        _event('RunTask', 1300, 150),
+        _event('RunTask', 1600, 300),
+        _event('RunTask', 1700, 40),
+        {**_event('RunTask', 1600, 500), 'tid': 99},
+        _event('EvaluateScript', 1310, 120, data={'url': 'https://a.com/app.js'}),
+        _event('v8.compile', 1310, 30, data={'url': 'https://a.com/app.js'}),
+        _event('FunctionCall', 1610, 250, data={'url': 'https://cdn.com/lib.js'}),
+        _event('FunctionCall', 1870, 2, data={'url': 'https://a.com/app.js'}),
+        _event('FunctionCall', 1880, 2, data={}),
+    ]
+
+
+def test_trace_metrics():
+    metrics = TraceMetrics()
+    events = _trace()
+    # Batches may arrive in any order
+    metrics.add_events(events[10:])
+    metrics.add_events(events[:10])
+    records = [RequestRecord.from_entry({
+        'request': {'url': 'https://a.com/app.js', 'method': 'GET'},
+        'response': {'status': 200, 'bodySize': 4096},
+        '_resourceType': 'Script',
+    })]
+
+    result = metrics.result(records)
+
+    assert result['page_url'] == 'https://a.com/'
+    assert result['fcp_ms'] == 400
+    assert result['lcp_ms'] == 1100
+    assert result['lcp_element'] == {'type': 'image', 'size': 5000, 'url': 'https://a.com/hero.jpg'}
+    assert result['cls'] == 0.2
+    assert result['layout_shifts'] == 3
+    # 1300-1450 blocks 50 ms past FCP minus 50 = 0; 1600-1900 blocks 250
+    assert result['tbt_ms'] == 250
+    assert result['long_tasks'] == 2
+    assert result['max_potential_fid_ms'] == 300
+    assert result['longest_tasks'][0] == {'start_ms': 600, 'duration_ms': 300, 'url': 'https://cdn.com/lib.js'}
+    assert result['longest_tasks'][1]['url'] == 'https://a.com/app.js'
+
+    scripts = {s['url']: s for s in result['main_thread_by_script']}
+    assert list(scripts) == ['https://cdn.com/lib.js', 'https://a.com/app.js']
+    app = scripts['https://a.com/app.js']
+    assert app['main_thread_ms'] == 122
+    assert app['compile_ms'] == 30
+    assert app['transfer_bytes'] == 4096
+    assert 'transfer_bytes' not in scripts['https://cdn.com/lib.js']
+
+
+def test_trace_metrics_without_navigation():
+    metrics = TraceMetrics()
+    metrics.add_events([_event('RunTask', 0, 100)])
+    assert metrics.result()['error']
+
+
+@pytest.mark.asyncio
+async def test_page_tracer_folds_collected_events(mock_tab):
+    handlers = {}
+
+    async def on(event, handler):
+        handlers[event] = handler
+        return len(handlers)
+
+    async def execute(command):
+        if command['method'] == 'Tracing.end':
+            handlers['Tracing.dataCollected']({'params': {'value': _trace()}})
+            handlers['Tracing.tracingComplete']({'params': {}})
+
+    mock_tab.on.side_effect = on
+    mock_tab._execute_command.side_effect = execute
+
+    async with PageTracer(mock_tab) as tracer:
+        start = mock_tab._execute_command.await_args.args[0]
+        assert start['method'] == 'Tracing.start'
+        assert start['params']['transferMode'] == 'ReportEvents'
+        assert not any(c.startswith('-') for c in start['params']['traceConfig']['includedCategories'])
+
+    assert tracer.metrics.complete
+    assert tracer.metrics.events == len(_trace())
+    assert mock_tab.remove_callback.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_page_tracer_gives_up_waiting_for_flush(mock_tab, monkeypatch):
+    monkeypatch.setattr(tracing, 'TRACE_FLUSH_TIMEOUT', 0.01)
+
+    async with PageTracer(mock_tab) as tracer:
+        pass
+
+    assert not tracer.metrics.complete
+    assert tracer.metrics.result()['complete'] is False
+
+
+@pytest.mark.asyncio
+async def test_page_tracer_keeps_the_original_error(mock_tab):
+    mock_tab._execute_command.side_effect = [None, RuntimeError('target closed')]
+
+    with pytest.raises(ValueError, match='navigation failed'):
+        async with PageTracer(mock_tab):
+            raise ValueError('navigation failed')
+
+    # Without an error in the block, a failed Tracing.end is raised
+    mock_tab._execute_command.side_effect = [None, RuntimeError('target closed')]
+    with pytest.raises(RuntimeError, match='target closed'):
+        async with PageTracer(mock_tab):
+            pass
+    assert mock_tab.remove_callback.await_count == 4
@@ -0,0 +1,86 @@
+import time
+from urllib.parse import urlsplit
+
+from web_inspector_mcp.url_templates import PathTemplates, classify_segment
+
+
+def _add(templates, url, method='GET'):
+    parts = urlsplit(url)
+    templates.add(method, parts.scheme, parts.netloc, parts.path, url, 'XHR')
+
+
+def test_classify_segment():
+    assert classify_segment('123') == '{id}'
+    assert classify_segment('3f2504e0-4f89-11d3-9a0c-0305e82c3301') == '{uuid}'
+    assert classify_segment('9b2f0c1ad4e5') == '{hash}'
+    assert classify_segment('aZ3kP9qLmN2xR7tYvB4w') == '{token}'
+    assert classify_segment('users') is None
+    assert classify_segment('v1') is None
+    assert classify_segment('deadbeef') is None  # no digit: could be a word
+    assert classify_segment('my-long-article-title-here') is None
+
+
+def test_value_segments_become_placeholders():
+    templates = PathTemplates()
+    _add(templates, 'https://a.com/api/users/123?fields=name')
+    _add(templates, 'https://a.com/api/users/456?expand=1&fields=id')
+    _add(templates, 'https://a.com/api/users/456/orders/3f2504e0-4f89-11d3-9a0c-0305e82c3301')
+    _add(templates, 'https://a.com/api/users/1', method='DELETE')
+
+    result = templates.templates()
+
+    assert len(templates) == 3
+    users = result[0]
+    assert users['template'] == 'https://a.com/api/users/{id}'
+    assert users['method'] == 'GET'
+    assert users['count'] == 2
+    assert users['query_keys'] == ['expand', 'fields']
+    assert users['examples'] == [
+        'https://a.com/api/users/123?fields=name',
+        'https://a.com/api/users/456?expand=1&fields=id',
+    ]
+    assert {t['template'] for t in result[1:]} == {
+        'https://a.com/api/users/{id}/orders/{uuid}',
+        'https://a.com/api/users/{id}',
+    }
+
+
+def test_high_cardinality_literals_collapse():
+    templates = PathTemplates(max_literals=3)
+    _add(templates, 'https://a.com/products/red-shoes/reviews')
+    _add(templates, 'https://a.com/products/blue-hat/reviews')
+    _add(templates, 'https://a.com/products/green-scarf/reviews')
+    assert len(templates) == 3
+    _add(templates, 'https://a.com/products/black-coat/reviews')
+    _add(templates, 'https://a.com/products/white-socks/reviews')
+
+    result = templates.templates()
+
+    assert len(templates) == 1
+    assert result[0]['template'] == 'https://a.com/products/{param}/reviews'
+    assert result[0]['count'] == 5
+    assert len(result[0]['examples']) == 3
+
+
+def test_hosts_are_kept_apart():
+    templates = PathTemplates()
+    _add(templates, 'https://a.com/api/1')
+    _add(templates, 'https://b.com/api/2')
+    _add(templates, 'https://b.com')
+
+    assert sorted(t['template'] for t in templates.templates()) == [
+        'https://a.com/api/{id}', 'https://b.com', 'https://b.com/api/{id}',
+    ]
+
+
+def test_scales_to_many_urls():
+    templates = PathTemplates()
+    urls = [f'https://a.com/api/item-{i}/detail/{i * 7}?page={i}' for i in range(30_000)]
+
+    start = time.perf_counter()
+    for url in urls:
+        _add(templates, url)
+    elapsed = time.perf_counter() - start
+
+    assert [t['template'] for t in templates.templates()] == ['https://a.com/api/{param}/detail/{id}']
+    assert elapsed < 5
@@ -0,0 +1,93 @@
+import pytest
+
+from web_inspector_mcp.records import RequestRecord
+from web_inspector_mcp.waterfall import TimingAggregator, phases, started_ms
+
+
+def _record(url, start_ms, time, type_='Script', **timings):
+    seconds, ms = divmod(start_ms, 1000)
+    phases_ = {'blocked': 1, 'dns': -1, 'connect': -1, 'ssl': -1, 'send': 0, 'wait': 0, 'receive': 0, **timings}
+    return RequestRecord.from_entry({
+        'request': {'url': url, 'method': 'GET'},
+        'response': {'status': 200},
+        '_resourceType': type_,
+        'startedDateTime': f'2024-01-01T00:00:{seconds:02d}.{ms:03d}Z',
+        'time': time,
+        'timings': phases_,
+    })
+
+
+def _page():
+    return [
+        _record('https://a.com/', 0, 300, 'Document', dns=20, connect=60, ssl=40, wait=200, receive=19),
+        _record('https://a.com/app.js', 310, 100, wait=80, receive=19),
+        _record('https://cdn.com/lib.js', 320, 50, dns=10, wait=30, receive=9),
+        _record('https://a.com/api/data', 420, 200, 'Fetch', wait=190, receive=9),
+        _record('https://ads.com/pixel', 2000, 100, 'Image', wait=99),
+    ]
+
+
+def test_phases_and_started_ms():
+    record = _page()[0]
+    assert phases(record) == {
+        'blocked': 1, 'dns': 20, 'connect': 60, 'ssl': 40, 'send': 0, 'wait': 200, 'receive': 19,
+    }
+    assert started_ms('2024-01-01T00:00:01.500Z') - started_ms('2024-01-01T00:00:00.000Z') == 1500
+    assert started_ms('') is None
+    assert started_ms('yesterday') is None
+
+
+def test_started_ms_normalizes_fractions_and_offsets():
+    # Forms Python 3.10's fromisoformat rejects: 'Z', 1, 2, 7 or 9 digit
+    # fractions, offsets without a colon
+    base = started_ms('2024-01-01T00:00:00.000+00:00')
+    assert started_ms('2024-01-01T00:00:00.5Z') - base == 500
+    assert started_ms('2024-01-01T00:00:00.12z') - base == 120
+    assert started_ms('2024-01-01T01:00:00.123456789+0100') - base == pytest.approx(123.456)
+    assert started_ms('2024-01-01T00:00:00Z') == base
+    assert phases(RequestRecord.from_entry({'request': {'url': 'x'}})) == {}
+
+
+def test_timing_breakdown_by_phase_and_origin():
+    aggregator = TimingAggregator(rows=3)
+    for record in _page():
+        aggregator.add_record(record)
+
+    result = aggregator.result()
+
+    totals = result['phase_totals_ms']
+    assert totals['wait'] == 599
+    assert totals['dns'] == 30
+    # ssl is part of connect, so it doesn't count towards the shares
+    assert 'ssl' not in result['phase_share']
+    assert round(sum(result['phase_share'].values()), 2) == 1
+    assert list(result['phases_by_origin']) == ['https://a.com', 'https://ads.com', 'https://cdn.com']
+    assert result['phases_by_origin']['https://a.com']['requests'] == 3
+    assert [row['start_ms'] for row in result['waterfall']] == [0, 310, 320]
+    assert result['waterfall'][0]['end_ms'] == 300
+    assert result['waterfall_total'] == 5
+
+
+def test_critical_chain_ends_at_load_event():
+    aggregator = TimingAggregator()
+    for record in _page():
+        aggregator.add_record(record)
+
+    chain = aggregator.critical_chain(load_event_ms=700)
+
+    # The ad pixel starts after load, so the chain ends at the API call,
+    # which waited for app.js (finished last before it started)
+    assert [row['url'] for row in chain] == ['https://a.com/', 'https://a.com/app.js', 'https://a.com/api/data']
+    assert [row['gap_ms'] for row in chain] == [0, 10, 10]
+    assert chain[-1]['phases']['wait'] == 190
+    # Without a load event the chain runs to the last request
+    assert aggregator.critical_chain()[-1]['url'] == 'https://ads.com/pixel'
+    assert TimingAggregator().critical_chain() == []
+
+
+def test_critical_chain_with_simultaneous_requests():
+    aggregator = TimingAggregator()
+    for url in ('https://a.com/1', 'https://a.com/2', 'https://a.com/3'):
+        aggregator.add_record(_record(url, 0, 0))
+
+    assert len(aggregator.critical_chain()) == 3
@@ -0,0 +1,226 @@
+import base64
+import gzip
+import hashlib
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.records import RequestRecord
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip estimates only
+    brotli = None
+
+TOP_N = 20
+# Text responses smaller than this fit in a packet or two either way
+MIN_COMPRESS_BYTES = 1400
+# Bodies are compressed up to this size; savings on longer ones are scaled
+SAMPLE_BYTES = 1 << 20
+# Static resources should be cacheable for at least this long
+MIN_CACHE_TTL = 7 * 24 * 3600
+# Rough size of a 304 Not Modified answer when the HAR has no headersSize
+REVALIDATION_BYTES = 300
+CACHEABLE_TYPES = frozenset({'Script', 'Stylesheet', 'Image', 'Font', 'Media'})
+TEXT_TYPES = frozenset({
+    'application/javascript', 'application/x-javascript', 'application/ecmascript',
+    'application/json', 'application/ld+json', 'application/manifest+json',
+    'application/xml', 'application/rss+xml', 'application/atom+xml',
+    'application/wasm', 'image/svg+xml', 'image/x-icon', 'font/ttf', 'font/otf',
+})
+LEGACY_IMAGE_TYPES = frozenset({'image/jpeg', 'image/png', 'image/gif', 'image/bmp'})
+# Typical saving of WebP/AVIF over JPEG/PNG/GIF (Lighthouse uses similar ratios)
+MODERN_IMAGE_SAVINGS = 0.3
+MIN_IMAGE_BYTES = 10 * 1024
+LARGE_IMAGE_BYTES = 200 * 1024
+# Savings are converted to time at this throughput (slow 4G)
+DEFAULT_THROUGHPUT_KBPS = 1600
+
+
+def _headers(headers: list[dict]) -> dict[str, str]:
+    return {h.get('name', '').lower(): h.get('value', '') for h in headers}
+
+
+def _body(entry: dict) -> bytes | None:
+    content = entry.get('response', {}).get('content', {})
+    text = content.get('text')
+    if not text:
+        return None
+    if content.get('encoding') == 'base64':
+        try:
+            return base64.b64decode(text)
+        except ValueError:
+            return None
+    return text.encode('utf-8')
+
+
+def cache_lifetime(headers: dict[str, str]) -> int | None:
+    """
+    Seconds a response may be reused from cache, from ``Cache-Control``
+    (``max-age``, ``no-store``, ``no-cache``) or ``Expires``; ``None``
+    when neither says.
+    """
+    directives = {}
+    for part in headers.get('cache-control', '').lower().split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name] = value.strip('"')
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0
+    if 'max-age' in directives:
+        try:
+            return max(int(directives['max-age']), 0)
+        except ValueError:
+            return 0
+    if 'expires' in headers:
+        try:
+            expires = parsedate_to_datetime(headers['expires'])
+            date = parsedate_to_datetime(headers['date']) if 'date' in headers else datetime.now(expires.tzinfo)
+            return max(int((expires - date).total_seconds()), 0)
+        except (TypeError, ValueError):
+            return 0
+    return None
+
+
+def compressed_sizes(body: bytes) -> dict[str, int | None]:
+    """Estimated gzip and (when installed) brotli sizes of ``body``."""
+    sample = body[:SAMPLE_BYTES]
+    scale = len(body) / len(sample)
+    sizes = {'gzip': round(len(gzip.compress(sample, 6)) * scale)}
+    sizes['brotli'] = round(len(brotli.compress(sample, quality=9)) * scale) if brotli is not None else None
+    return sizes
+
+
+class AuditAggregator:
+    """
+    Turns a capture into a ranked list of fixes, one entry at a time:
+
+    - ``uncompressed``: text responses sent without ``Content-Encoding``,
+      with gzip/brotli savings measured by compressing the captured body;
+    - ``cache_lifetime``: static resources with no or a short cache
+      lifetime, which a repeat visit downloads again; with an ``ETag``
+      or ``Last-Modified`` validator it only revalidates, so the waste
+      is the size of the 304 response's headers, not the body;
+    - ``duplicate``: identical bodies (by content hash) downloaded more
+      than once;
+    - ``legacy_image_format`` and ``large_image``: JPEG/PNG/GIF images
+      that WebP/AVIF would shrink, and images over 200 KB.
+
+    Each finding has its waste in bytes and in milliseconds at
+    ``throughput_kbps``. Bodies are only needed for the compression and
+    duplicate checks.
+    """
+
+    def __init__(self, throughput_kbps: float = DEFAULT_THROUGHPUT_KBPS, top_n: int = TOP_N):
+        self.throughput_kbps = throughput_kbps
+        self.top_n = top_n
+        self.findings: list[dict] = []
+        self.audited = 0
+        self.without_body = 0
+        # body hash -> urls and transfer size of each download
+        self._bodies: dict[str, list[tuple[str, int]]] = {}
+
+    def _ms(self, wasted: float) -> float:
+        return round(wasted * 8 / (self.throughput_kbps * 1024) * 1000, 1)
+
+    def _flag(self, check: str, record: RequestRecord, wasted: float, **detail):
+        wasted = int(wasted)
+        if wasted > 0:
+            self.findings.append({
+                'check': check,
+                'url': record.url[:120],
+                'type': record.resource_type or '?',
+                'wasted_bytes': wasted,
+                'wasted_ms': self._ms(wasted),
+                **detail,
+            })
+
+    def add(self, entry: dict):
+        record = RequestRecord.from_entry(entry)
+        if record.status != 200:
+            return
+        self.audited += 1
+        headers = _headers(entry.get('response', {}).get('headers', []))
+        size = record.transfer_bytes
+        body = _body(entry)
+        if body is None:
+            self.without_body += 1
+        else:
+            digest = hashlib.sha1(body).hexdigest()
+            self._bodies.setdefault(digest, []).append((record.url, size or len(body)))
+
+        mime = record.mime_type
+        encoding = headers.get('content-encoding', 'identity').strip().lower()
+        is_text = mime.startswith('text/') or mime in TEXT_TYPES
+        if is_text and encoding == 'identity' and body is not None and len(body) >= MIN_COMPRESS_BYTES:
+            sizes = compressed_sizes(body)
+            best = min(s for s in sizes.values() if s is not None)
+            self._flag('uncompressed', record, max(size, len(body)) - best, compressed_bytes=sizes)
+
+        if record.resource_type in CACHEABLE_TYPES:
+            ttl = cache_lifetime(headers)
+            if ttl is None or ttl < MIN_CACHE_TTL:
+                validator = 'etag' in headers or 'last-modified' in headers
+                if validator:
+                    headers_size = entry['response'].get('headersSize')
+                    wasted = headers_size if isinstance(headers_size, int) and headers_size > 0 else REVALIDATION_BYTES
+                else:
+                    wasted = size
+                self._flag('cache_lifetime', record, wasted, ttl_s=ttl, validator=validator)
+
+        if mime.startswith('image/'):
+            if mime in LEGACY_IMAGE_TYPES and size >= MIN_IMAGE_BYTES:
+                self._flag('legacy_image_format', record, size * MODERN_IMAGE_SAVINGS, format=mime)
+            if size > LARGE_IMAGE_BYTES:
+                self._flag('large_image', record, size - LARGE_IMAGE_BYTES, size_bytes=size)
+
+    def summary(self) -> str:
+        return f'{self.audited} responses audited, {len(self.findings)} findings'
+
+    def result(self) -> dict:
+        findings = list(self.findings)
+        for downloads in self._bodies.values():
+            if len(downloads) < 2:
+                continue
+            url, _ = downloads[0]
+            wasted = sum(size for _, size in downloads[1:])
+            findings.append({
+                'check': 'duplicate',
+                'url': url[:120],
+                'type': '?',
+                'wasted_bytes': wasted,
+                'wasted_ms': self._ms(wasted),
+                'copies': len(downloads),
+                'other_urls': list(dict.fromkeys(u[:120] for u, _ in downloads[1:] if u != url))[:3],
+            })
+        findings.sort(key=lambda f: f['wasted_bytes'], reverse=True)
+
+        by_check: dict[str, dict] = {}
+        # A resource with several findings counts once, by its largest saving
+        per_url: dict[str, int] = {}
+        for f in findings:
+            stats = by_check.setdefault(f['check'], {'findings': 0, 'wasted_bytes': 0})
+            stats['findings'] += 1
+            stats['wasted_bytes'] += f['wasted_bytes']
+            per_url[f['url']] = max(per_url.get(f['url'], 0), f['wasted_bytes'])
+        for stats in by_check.values():
+            stats['wasted_ms'] = self._ms(stats['wasted_bytes'])
+        total = sum(per_url.values())
+        return {
+            'audited_responses': self.audited,
+            'responses_without_body': self.without_body,
+            'throughput_kbps': self.throughput_kbps,
+            'total_wasted_bytes': total,
+            'total_wasted_ms': self._ms(total),
+            'by_check': by_check,
+            'findings': findings[:self.top_n],
+            'findings_total': len(findings),
+        }
+
+
+def audit_capture(capture: PageCapture, throughput_kbps: float = DEFAULT_THROUGHPUT_KBPS) -> dict:
+    """Runs :class:`AuditAggregator` over every entry of a capture."""
+    aggregator = AuditAggregator(throughput_kbps)
+    for entry in capture.entries:
+        aggregator.add(entry)
+    return aggregator.result()
@@ -0,0 +1,154 @@
+import contextlib
+from collections import Counter
+
+from pydoll.commands import FetchCommands, NetworkCommands
+from pydoll.protocol.base import Command
+from pydoll.protocol.fetch.events import FetchEvent
+from pydoll.protocol.fetch.methods import EnableParams, FetchMethod
+from pydoll.protocol.network.types import ErrorReason
+
+# block name -> CDP resource type
+RESOURCE_TYPES = {
+    'image': 'Image',
+    'font': 'Font',
+    'media': 'Media',
+    'stylesheet': 'Stylesheet',
+    'script': 'Script',
+    'manifest': 'Manifest',
+    'texttrack': 'TextTrack',
+}
+
+# Common analytics and ad hosts, as Network.setBlockedURLs patterns
+ANALYTICS_HOSTS = [
+    '*google-analytics.com/*',
+    '*googletagmanager.com/*',
+    '*hotjar.com/*',
+    '*segment.io/*',
+    '*segment.com/*',
+    '*mixpanel.com/*',
+    '*amplitude.com/*',
+    '*clarity.ms/*',
+    '*newrelic.com/*',
+    '*nr-data.net/*',
+    '*fullstory.com/*',
+]
+AD_HOSTS = [
+    '*doubleclick.net/*',
+    '*googlesyndication.com/*',
+    '*googleadservices.com/*',
+    '*adservice.google.com/*',
+    '*facebook.net/*',
+    '*amazon-adsystem.com/*',
+    '*adnxs.com/*',
+    '*criteo.com/*',
+    '*taboola.com/*',
+    '*outbrain.com/*',
+]
+
+# profile name -> block entries it expands to
+PROFILES = {
+    'static': ['image', 'font', 'media', 'stylesheet', 'manifest', 'texttrack'],
+    'analytics': ANALYTICS_HOSTS,
+    'ads': AD_HOSTS,
+    # everything an API-focused capture can do without
+    'api': ['static', 'analytics', 'ads'],
+}
+
+BLOCKED_ERROR = 'net::ERR_BLOCKED_BY_CLIENT'
+
+
+def resolve_block(block: list[str] | None) -> tuple[frozenset[str], tuple[str, ...]]:
+    """
+    Expands a ``block`` list into CDP resource types and URL patterns.
+
+    Entries may be resource types (``'image'``, ``'font'``, ...), profile
+    names (see ``PROFILES``), bare hosts (``'tracker.example.com'``, which
+    also covers its subdomains) or ``Network.setBlockedURLs`` wildcard
+    patterns, passed through as given.
+
+    Raises:
+        ValueError: For a word that is neither a type, a profile nor a host.
+    """
+    types, patterns = set(), []
+    pending = list(block or [])
+    seen = set()
+    while pending:
+        item = pending.pop(0)
+        if item in seen:
+            continue
+        seen.add(item)
+        name = item.lower()
+        if name in RESOURCE_TYPES:
+            types.add(RESOURCE_TYPES[name])
+        elif name in PROFILES:
+            pending.extend(PROFILES[name])
+        elif '*' in item or '/' in item:
+            patterns.append(item)
+        elif '.' in item:
+            patterns.append(f'*{item}/*')  # a bare host and its subdomains
+        else:
+            raise ValueError(
+                f'Unknown block entry {item!r}; expected a URL pattern or one of '
+                f'{sorted([*RESOURCE_TYPES, *PROFILES])}'
+            )
+    return frozenset(types), tuple(patterns)
+
+
+class RequestBlocker:
+    """
+    Blocks requests before they hit the network: URL patterns through
+    ``Network.setBlockedURLs`` and resource types by failing them as they
+    are paused by ``Fetch`` interception, which only pauses those types.
+
+    Blocked requests still show up in a HAR recording, as failures with
+    ``net::ERR_BLOCKED_BY_CLIENT``; see :func:`blocked_summary`. Enter it
+    after the Network domain is enabled and before navigating.
+    """
+
+    def __init__(self, tab, types=frozenset(), url_patterns=()):
+        self._tab = tab
+        self.types = frozenset(types)
+        self.url_patterns = tuple(url_patterns)
+        self._callback_id = None
+
+    async def _on_paused(self, event: dict):
+        request_id = event['params']['requestId']
+        with contextlib.suppress(Exception):
+            await self._tab._execute_command(
+                FetchCommands.fail_request(request_id, ErrorReason.BLOCKED_BY_CLIENT)
+            )
+
+    async def __aenter__(self):
+        if self.url_patterns:
+            await self._tab._execute_command(NetworkCommands.set_blocked_urls(list(self.url_patterns)))
+        if self.types:
+            self._callback_id = await self._tab.on(FetchEvent.REQUEST_PAUSED, self._on_paused)
+            patterns = [
+                {'urlPattern': '*', 'resourceType': t, 'requestStage': 'Request'}
+                for t in sorted(self.types)
+            ]
+            await self._tab._execute_command(Command(
+                method=FetchMethod.ENABLE,
+                params=EnableParams(patterns=patterns, handleAuthRequests=False),
+            ))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.types:
+            with contextlib.suppress(Exception):
+                await self._tab._execute_command(FetchCommands.disable())
+            with contextlib.suppress(Exception):
+                await self._tab.remove_callback(self._callback_id)
+        if self.url_patterns:
+            with contextlib.suppress(Exception):
+                await self._tab._execute_command(NetworkCommands.set_blocked_urls([]))
+
+
+def blocked_summary(entries: list[dict]) -> dict:
+    """Counts the blocked requests in HAR entries, by resource type."""
+    by_type = Counter(
+        entry.get('_resourceType') or 'Other'
+        for entry in entries
+        if entry.get('response', {}).get('statusText') == BLOCKED_ERROR
+    )
+    return {'total': sum(by_type.values()), 'by_type': dict(by_type.most_common())}
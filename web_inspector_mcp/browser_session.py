@@ -1,9 +1,15 @@
+import asyncio
+import contextlib
 import json as _json
+import logging
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 
 from pydoll.browser.chromium import Chrome
 from pydoll.browser.options import ChromiumOptions
 
+logger = logging.getLogger(__name__)
+
 
 def _default_options() -> ChromiumOptions:
     options = ChromiumOptions()
@@ -42,19 +48,217 @@ def extract_result(raw):
     return value
 
 
+@dataclass
+class _PoolSlot:
+    """One pooled Chrome process and how many leases it has served."""
+
+    browser: Chrome | None = None
+    uses: int = 0
+
+
+class BrowserPool:
+    """
+    Keeps ``size`` Chrome processes warm and leases them out per call.
+
+    Every lease runs in a fresh browser context, so cookies, cache and
+    storage never leak between calls. A browser is health-checked before
+    it is handed out and relaunched after serving ``max_uses`` leases.
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 50, health_timeout: float = 2.0):
+        self.size = size
+        self.max_uses = max_uses
+        self.health_timeout = health_timeout
+        self._slots = [_PoolSlot() for _ in range(size)]
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._replenishing: set[asyncio.Task] = set()
+        self._closed = False
+
+    @property
+    def idle_count(self) -> int:
+        """Number of slots currently waiting for a lease."""
+        return self._idle.qsize()
+
+    def stats(self) -> dict:
+        return {'size': self.size, 'idle': self.idle_count, 'max_uses': self.max_uses}
+
+    async def start(self):
+        """Launches every browser up front so the first calls skip startup."""
+        await asyncio.gather(*(self._launch(slot) for slot in self._slots))
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+
+    async def _launch(self, slot: _PoolSlot):
+        """Starts a browser in ``slot``; leaves it empty if Chrome fails to start."""
+        browser = Chrome(options=_default_options())
+        try:
+            await browser.start()
+        except Exception:
+            logger.warning('Failed to launch pooled browser', exc_info=True)
+            return
+        slot.browser = browser
+        slot.uses = 0
+
+    async def _is_healthy(self, slot: _PoolSlot) -> bool:
+        if slot.browser is None:
+            return False
+        try:
+            await asyncio.wait_for(slot.browser.get_version(), self.health_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _retire(self, slot: _PoolSlot):
+        """Stops the browser in ``slot``, ignoring a process that already died."""
+        browser, slot.browser, slot.uses = slot.browser, None, 0
+        if browser is not None:
+            with contextlib.suppress(Exception):
+                await browser.stop()
+
+    async def _replenish(self, slot: _PoolSlot):
+        """Recycles a worn-out browser and returns its slot to the pool."""
+        try:
+            await self._retire(slot)
+            if not self._closed:
+                await self._launch(slot)
+        finally:
+            self._idle.put_nowait(slot)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Yields a healthy pooled browser, exclusive to the caller until the
+        block exits. Open tabs on it with :func:`isolated_tab`.
+        """
+        if self._closed:
+            raise RuntimeError('Browser pool is closed')
+        slot = await self._idle.get()
+        recycle = False
+        try:
+            if not await self._is_healthy(slot):
+                await self._retire(slot)
+                await self._launch(slot)
+                if slot.browser is None:
+                    raise RuntimeError('Could not launch a browser for the pool')
+            slot.uses += 1
+            yield slot.browser
+            recycle = slot.uses >= self.max_uses
+        except asyncio.CancelledError:
+            # The call was abandoned mid-flight (e.g. its deadline passed):
+            # tear this browser down rather than hand it to the next caller
+            recycle = True
+            raise
+        finally:
+            if recycle:
+                task = asyncio.create_task(self._replenish(slot))
+                self._replenishing.add(task)
+                task.add_done_callback(self._replenishing.discard)
+            else:
+                self._idle.put_nowait(slot)
+
+    @asynccontextmanager
+    async def lease(self):
+        """Yields a tab in a fresh browser context of a pooled Chrome."""
+        async with self.acquire() as browser, isolated_tab(browser) as tab:
+            yield tab
+
+    async def close(self, grace: float = 5.0):
+        """
+        Stops every pooled browser.
+
+        Waits up to ``grace`` seconds for in-flight leases to finish first.
+        """
+        self._closed = True
+        if self._replenishing:
+            await asyncio.gather(*self._replenishing, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + grace
+        while self._idle.qsize() < self.size and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        for slot in self._slots:
+            await self._retire(slot)
+
+
+_pool: BrowserPool | None = None
+
+
+def get_pool() -> BrowserPool | None:
+    """Returns the pool installed by :func:`browser_pool`, if any."""
+    return _pool
+
+
+@asynccontextmanager
+async def browser_pool(size: int = 2, max_uses: int = 50):
+    """
+    Starts a :class:`BrowserPool` and routes :func:`browser_session` through it.
+
+    The pool is shut down (all Chrome processes stopped) when the block exits.
+    """
+    global _pool
+    pool = BrowserPool(size=size, max_uses=max_uses)
+    await pool.start()
+    _pool = pool
+    try:
+        yield pool
+    finally:
+        _pool = None
+        await pool.close()
+
+
+@asynccontextmanager
+async def isolated_tab(browser: Chrome):
+    """
+    Opens a tab in a new browser context and closes both on exit, taking
+    the context's cookies, cache and storage with it. pydoll would
+    otherwise keep the tab and its connection until the browser stops.
+    """
+    context_id = await browser.create_browser_context()
+    tab = None
+    try:
+        tab = await browser.new_tab(browser_context_id=context_id)
+        yield tab
+    finally:
+        if tab is not None:
+            with contextlib.suppress(Exception):
+                await tab.close()
+        with contextlib.suppress(Exception):
+            await browser.delete_browser_context(context_id)
+
+
+@asynccontextmanager
+async def shared_browser():
+    """
+    Yields a Chrome that callers can open several isolated tabs on (see
+    :func:`isolated_tab`), leased from the pool when one is running.
+    """
+    if _pool is not None:
+        async with _pool.acquire() as browser:
+            yield browser
+        return
+
+    async with Chrome(options=_default_options()) as browser:
+        await browser.start()
+        yield browser
+
+
 @asynccontextmanager
 async def browser_session():
     """
-    Async context manager that opens a headless Chrome
-    and yields the active tab.
+    Async context manager that yields a tab in a headless Chrome.
+
+    When a pool is running the tab is leased from it; otherwise a
+    one-off browser is launched and torn down around the block.
     """
+    if _pool is not None:
+        async with _pool.lease() as tab:
+            yield tab
+        return
+
     async with Chrome(options=_default_options()) as browser:
         tab = await browser.start()
         yield tab
 
 
-
-
 async def run_js(url: str, js: str):
     """Shortcut: opens a browser, runs JS, and returns the extracted result."""
     async with browser_session() as tab:
@@ -0,0 +1,392 @@
+import asyncio
+import contextlib
+from dataclasses import dataclass, field, replace
+
+from pydoll.commands import NetworkCommands
+
+from web_inspector_mcp.blocking import RequestBlocker, resolve_block
+from web_inspector_mcp.browser_session import (
+    browser_session,
+    extract_result,
+    isolated_tab,
+)
+from web_inspector_mcp.capture_cache import capture_cache
+from web_inspector_mcp.code_coverage import CoverageRecorder
+from web_inspector_mcp.har_files import (
+    HarReader,
+    har_path,
+    page_timing,
+    resolve_har_path,
+    write_har,
+)
+from web_inspector_mcp.network_idle import load_page
+from web_inspector_mcp.recorder import (
+    DEFAULT_MAX_BODY_BYTES,
+    DEFAULT_MAX_TOTAL_BYTES,
+    record,
+)
+from web_inspector_mcp.records import RequestRecord, to_records
+from web_inspector_mcp.replay import ReplayArchive, RequestReplayer
+from web_inspector_mcp.request_filter import RequestFilter
+from web_inspector_mcp.throttling import Throttler, resolve_throttle
+from web_inspector_mcp.tracing import PageTracer, TraceMetrics
+
+# Navigation Timing Level 2: every field is in ms from navigation start
+NAVIGATION_TIMING_JS = """
+(() => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  if (!nav) return JSON.stringify({});
+  const span = (start, end) => (start > 0 && end >= start ? end - start : 0);
+  return JSON.stringify({
+    dom_content_loaded: nav.domContentLoadedEventEnd,
+    load_event: nav.loadEventEnd,
+    dom_interactive: nav.domInteractive,
+    ttfb: nav.responseStart,
+    redirect: span(nav.redirectStart, nav.redirectEnd),
+    dns: span(nav.domainLookupStart, nav.domainLookupEnd),
+    connect: span(nav.connectStart, nav.connectEnd),
+    tls: span(nav.secureConnectionStart, nav.connectEnd),
+    request: span(nav.requestStart, nav.responseStart),
+    response: span(nav.responseStart, nav.responseEnd),
+    transfer_size: nav.transferSize || 0,
+    decoded_body_size: nav.decodedBodySize || 0,
+    protocol: nav.nextHopProtocol || '',
+  });
+})()
+"""
+
+LINKS_JS = """
+JSON.stringify({
+  url: location.href,
+  links: Array.from(document.querySelectorAll('a[href]'), a => a.href),
+})
+"""
+
+
+@dataclass
+class PageCapture:
+    """
+    A single recorded page load: the HAR entries plus the browser's
+    navigation timing. Every analysis in ``tools/`` can run over the same
+    capture, so a page only has to be loaded once.
+    """
+
+    url: str
+    entries: list[dict]
+    timing: dict = field(default_factory=dict)
+    settled_by: str = ''
+    from_cache: bool = False
+    body_stats: dict = field(default_factory=dict)
+    links: list[str] | None = None
+    # Where the page ended up after redirects; collected with the links
+    final_url: str | None = None
+    replay_stats: dict = field(default_factory=dict)
+    trace: TraceMetrics | None = None
+    throttle: dict = field(default_factory=dict)
+    coverage: list[dict] | None = None
+    _records: list | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def records(self) -> list[RequestRecord]:
+        """Compact :class:`RequestRecord` views of ``entries``, built on first use."""
+        if self._records is None:
+            self._records = to_records(self.entries)
+        return self._records
+
+
+async def capture_page(
+    url: str,
+    wait: float = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    until=None,
+    until_count: int = 1,
+    with_timing: bool = True,
+    fresh: bool = False,
+    browser=None,
+    bodies: RequestFilter | str | bool | None = None,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+    block: list[str] | None = None,
+    on_entry=None,
+    stop=None,
+    with_links: bool = False,
+    save_har: str | None = None,
+    replay: str | None = None,
+    replay_latency: str | float = 'recorded',
+    tab=None,
+    disable_cache: bool = False,
+    trace: bool = False,
+    throttle: list[str] | str | None = None,
+    coverage: bool = False,
+) -> PageCapture:
+    """
+    Loads ``url`` once, recording every request as HAR.
+
+    Captures are cached by URL and capture options (see
+    :mod:`web_inspector_mcp.capture_cache`), so repeated analysis of the
+    same page skips the browser entirely until the entry expires.
+
+    When ``url`` names a saved capture (a ``.har``, ``.har.gz``,
+    ``.ndjson`` or ``.jsonl`` path, or a ``file://`` URL) it is read from
+    disk instead of loaded in Chrome (see :func:`read_har_capture`).
+
+    Args:
+        url:         The page to load.
+        wait:        Upper bound, in seconds, on waiting for network activity.
+        wait_until:  Wait strategy passed to :func:`load_page`.
+        idle_ms:     Milliseconds of network quiet that count as idle.
+        until:       Optional URL predicate that ends the wait early.
+        until_count: Number of ``until`` matches that end the wait.
+        with_timing: Also read Navigation Timing from the page.
+        fresh:       Ignore any cached capture and reload the page.
+        browser:     Load the page in a new isolated tab of this browser
+                     instead of a browser of its own.
+        tab:         Load the page in this open tab, keeping whatever its
+                     context already cached. Such captures depend on the
+                     tab's state, so they are not stored in the cache.
+        disable_cache: Bypass Chrome's HTTP cache for the load, so every
+                       request goes to the network.
+        trace:       Also record a Chrome trace of the load for Web Vitals
+                     and main-thread cost (see :class:`~web_inspector_mcp.tracing.PageTracer`).
+        throttle:    Network and CPU throttling profiles to load the page
+                     under, e.g. ``['slow-4g', 'cpu-4x']`` (see
+                     :func:`~web_inspector_mcp.throttling.resolve_throttle`).
+        coverage:    Also record which JS and CSS bytes the load used (see
+                     :class:`~web_inspector_mcp.code_coverage.CoverageRecorder`).
+        bodies:      A ``RequestFilter`` or URL glob; when set, only matching
+                     requests have their response bodies fetched. ``False``
+                     records metadata only (default: all bodies).
+        max_body_bytes:  Per-body cap for ``bodies`` captures; longer bodies
+                         are truncated.
+        max_total_bytes: Total body budget for ``bodies`` captures; later
+                         bodies are skipped once it is spent.
+        block:       Resource types, profiles or URL patterns to block before
+                     navigating (see :func:`~web_inspector_mcp.blocking.resolve_block`).
+        on_entry:    Called with each HAR entry as soon as it is recorded (or,
+                     for a cached capture, with each stored entry).
+        stop:        Zero-argument predicate that ends the load early once
+                     true; such captures are not cached.
+        with_links:  Also collect the absolute URLs of the page's links, and
+                     the page's URL after redirects (``final_url``).
+        save_har:    Also write the capture to this path, as HAR (``.har``,
+                     ``.har.gz``) or NDJSON (``.ndjson``, ``.jsonl``).
+        replay:      A saved capture to answer every request from instead of
+                     the network (see :class:`~web_inspector_mcp.replay.RequestReplayer`).
+        replay_latency: ``'recorded'`` to delay replayed responses by their
+                        recorded time, or a fixed delay in milliseconds.
+
+    Raises:
+        ValueError: For an unknown ``block`` entry or ``throttle`` profile,
+                    resource-type blocking combined with ``replay``, or a
+                    ``save_har`` path that isn't a HAR / NDJSON file in the
+                    allowed directory.
+    """
+    if save_har:
+        resolve_har_path(save_har)  # fail before loading the page, not after
+    if har_path(url) is not None:
+        capture = await read_har_capture(url, bodies, on_entry, stop)
+        return await _saved(capture, save_har)
+
+    block_types, block_patterns = resolve_block(block)
+    throttling = resolve_throttle(throttle)
+    if replay and block_types:
+        # Both work through Fetch interception, which takes one set of patterns
+        raise ValueError('Blocking resource types cannot be combined with replay')
+    if bodies is False:
+        body_filter, body_key = None, 'none'
+    elif bodies is not None:
+        body_filter = RequestFilter.coerce(bodies)
+        body_key = body_filter.key
+    else:
+        body_filter = body_key = None
+    options = {
+        'wait': wait,
+        'wait_until': wait_until,
+        'idle_ms': idle_ms,
+        'block': (sorted(block_types), sorted(block_patterns)),
+    }
+    if replay:
+        options['replay'] = (replay, replay_latency)
+    if disable_cache:
+        options['disable_cache'] = True
+    if throttling:
+        options['throttle'] = (throttling.network, throttling.cpu_rate)
+    key = capture_cache.make_key(url, bodies=body_key, **options)
+    cacheable = tab is None
+    if cacheable and not fresh:
+        # A full capture also serves callers that would have stopped early
+        # or need fewer bodies; one recorded without timing, links, a
+        # trace or coverage can't serve callers that need them.
+        keys = [key]
+        if body_key is not None:
+            keys.append(capture_cache.make_key(url, bodies=None, **options))
+        for candidate in keys:
+            cached = capture_cache.get(
+                candidate,
+                accept=lambda c: (
+                    (c.timing or not with_timing)
+                    and (c.links is not None or not with_links)
+                    and (c.trace is not None or not trace)
+                    and (c.coverage is not None or not coverage)
+                ),
+            )
+            if cached is not None:
+                if on_entry is not None:
+                    for entry in cached.entries:
+                        on_entry(entry)
+                hit = replace(cached, from_cache=True)
+                hit._records = cached._records  # reuse records if already built
+                return await _saved(hit, save_har)
+
+    selective = body_key is not None or on_entry is not None
+    if selective:
+        def recorder(tab):
+            return record(
+                tab,
+                body_filter=body_filter,
+                max_body_bytes=max_body_bytes,
+                max_total_bytes=max_total_bytes,
+                fetch_bodies=bodies is not False,
+                on_entry=on_entry,
+            )
+    else:
+        def recorder(tab):
+            return tab.request.record()
+
+    replayer = tracer = coverage_recorder = None
+    if replay:
+        archive = await asyncio.to_thread(ReplayArchive.from_har, replay)
+
+    if tab is not None:
+        session = contextlib.nullcontext(tab)
+    elif browser is not None:
+        session = isolated_tab(browser)
+    else:
+        session = browser_session()
+    async with session as tab:
+        if replay:
+            replayer = RequestReplayer(tab, archive, replay_latency)
+        if trace:
+            tracer = PageTracer(tab)
+        if coverage:
+            coverage_recorder = CoverageRecorder(tab)
+        async with (
+            recorder(tab) as recording,
+            RequestBlocker(tab, block_types, block_patterns),
+            Throttler(tab, throttling),
+            replayer or contextlib.nullcontext(),
+            tracer or contextlib.nullcontext(),
+            coverage_recorder or contextlib.nullcontext(),
+        ):
+            if disable_cache:
+                await tab._execute_command(NetworkCommands.set_cache_disabled(True))
+            settled_by = await load_page(
+                tab, url, wait, wait_until, idle_ms,
+                until=until, until_count=until_count, stop=stop,
+            )
+
+        timing = {}
+        if with_timing:
+            timing = extract_result(await tab.execute_script(NAVIGATION_TIMING_JS))
+        links = final_url = None
+        if with_links:
+            page = extract_result(await tab.execute_script(LINKS_JS))
+            page = page if isinstance(page, dict) else {}
+            links = page.get('links') if isinstance(page.get('links'), list) else []
+            final_url = page.get('url') if isinstance(page.get('url'), str) else None
+
+    capture = PageCapture(
+        url=url,
+        entries=list(recording.entries),
+        timing=timing if isinstance(timing, dict) else {},
+        settled_by=settled_by,
+        body_stats=recording.stats() if selective else {},
+        links=links,
+        final_url=final_url,
+        replay_stats=replayer.stats() if replayer is not None else {},
+        trace=tracer.metrics if tracer is not None else None,
+        throttle=throttling.describe() if throttling else {},
+        coverage=coverage_recorder.usage if coverage_recorder is not None else None,
+    )
+    # Early-stopped captures may be missing requests, so only full ones are reused
+    if until is None and settled_by != 'stopped' and cacheable:
+        capture_cache.put(key, capture)
+    return await _saved(capture, save_har)
+
+
+async def _saved(capture: PageCapture, save_har: str | None) -> PageCapture:
+    if save_har:
+        await asyncio.to_thread(write_har, save_har, capture.entries, capture.url, capture.timing)
+    return capture
+
+
+def _take(entries, count: int) -> list[dict]:
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= count:
+            break
+    return batch
+
+
+async def read_har_capture(
+    source: str,
+    bodies: RequestFilter | str | bool | None = None,
+    on_entry=None,
+    stop=None,
+    batch_size: int = 256,
+) -> PageCapture:
+    """
+    Builds a capture from a saved HAR or NDJSON file without a browser.
+
+    The file is read in a worker thread, ``batch_size`` entries at a time,
+    and response bodies are dropped as in a live capture: all of them for
+    ``bodies=False``, those not matching a filter or glob otherwise. As in
+    a live capture, ``on_entry`` receives each entry as it is read and the
+    entries are kept as well, so analyses that join on ``entries`` or
+    ``records`` afterwards see the same data from a file as from a page.
+    The default, ``bodies=None``, keeps every body, so callers that only
+    read metadata pass ``bodies=False`` (as
+    :func:`~web_inspector_mcp.pipeline.aggregate_page` does) to keep a
+    large file's bodies out of memory. ``stop`` ends reading early, as it
+    ends a page load.
+    """
+    if bodies is False:
+        body_filter, omitted = None, 'disabled'
+    elif bodies is not None:
+        body_filter, omitted = RequestFilter.coerce(bodies), 'filtered'
+    else:
+        body_filter = omitted = None
+
+    reader = HarReader(source)
+    entries = iter(reader)
+    kept: list[dict] = []
+    settled_by = 'har'
+    try:
+        while settled_by == 'har':
+            batch = await asyncio.to_thread(_take, entries, batch_size)
+            if not batch:
+                break
+            for entry in batch:
+                content = entry.get('response', {}).get('content', {})
+                if omitted and 'text' in content and (body_filter is None or not body_filter.matches(entry)):
+                    del content['text']
+                    entry['_bodyOmitted'] = omitted
+                kept.append(entry)
+                if on_entry is not None:
+                    on_entry(entry)
+                if stop is not None and stop():
+                    settled_by = 'stopped'
+                    break
+    finally:
+        entries.close()
+
+    # Chrome titles HAR pages with their URL; otherwise name the file
+    title = reader.pages[0].get('title', '') if reader.pages else ''
+    return PageCapture(
+        url=title if title.startswith(('http://', 'https://')) else source,
+        entries=kept,
+        timing=page_timing(reader.pages),
+        settled_by=settled_by,
+    )
@@ -0,0 +1,131 @@
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Rough per-value cost of dicts, lists and numbers, on top of string lengths
+_VALUE_OVERHEAD_BYTES = 16
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for use as a cache or dedupe key: lower-cased
+    scheme and host, default port and fragment dropped, query sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    if parts.username:
+        userinfo = parts.username + (f':{parts.password}' if parts.password else '')
+        host = f'{userinfo}@{host}'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+def estimate_size(value) -> int:
+    """
+    Approximate in-memory size of a JSON-like value (HAR entries, tool
+    results), dominated by its strings; the byte budget of this cache and
+    of the result store.
+    """
+    total = 0
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, (str, bytes)):
+            total += len(value)
+        elif isinstance(value, dict):
+            total += _VALUE_OVERHEAD_BYTES
+            pending.extend(value.keys())
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            total += _VALUE_OVERHEAD_BYTES
+            pending.extend(value)
+        else:
+            total += _VALUE_OVERHEAD_BYTES
+    return total
+
+class CaptureCache:
+    """
+    In-memory cache of page captures with TTL expiry and LRU eviction
+    bounded by the total (estimated) byte size of the stored entries.
+    """
+
+    def __init__(self, ttl: float = 300, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        # key -> (expires_at, size, capture)
+        self._items: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def make_key(url: str, **options) -> tuple:
+        """Builds a cache key from the page URL and every capture option."""
+        return (normalize_url(url), *sorted((k, repr(v)) for k, v in options.items()))
+
+    def get(self, key: tuple, accept=None):
+        """
+        Returns the cached capture for ``key``, or ``None``.
+
+        ``accept`` is an optional predicate that can reject a cached
+        capture (counted as a miss), e.g. one recorded without timing.
+        """
+        item = self._items.get(key)
+        if item is not None and item[0] < time.monotonic():
+            self._remove(key)
+            item = None
+        if item is None or (accept is not None and not accept(item[2])):
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[2]
+
+    def put(self, key: tuple, capture):
+        """Stores ``capture``, evicting least recently used entries to fit."""
+        if self.ttl <= 0:
+            return
+        size = estimate_size(capture.entries)
+        if size > self.max_bytes:
+            return
+        if key in self._items:
+            self._remove(key)
+        self._items[key] = (time.monotonic() + self.ttl, size, capture)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._items))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: tuple):
+        _, size, _ = self._items.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        self._items.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._items),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+capture_cache = CaptureCache(
+    ttl=float(os.environ.get('WEB_INSPECTOR_CACHE_TTL', '300')),
+    max_bytes=int(float(os.environ.get('WEB_INSPECTOR_CACHE_MAX_MB', '64')) * 1024 * 1024),
+)
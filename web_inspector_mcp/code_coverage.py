@@ -0,0 +1,166 @@
+import contextlib
+
+from pydoll.protocol.base import Command
+
+TOP_N = 20
+
+
+def _result(response) -> dict:
+    """The ``result`` of a CDP command response, or ``{}``."""
+    if isinstance(response, dict) and isinstance(response.get('result'), dict):
+        return response['result']
+    return {}
+
+
+def used_js_bytes(functions: list[dict]) -> tuple[int, int]:
+    """
+    ``(total, used)`` bytes of one script from its V8 block coverage.
+
+    Coverage ranges nest (a function inside the script, a block inside the
+    function) and the innermost range decides whether its bytes ran, so
+    they are flattened into disjoint executed ranges first, the way
+    DevTools does. The first range covers the whole script.
+    """
+    ranges = [r for f in functions for r in f.get('ranges', [])]
+    if not ranges:
+        return 0, 0
+    total = max(r['endOffset'] for r in ranges)
+    points = []
+    for r in ranges:
+        length = r['endOffset'] - r['startOffset']
+        # At one offset: ends before starts, longer ranges open first and close last
+        points.append((r['startOffset'], 1, -length, r['count']))
+        points.append((r['endOffset'], 0, length, None))
+    points.sort(key=lambda p: p[:3])
+
+    counts: list[int] = []
+    used = 0
+    last = 0
+    for offset, is_start, _, count in points:
+        if counts and counts[-1] > 0:
+            used += offset - last
+        last = offset
+        if is_start:
+            counts.append(count)
+        else:
+            counts.pop()
+    return total, used
+
+
+def used_css_bytes(rules: list[tuple[int, int]]) -> int:
+    """Bytes covered by the used rules' ``(start, end)`` offsets, overlaps counted once."""
+    used = 0
+    end = -1
+    for start, stop in sorted(rules):
+        if stop <= end:
+            continue
+        used += stop - max(start, end)
+        end = stop
+    return used
+
+
+class CoverageRecorder:
+    """
+    Records which JavaScript and CSS bytes a page load actually used:
+    V8 precise block coverage through ``Profiler`` and rule usage through
+    ``CSS.startRuleUsageTracking``. Collected when the block exits into
+    ``usage``, one row per script or stylesheet URL (inline code counts
+    under its document's URL).
+    """
+
+    def __init__(self, tab):
+        self._tab = tab
+        # styleSheetId -> (url, length)
+        self._sheets: dict[str, tuple[str, int]] = {}
+        self._callback_id = None
+        self.usage: list[dict] = []
+
+    def _on_sheet(self, event: dict):
+        header = event.get('params', {}).get('header', {})
+        self._sheets[header.get('styleSheetId')] = (header.get('sourceURL') or '', header.get('length', 0))
+
+    async def _send(self, method: str, params: dict | None = None) -> dict:
+        command = Command(method=method, params=params) if params else Command(method=method)
+        return _result(await self._tab._execute_command(command))
+
+    async def __aenter__(self):
+        self._callback_id = await self._tab.on('CSS.styleSheetAdded', self._on_sheet)
+        await self._send('Profiler.enable')
+        await self._send('Profiler.startPreciseCoverage', {'callCount': False, 'detailed': True})
+        await self._send('DOM.enable')
+        await self._send('CSS.enable')
+        await self._send('CSS.startRuleUsageTracking')
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                scripts = (await self._send('Profiler.takePreciseCoverage')).get('result', [])
+                rules = (await self._send('CSS.stopRuleUsageTracking')).get('ruleUsage', [])
+                self.usage = self._usage(scripts, rules)
+        finally:
+            for method in ('Profiler.stopPreciseCoverage', 'Profiler.disable', 'CSS.disable', 'DOM.disable'):
+                with contextlib.suppress(Exception):
+                    await self._send(method)
+            with contextlib.suppress(Exception):
+                await self._tab.remove_callback(self._callback_id)
+
+    def _usage(self, scripts: list[dict], rules: list[dict]) -> list[dict]:
+        by_url: dict[tuple[str, str], list[int]] = {}
+        for script in scripts:
+            url = script.get('url') or ''
+            if not url.startswith(('http://', 'https://')):
+                continue
+            total, used = used_js_bytes(script.get('functions', []))
+            totals = by_url.setdefault(('script', url), [0, 0])
+            totals[0] += total
+            totals[1] += used
+
+        used_rules: dict[str, list[tuple[int, int]]] = {}
+        for rule in rules:
+            if rule.get('used'):
+                used_rules.setdefault(rule['styleSheetId'], []).append((rule['startOffset'], rule['endOffset']))
+        for sheet_id, (url, length) in self._sheets.items():
+            if not url.startswith(('http://', 'https://')):
+                continue
+            totals = by_url.setdefault(('stylesheet', url), [0, 0])
+            totals[0] += length
+            totals[1] += min(used_css_bytes(used_rules.get(sheet_id, [])), length)
+
+        return [
+            {'url': url, 'kind': kind, 'total_bytes': total, 'used_bytes': used}
+            for (kind, url), (total, used) in by_url.items()
+        ]
+
+
+def coverage_report(usage: list[dict], records=None, top_n: int = TOP_N) -> dict:
+    """
+    Ranks scripts and stylesheets by unused bytes, with their transfer
+    size from the capture's records and the share of it that is unused.
+    """
+    transfer = {}
+    for record in records or []:
+        transfer.setdefault(record.url, record.transfer_bytes)
+    rows = []
+    totals = {}
+    for item in usage:
+        total, used = item['total_bytes'], item['used_bytes']
+        unused = max(total - used, 0)
+        share = unused / total if total else 0
+        row = {
+            **item,
+            'unused_bytes': unused,
+            'unused_pct': round(share * 100, 1),
+        }
+        if item['url'] in transfer:
+            row['transfer_bytes'] = transfer[item['url']]
+            row['unused_transfer_bytes'] = round(transfer[item['url']] * share)
+        rows.append(row)
+        kind = totals.setdefault(item['kind'], {'total_bytes': 0, 'used_bytes': 0})
+        kind['total_bytes'] += total
+        kind['used_bytes'] += used
+    for kind in totals.values():
+        kind['unused_bytes'] = kind['total_bytes'] - kind['used_bytes']
+        kind['unused_pct'] = round(kind['unused_bytes'] / kind['total_bytes'] * 100, 1) if kind['total_bytes'] else 0
+    rows.sort(key=lambda r: r['unused_bytes'], reverse=True)
+    return {'totals': totals, 'resources': rows[:top_n], 'resources_total': len(rows)}
@@ -0,0 +1,149 @@
+import bisect
+
+from web_inspector_mcp.records import RequestRecord
+from web_inspector_mcp.waterfall import phases, started_ms
+
+# Chrome opens at most this many HTTP/1.x connections per origin
+HTTP1_CONNECTION_LIMIT = 6
+# Third-party origins whose connection setup costs at least this much are
+# worth a <link rel="preconnect">
+PRECONNECT_MIN_MS = 50
+TOP_N = 20
+
+
+def _ratio(part: float, whole: float) -> float:
+    return round(part / whole, 3) if whole else 0
+
+
+class ConnectionAggregator:
+    """
+    Per-origin connection and protocol usage of a page load, from the
+    ``httpVersion``, ``connection``, ``serverIPAddress`` and ``timings`` of
+    each HAR entry: HTTP/1.x vs h2 vs h3 requests, connections opened and
+    how often they were reused, time spent in DNS, TCP and TLS setup, and
+    requests queued behind the HTTP/1.x connection limit.
+
+    Connections are counted by their connection id, or by the requests
+    that paid for a TCP handshake when the capture has no ids. A request
+    counts as queued when it was blocked while at least six other
+    requests to its HTTP/1.x origin were in flight.
+    """
+
+    def __init__(self, top_n: int = TOP_N):
+        self.top_n = top_n
+        self.by_origin: dict[str, dict] = {}
+        # Origin of the first request, normally the page itself
+        self._page_origin = None
+
+    def add_record(self, record: RequestRecord):
+        if record.scheme not in ('http', 'https'):
+            return
+        origin = f'{record.scheme}://{record.domain}'
+        if self._page_origin is None:
+            self._page_origin = origin
+        stats = self.by_origin.get(origin)
+        if stats is None:
+            stats = self.by_origin[origin] = {
+                'requests': 0, 'protocols': {}, 'connections': set(), 'server_ips': set(),
+                'handshakes': 0, 'dns': 0.0, 'tcp': 0.0, 'tls': 0.0, 'spans': [],
+            }
+        stats['requests'] += 1
+        protocol = record.protocol or 'unknown'
+        stats['protocols'][protocol] = stats['protocols'].get(protocol, 0) + 1
+        if record.connection:
+            stats['connections'].add(record.connection)
+        if record.server_ip:
+            stats['server_ips'].add(record.server_ip)
+
+        values = phases(record)
+        connect, ssl = values.get('connect', 0), values.get('ssl', 0)
+        if connect:
+            stats['handshakes'] += 1
+        stats['dns'] += values.get('dns', 0)
+        stats['tcp'] += max(connect - ssl, 0)
+        stats['tls'] += ssl
+        start = started_ms(record.started)
+        if record.protocol.startswith('http/1') and start is not None:
+            stats['spans'].append((start, start + max(record.time_ms or 0, 0), values.get('blocked', 0)))
+
+    @staticmethod
+    def _queued(spans: list[tuple[float, float, float]]) -> tuple[int, float]:
+        """Requests blocked while the connection limit was in use, and their blocked time."""
+        starts = sorted(s[0] for s in spans)
+        ends = sorted(s[1] for s in spans)
+        queued, blocked_ms = 0, 0.0
+        for start, _, blocked in spans:
+            if blocked <= 0:
+                continue
+            # Started at or before this one and not finished yet, itself excluded
+            in_flight = bisect.bisect_right(starts, start) - bisect.bisect_right(ends, start) - 1
+            if in_flight >= HTTP1_CONNECTION_LIMIT:
+                queued += 1
+                blocked_ms += blocked
+        return queued, blocked_ms
+
+    def _row(self, origin: str, stats: dict) -> dict:
+        requests = stats['requests']
+        connections = len(stats['connections']) or stats['handshakes']
+        queued, queued_ms = self._queued(stats['spans'])
+        setup = {k: round(stats[k], 1) for k in ('dns', 'tcp', 'tls')}
+        setup['total'] = round(sum(setup.values()), 1)
+        return {
+            'origin': origin,
+            'requests': requests,
+            'protocols': stats['protocols'],
+            'connections': connections,
+            'reuse_ratio': _ratio(max(requests - connections, 0), requests),
+            'server_ips': sorted(stats['server_ips']),
+            'setup_ms': setup,
+            'queued_requests': queued,
+            'queued_ms': round(queued_ms, 1),
+        }
+
+    def result(self) -> dict:
+        rows = [self._row(origin, stats) for origin, stats in self.by_origin.items()]
+        requests = sum(r['requests'] for r in rows)
+        protocols: dict[str, int] = {}
+        for row in rows:
+            for protocol, n in row['protocols'].items():
+                protocols[protocol] = protocols.get(protocol, 0) + n
+        # h2 and h3 can carry several origins over one connection
+        ids = set().union(*(stats['connections'] for stats in self.by_origin.values()))
+        connections = len(ids) if ids else sum(r['connections'] for r in rows)
+        setup = {k: round(sum(r['setup_ms'][k] for r in rows), 1) for k in ('dns', 'tcp', 'tls', 'total')}
+
+        # Several origins on one server address, each with its own connections
+        by_ip: dict[str, list[str]] = {}
+        for row in rows:
+            if row['connections']:
+                for ip in row['server_ips']:
+                    by_ip.setdefault(ip, []).append(row['origin'])
+        rows.sort(key=lambda r: (r['setup_ms']['total'], r['queued_ms']), reverse=True)
+        return {
+            'requests': requests,
+            'protocols': protocols,
+            'protocol_share': {p: _ratio(n, requests) for p, n in protocols.items()},
+            'connections': connections,
+            'connection_reuse_ratio': _ratio(max(requests - connections, 0), requests),
+            'setup_ms': setup,
+            'queued_requests': sum(r['queued_requests'] for r in rows),
+            'queued_ms': round(sum(r['queued_ms'] for r in rows), 1),
+            'by_origin': rows[:self.top_n],
+            'origins_total': len(rows),
+            'preconnect_candidates': [
+                {'origin': r['origin'], 'setup_ms': r['setup_ms']['total']}
+                for r in rows
+                if r['origin'] != self._page_origin and r['setup_ms']['total'] >= PRECONNECT_MIN_MS
+            ],
+            'shared_servers': [
+                {'server_ip': ip, 'origins': origins} for ip, origins in sorted(by_ip.items()) if len(origins) > 1
+            ],
+        }
+
+
+def connection_report(records: list[RequestRecord], top_n: int = TOP_N) -> dict:
+    """Runs :class:`ConnectionAggregator` over a capture's records."""
+    aggregator = ConnectionAggregator(top_n)
+    for record in records:
+        aggregator.add_record(record)
+    return aggregator.result()
@@ -0,0 +1,257 @@
+import gzip
+import io
+import json
+import os
+from urllib.parse import unquote, urlsplit
+
+HAR_SUFFIXES = ('.har', '.har.gz', '.ndjson', '.ndjson.gz', '.jsonl', '.jsonl.gz')
+# Captures are only read from and written to this directory, and relative
+# paths are taken from it; '*' lifts the restriction
+HAR_DIR = os.environ.get('WEB_INSPECTOR_HAR_DIR') or os.path.join('~', '.web_inspector', 'captures')
+if HAR_DIR == '*':
+    HAR_DIR = None
+
+# Bytes read from disk at a time
+CHUNK_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+
+
+def har_path(source: str) -> str | None:
+    """
+    The file path when ``source`` names a HAR or NDJSON capture (a path or
+    ``file://`` URL ending in one of :data:`HAR_SUFFIXES`), else ``None``.
+    Other ``file://`` URLs are pages for the browser to load.
+    """
+    if source.startswith('file://'):
+        path = unquote(urlsplit(source).path)
+    elif '://' in source:
+        return None
+    else:
+        path = os.path.expanduser(source)
+    return path if path.lower().endswith(HAR_SUFFIXES) else None
+
+
+def resolve_har_path(source: str) -> str:
+    """
+    The file a capture is read from or written to, checked to be a HAR or
+    NDJSON file inside :data:`HAR_DIR` (anywhere when it is ``None``).
+
+    Raises:
+        ValueError: For any other path.
+    """
+    path = har_path(source)
+    if path is None:
+        raise ValueError(f'Not a HAR or NDJSON capture path: {source!r}; expected one of {list(HAR_SUFFIXES)}')
+    if HAR_DIR is not None:
+        root = os.path.realpath(os.path.expanduser(HAR_DIR))
+        path = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f'Capture path {source!r} is outside {HAR_DIR!r} (WEB_INSPECTOR_HAR_DIR)')
+    return path
+
+
+def _is_ndjson(path: str) -> bool:
+    name = path.lower().removesuffix('.gz')
+    return name.endswith(('.ndjson', '.jsonl'))
+
+
+def _open_text(path: str, mode: str = 'rt'):
+    """Opens ``path`` as text, gzip-compressed when it starts with the gzip magic (reading) or ends in ``.gz`` (writing)."""
+    if 'r' in mode:
+        with open(path, 'rb') as probe:
+            compressed = probe.read(2) == b'\x1f\x8b'
+    else:
+        compressed = path.lower().endswith('.gz')
+    if compressed:
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class HarReader:
+    """
+    Reads the entries of a HAR file (plain or gzipped) one at a time.
+
+    The document is walked key by key with ``json.JSONDecoder.raw_decode``
+    over a sliding buffer: everything outside ``log.entries`` is decoded
+    and kept (``pages``, ``creator``...) while each entry is decoded,
+    yielded and dropped, so the reader itself holds one entry plus a read
+    chunk however large the file is; what the caller keeps of each entry
+    is up to it (see :func:`~web_inspector_mcp.capture.read_har_capture`).
+    NDJSON files (``.ndjson`` / ``.jsonl``)
+    hold one entry per line.
+
+    Args:
+        source: A path or ``file://`` URL (see :func:`resolve_har_path`).
+    """
+
+    def __init__(self, source: str):
+        self.path = resolve_har_path(source)
+        self.log: dict = {}
+
+    @property
+    def pages(self) -> list[dict]:
+        return self.log.get('pages', [])
+
+    def __iter__(self):
+        with _open_text(self.path) as stream:
+            if _is_ndjson(self.path):
+                yield from self._ndjson(stream)
+            else:
+                yield from _JsonWalker(stream).har_entries(self.log)
+
+    @staticmethod
+    def _ndjson(stream):
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f'Invalid JSON on line {number}: {e}') from None
+            if isinstance(value, dict) and 'request' in value:
+                yield value
+
+
+class _JsonWalker:
+    """A cursor over a text stream that decodes one JSON value or token at a time."""
+
+    def __init__(self, stream: io.TextIOBase):
+        self.stream = stream
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int = CHUNK_SIZE) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of HAR file')
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f'Expected {char!r} in HAR file, found {self.buffer[self.pos]!r}')
+        self.pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                # Possibly cut off by the buffer: read more (at least as much
+                # again, so retries on one huge value stay linear) and retry
+                if not self._fill(max(CHUNK_SIZE, len(self.buffer) - self.pos)):
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self.buffer[end - 1] not in '"}]el':
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def _members(self):
+        """Yields the keys of the object at the cursor, leaving it on each value."""
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            yield key
+            if self._peek() == ',':
+                self.pos += 1
+                continue
+            self._expect('}')
+            return
+
+    def har_entries(self, log: dict):
+        """Yields ``log.entries`` one by one, storing the rest of ``log`` in ``log``."""
+        for key in self._members():
+            if key != 'log':
+                self._value()
+                continue
+            for log_key in self._members():
+                if log_key != 'entries':
+                    log[log_key] = self._value()
+                    continue
+                self._expect('[')
+                if self._peek() == ']':
+                    self.pos += 1
+                    continue
+                while True:
+                    yield self._value()
+                    if self._peek() == ',':
+                        self.pos += 1
+                        continue
+                    self._expect(']')
+                    break
+
+
+def page_timing(pages: list[dict]) -> dict:
+    """Navigation timing in the shape live captures use, from a HAR's first page."""
+    if not pages:
+        return {}
+    timings = pages[0].get('pageTimings', {})
+    timing = {}
+    for har_key, key in (('onContentLoad', 'dom_content_loaded'), ('onLoad', 'load_event')):
+        value = timings.get(har_key)
+        if isinstance(value, (int, float)) and value >= 0:
+            timing[key] = value
+    return timing
+
+
+def write_har(path: str, entries, page_url: str = '', timing: dict | None = None):
+    """
+    Writes entries as HAR (``.har``, gzipped for ``.har.gz``) or, for
+    ``.ndjson`` / ``.jsonl``, one entry per line. Entries are serialized
+    one at a time, so ``entries`` may be any iterable.
+
+    Raises:
+        ValueError: For a path :func:`resolve_har_path` rejects.
+    """
+    path = resolve_har_path(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with _open_text(path, 'wt') as out:
+        if _is_ndjson(path):
+            for entry in entries:
+                out.write(json.dumps(entry, ensure_ascii=False))
+                out.write('\n')
+            return
+        timing = timing or {}
+        page = {
+            'startedDateTime': '',
+            'id': 'page_1',
+            'title': page_url,
+            'pageTimings': {
+                'onContentLoad': timing.get('dom_content_loaded', -1),
+                'onLoad': timing.get('load_event', -1),
+            },
+        }
+        header = {'version': '1.2', 'creator': {'name': 'web-inspector-mcp', 'version': '0.1.0'}, 'pages': [page]}
+        out.write('{"log": ')
+        out.write(json.dumps(header)[:-1])
+        out.write(', "entries": [\n')
+        for index, entry in enumerate(entries):
+            if index:
+                out.write(',\n')
+            out.write(json.dumps(entry, ensure_ascii=False))
+        out.write('\n]}}\n')
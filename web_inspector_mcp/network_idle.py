@@ -0,0 +1,170 @@
+import asyncio
+import contextlib
+
+from pydoll.protocol.network.events import NetworkEvent
+
+# wait_until strategy -> requests allowed in flight while "idle"
+WAIT_STRATEGIES = {
+    'networkidle0': 0,
+    'networkidle2': 2,
+}
+
+
+class NetworkIdle:
+    """
+    Tracks in-flight requests from CDP Network events so a page load can end
+    as soon as the network goes quiet, instead of after a fixed sleep.
+
+    The page counts as idle once no more than ``max_inflight`` requests have
+    been in flight for ``idle_ms`` milliseconds. Optionally, ``until`` (a
+    predicate on the request URL) ends the wait early once ``until_count``
+    matching requests have finished loading, and ``stop`` (a zero-argument
+    predicate, e.g. over results aggregated so far) ends it once true.
+
+    Use it as an async context manager around the navigation so no request
+    is missed::
+
+        async with NetworkIdle(tab) as idle:
+            await tab.go_to(url)
+            await idle.wait(timeout=5)
+    """
+
+    def __init__(
+        self,
+        tab,
+        max_inflight: int = 0,
+        idle_ms: int = 500,
+        until=None,
+        until_count: int = 1,
+        stop=None,
+    ):
+        self._tab = tab
+        self.max_inflight = max_inflight
+        self.idle_seconds = idle_ms / 1000
+        self._until = until
+        self._until_count = until_count
+        self._stop = stop
+        self._in_flight: dict[str, str] = {}
+        self._callback_ids: list[int] = []
+        self._quiet_since = 0.0
+        self.matched = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def _touch(self):
+        self._quiet_since = asyncio.get_running_loop().time()
+
+    def _on_request(self, event: dict):
+        params = event['params']
+        self._in_flight[params['requestId']] = params.get('request', {}).get('url', '')
+        self._touch()
+
+    def _on_done(self, event: dict):
+        url = self._in_flight.pop(event['params']['requestId'], None)
+        if url is None:
+            return
+        if self._until is not None and self._until(url):
+            self.matched += 1
+        self._touch()
+
+    def is_idle(self) -> bool:
+        if len(self._in_flight) > self.max_inflight:
+            return False
+        now = asyncio.get_running_loop().time()
+        return now - self._quiet_since >= self.idle_seconds
+
+    def is_satisfied(self) -> bool:
+        return self._until is not None and self.matched >= self._until_count
+
+    async def __aenter__(self):
+        self._touch()
+        self._callback_ids = [
+            await self._tab.on(NetworkEvent.REQUEST_WILL_BE_SENT, self._on_request),
+            await self._tab.on(NetworkEvent.LOADING_FINISHED, self._on_done),
+            await self._tab.on(NetworkEvent.LOADING_FAILED, self._on_done),
+        ]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        for callback_id in self._callback_ids:
+            with contextlib.suppress(Exception):
+                await self._tab.remove_callback(callback_id)
+        self._callback_ids.clear()
+
+    async def wait(self, timeout: float) -> str:
+        """
+        Waits until the page is idle, the ``until`` predicate is satisfied,
+        ``stop`` returns true or ``timeout`` seconds pass, whichever comes first.
+
+        Returns:
+            ``'stopped'``, ``'matched'``, ``'idle'`` or ``'timeout'``.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            if self._stop is not None and self._stop():
+                return 'stopped'
+            if self.is_satisfied():
+                return 'matched'
+            if self.is_idle():
+                return 'idle'
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return 'timeout'
+            await asyncio.sleep(min(0.05, self.idle_seconds or 0.05, remaining))
+
+
+async def load_page(
+    tab,
+    url: str,
+    wait: float = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    until=None,
+    until_count: int = 1,
+    stop=None,
+) -> str:
+    """
+    Navigates ``tab`` to ``url`` and returns once the page has settled.
+
+    Args:
+        tab:         The tab to navigate.
+        url:         The page to load.
+        wait:        Upper bound, in seconds, on how long to wait after load.
+        wait_until:  ``'networkidle0'`` (no requests in flight),
+                     ``'networkidle2'`` (at most two in flight) or
+                     ``'fixed'`` (always sleep ``wait`` seconds).
+        idle_ms:     How long the network must stay quiet to count as idle.
+        until:       Optional URL predicate; the wait ends once
+                     ``until_count`` matching requests have finished.
+        until_count: Number of ``until`` matches that end the wait.
+        stop:        Optional zero-argument predicate that ends the wait
+                     once it returns true.
+
+    Returns:
+        Why the wait ended: ``'idle'``, ``'matched'``, ``'stopped'``,
+        ``'timeout'`` or ``'fixed'``.
+    """
+    if wait_until == 'fixed':
+        await tab.go_to(url)
+        await asyncio.sleep(wait)
+        return 'fixed'
+
+    if wait_until not in WAIT_STRATEGIES:
+        raise ValueError(
+            f'Unknown wait_until {wait_until!r}; expected one of '
+            f"{sorted([*WAIT_STRATEGIES, 'fixed'])}"
+        )
+
+    async with NetworkIdle(
+        tab,
+        max_inflight=WAIT_STRATEGIES[wait_until],
+        idle_ms=idle_ms,
+        until=until,
+        until_count=until_count,
+        stop=stop,
+    ) as idle:
+        await tab.go_to(url)
+        return await idle.wait(wait)
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+# Work on inputs smaller than this runs inline on the event loop
+INLINE_BYTES = int(float(os.environ.get('WEB_INSPECTOR_OFFLOAD_KB', '64')) * 1024)
+# ... and from this size up in a worker process rather than a thread
+PROCESS_BYTES = int(float(os.environ.get('WEB_INSPECTOR_PROCESS_MB', '1')) * 1024 * 1024)
+# Worker processes (0 keeps all offloaded work in threads)
+CPU_WORKERS = int(os.environ.get('WEB_INSPECTOR_CPU_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def loads(text: str | bytes):
+    """Parses JSON with orjson when it is installed, else the stdlib."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _get_process_pool() -> ProcessPoolExecutor | None:
+    global _process_pool
+    if CPU_WORKERS <= 0:
+        return None
+    if _process_pool is None:
+        # Spawned, not forked: the server process runs an event loop and threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=CPU_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _process_pool
+
+
+async def run_sized(func, *args, size: int, processes: bool = True):
+    """
+    Runs ``func(*args)`` where it least disturbs the event loop, judged by
+    ``size`` (bytes of input). Small inputs run inline, since a thread hop
+    costs more than the work; medium ones in the default thread pool; and
+    large ones, when ``processes`` is set, in a worker process so they
+    don't hold the GIL against CDP handlers and other tool calls. ``func``
+    and its arguments must be picklable for the process pool.
+    """
+    if size < INLINE_BYTES:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    pool = _get_process_pool() if processes and size >= PROCESS_BYTES else None
+    return await loop.run_in_executor(pool, func, *args)
+
+
+def shutdown():
+    """Stops the worker processes, if any were started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
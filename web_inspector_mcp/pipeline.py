@@ -0,0 +1,84 @@
+import asyncio
+import contextlib
+
+from web_inspector_mcp.capture import PageCapture, capture_page
+
+
+async def _report_progress(aggregator, counter: list[int], on_progress, interval: float):
+    """Sends ``on_progress(count, summary)`` whenever new entries arrived."""
+    reported = 0
+    while True:
+        await asyncio.sleep(interval)
+        if counter[0] != reported:
+            reported = counter[0]
+            with contextlib.suppress(Exception):
+                await on_progress(reported, aggregator.summary())
+
+
+async def aggregate_page(
+    url: str,
+    aggregator,
+    on_progress=None,
+    stop_when=None,
+    interval: float = 0.5,
+    bodies=False,
+    **capture_options,
+) -> PageCapture:
+    """
+    Captures ``url`` and feeds every HAR entry to ``aggregator``, an object
+    with ``add(entry)`` and ``summary()`` methods.
+
+    When ``on_progress`` or ``stop_when`` is given the capture is streamed:
+    entries reach the aggregator as CDP events complete them, response
+    bodies are not recorded, ``on_progress(count, summary)`` is awaited at
+    most every ``interval`` seconds, and ``stop_when(aggregator)`` returning
+    true ends the page load early. Otherwise the page is captured as usual
+    and aggregated afterwards, with response bodies only when ``bodies``
+    asks for them: most aggregators read metadata alone, and a saved
+    capture then doesn't hold every body in memory.
+
+    Args:
+        url:             The page to load.
+        aggregator:      Incremental analysis receiving each entry.
+        on_progress:     Optional ``async (count, summary)`` callback.
+        stop_when:       Optional predicate on the aggregator that stops the load.
+        interval:        Minimum seconds between progress reports.
+        bodies:          Response bodies to keep when not streaming, as for
+                         :func:`capture_page` (default: ``False``, none).
+        capture_options: Passed on to :func:`capture_page`.
+    """
+    if on_progress is None and stop_when is None:
+        capture = await capture_page(url, bodies=bodies, **capture_options)
+        for entry in capture.entries:
+            aggregator.add(entry)
+        return capture
+
+    counter = [0]
+
+    def on_entry(entry):
+        counter[0] += 1
+        aggregator.add(entry)
+
+    stop = None
+    if stop_when is not None:
+        def stop():
+            return stop_when(aggregator)
+
+    reporter = None
+    if on_progress is not None:
+        reporter = asyncio.create_task(
+            _report_progress(aggregator, counter, on_progress, interval)
+        )
+    try:
+        capture = await capture_page(
+            url, bodies=False, on_entry=on_entry, stop=stop, **capture_options,
+        )
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reporter
+    if on_progress is not None:
+        with contextlib.suppress(Exception):
+            await on_progress(counter[0], aggregator.summary())
+    return capture
@@ -0,0 +1,175 @@
+import os
+from contextlib import asynccontextmanager
+
+from pydoll.browser.requests.har_recorder import HarCapture, HarRecorder
+
+DEFAULT_MAX_BODY_BYTES = int(float(os.environ.get('WEB_INSPECTOR_MAX_BODY_MB', '5')) * 1024 * 1024)
+DEFAULT_MAX_TOTAL_BYTES = int(float(os.environ.get('WEB_INSPECTOR_BODY_BUDGET_MB', '50')) * 1024 * 1024)
+
+
+class _EntryStream(list):
+    """Entry list that hands each entry to ``on_entry`` as it is recorded."""
+
+    def __init__(self, on_entry=None):
+        super().__init__()
+        self._on_entry = on_entry
+
+    def append(self, entry):
+        super().append(entry)
+        if self._on_entry is not None:
+            self._on_entry(entry)
+
+
+def _size(body: str, base64_encoded: bool) -> int:
+    """Bytes ``body`` takes as UTF-8 (base64 is ASCII, so one per character)."""
+    return len(body) if base64_encoded or body.isascii() else len(body.encode('utf-8'))
+
+
+def _truncate(body: str, base64_encoded: bool, limit: int) -> str:
+    """``body`` cut to at most ``limit`` UTF-8 bytes, still decodable."""
+    if base64_encoded:
+        return body[:limit - limit % 4]
+    if body.isascii():
+        return body[:limit]
+    # Drops a character split by the cut rather than keeping half of it
+    return body.encode('utf-8')[:limit].decode('utf-8', 'ignore')
+
+
+class SelectiveHarRecorder(HarRecorder):
+    """
+    HAR recorder that keeps metadata for every request but only fetches
+    response bodies (``Network.getResponseBody``) for requests accepted by
+    ``body_filter``, a :class:`~web_inspector_mcp.request_filter.RequestFilter`.
+
+    This hooks into pydoll's private recorder API (``_finalize_entry``,
+    ``_pending``, ``_build_entry``, ``_fetch_response_body``), which is why
+    pydoll is pinned to the tested minor version.
+
+    Bodies longer than ``max_body_bytes`` (as UTF-8, or as the base64 text
+    for binary bodies) are truncated, and once
+    ``max_total_bytes`` of bodies have been kept, further bodies are
+    skipped; ``fetch_bodies=False`` records metadata only. Entries whose
+    body was left out carry a ``_bodyOmitted`` reason (``'filtered'``,
+    ``'budget'``, ``'disabled'``); truncated ones ``_bodyTruncated``.
+
+    ``on_entry`` is called with each HAR entry as soon as it is complete,
+    so results can be aggregated while the page is still loading.
+    """
+
+    def __init__(
+        self,
+        tab,
+        body_filter=None,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+        resource_types=None,
+        fetch_bodies: bool = True,
+        on_entry=None,
+    ):
+        super().__init__(tab, resource_types=resource_types)
+        self._entries = _EntryStream(on_entry)
+        self._body_filter = body_filter
+        self.fetch_bodies = fetch_bodies
+        self.max_body_bytes = max_body_bytes
+        self.max_total_bytes = max_total_bytes
+        self.body_bytes = 0
+        self.bodies_fetched = 0
+        self.bodies_skipped = 0
+        self.bodies_truncated = 0
+
+    def _wants_body(self, pending: dict) -> bool:
+        return self._body_filter is None or self._body_filter.matches_request(
+            pending.get('url', ''),
+            pending.get('method', ''),
+            pending.get('status'),
+            pending.get('resource_type', ''),
+            pending.get('mime_type', ''),
+        )
+
+    async def _finalize_entry(self, request_id: str) -> None:
+        pending = self._pending.pop(request_id, None)
+        if not pending:
+            return
+
+        omitted = None
+        truncated = False
+        body, base64_encoded = '', False
+        if not self.fetch_bodies:
+            omitted = 'disabled'
+        elif not self._wants_body(pending):
+            omitted = 'filtered'
+        elif self.body_bytes >= self.max_total_bytes:
+            omitted = 'budget'
+        else:
+            expects_body = pending.get('body_bytes', -1) > 0
+            body, base64_encoded = await self._fetch_response_body(request_id, expects_body)
+            limit = min(self.max_body_bytes, self.max_total_bytes - self.body_bytes)
+            size = _size(body, base64_encoded)
+            if size > limit:
+                body = _truncate(body, base64_encoded, limit)
+                size = _size(body, base64_encoded)
+                truncated = True
+                self.bodies_truncated += 1
+            self.body_bytes += size
+            self.bodies_fetched += 1
+
+        if omitted:
+            self.bodies_skipped += 1
+        pending['response_body'] = body
+        pending['response_body_base64'] = base64_encoded
+
+        entry = self._build_entry(pending)
+        if omitted:
+            entry['_bodyOmitted'] = omitted
+        if truncated:
+            entry['_bodyTruncated'] = True
+        self._entries.append(entry)
+
+    def stats(self) -> dict:
+        return {
+            'bodies_fetched': self.bodies_fetched,
+            'bodies_skipped': self.bodies_skipped,
+            'bodies_truncated': self.bodies_truncated,
+            'body_bytes': self.body_bytes,
+        }
+
+
+class SelectiveHarCapture(HarCapture):
+    """The ``HarCapture`` of a :class:`SelectiveHarRecorder`."""
+
+    def stats(self) -> dict:
+        """See :meth:`SelectiveHarRecorder.stats`."""
+        return self._recorder.stats()
+
+
+@asynccontextmanager
+async def record(
+    tab,
+    body_filter=None,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+    fetch_bodies: bool = True,
+    on_entry=None,
+):
+    """
+    Like ``tab.request.record()``, but only fetches bodies for requests
+    accepted by ``body_filter`` (a ``RequestFilter``), or none at all with
+    ``fetch_bodies=False``, and streams entries to ``on_entry``.
+
+    Yields:
+        A :class:`SelectiveHarCapture`.
+    """
+    recorder = SelectiveHarRecorder(
+        tab,
+        body_filter=body_filter,
+        max_body_bytes=max_body_bytes,
+        max_total_bytes=max_total_bytes,
+        fetch_bodies=fetch_bodies,
+        on_entry=on_entry,
+    )
+    capture = SelectiveHarCapture(recorder)
+    await recorder.start()
+    try:
+        yield capture
+    finally:
+        await recorder.stop()
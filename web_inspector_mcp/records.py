@@ -0,0 +1,103 @@
+import sys
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+# HAR ``timings`` phases, in order; ``ssl`` is part of ``connect``
+HAR_PHASES = ('blocked', 'dns', 'connect', 'ssl', 'send', 'wait', 'receive')
+
+
+def http_version(value: str) -> str:
+    """
+    A HAR ``httpVersion`` as ``'http/1.0'``, ``'http/1.1'``, ``'h2'`` or
+    ``'h3'`` (Chrome and DevTools exports spell them differently), or ``''``.
+    """
+    value = value.strip().lower()
+    if value in ('h2', 'h2c', 'http/2', 'http/2.0'):
+        return 'h2'
+    if value.startswith(('h3', 'http/3', 'quic')):
+        return 'h3'
+    if value in ('http/1.0', 'http/1.1'):
+        return value
+    return ''
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    """
+    Compact per-request view of a HAR entry, built once and shared by the
+    analyses. URL parts are split a single time, and the small set of
+    repeated strings (method, type, domain, MIME type) is interned so
+    thousands of records share one copy of each.
+    """
+
+    url: str
+    method: str
+    status: int
+    resource_type: str
+    scheme: str
+    domain: str
+    path: str
+    has_query: bool
+    has_post_data: bool
+    mime_type: str
+    started: str
+    time_ms: float
+    body_size: int
+    transfer_size: int
+    # HAR_PHASES in ms, -1 where a phase doesn't apply; empty when unknown
+    timings: tuple[float, ...] = ()
+    # See http_version; '' when unknown
+    protocol: str = ''
+    # Browser connection id and server address; '' when not recorded
+    connection: str = ''
+    server_ip: str = ''
+
+    @classmethod
+    def from_entry(cls, entry: dict) -> 'RequestRecord':
+        req = entry.get('request', {})
+        resp = entry.get('response', {})
+        url = req.get('url', '')
+        try:
+            parts = urlsplit(url)
+            scheme, domain, path, has_query = parts.scheme, parts.netloc, parts.path, bool(parts.query)
+        except ValueError:
+            scheme, domain, path, has_query = '', '', url, False
+        mime = resp.get('content', {}).get('mimeType') or ''
+        timings = entry.get('timings')
+        return cls(
+            url=url,
+            method=sys.intern(req.get('method', '')),
+            status=resp.get('status', 0),
+            resource_type=sys.intern(entry.get('_resourceType', '')),
+            scheme=sys.intern(scheme),
+            domain=sys.intern(domain),
+            path=path,
+            has_query=has_query,
+            has_post_data='postData' in req,
+            mime_type=sys.intern(mime.split(';', 1)[0].strip().lower()),
+            started=entry.get('startedDateTime', ''),
+            time_ms=entry.get('time', 0),
+            body_size=resp.get('bodySize', 0),
+            transfer_size=resp.get('_transferSize', 0),
+            timings=tuple(timings.get(p, -1) for p in HAR_PHASES) if timings else (),
+            protocol=sys.intern(http_version(resp.get('httpVersion') or req.get('httpVersion') or '')),
+            connection=str(entry.get('connection') or ''),
+            server_ip=sys.intern(entry.get('serverIPAddress') or ''),
+        )
+
+    @property
+    def clean_url(self) -> str:
+        """The URL without query string or fragment."""
+        return f'{self.scheme}://{self.domain}{self.path}'
+
+    @property
+    def transfer_bytes(self) -> int:
+        """Best known transfer size: body size, else transfer size, else 0."""
+        size = self.body_size
+        if size < 0:
+            size = self.transfer_size
+        return max(size, 0)
+
+
+def to_records(entries: list[dict]) -> list[RequestRecord]:
+    return [RequestRecord.from_entry(entry) for entry in entries]
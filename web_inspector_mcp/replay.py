@@ -0,0 +1,175 @@
+import asyncio
+import base64
+import contextlib
+from collections import deque
+
+from pydoll.commands import FetchCommands
+from pydoll.protocol.base import Command
+from pydoll.protocol.fetch.events import FetchEvent
+from pydoll.protocol.fetch.methods import EnableParams, FetchMethod
+from pydoll.protocol.network.types import ErrorReason
+
+from web_inspector_mcp.har_files import HarReader
+
+# The recorded body is already decoded, so these no longer describe it
+_DROPPED_HEADERS = frozenset({
+    'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive',
+})
+
+
+def _key(method: str, url: str) -> tuple[str, str]:
+    return method.upper(), url.split('#', 1)[0]
+
+
+class ReplayArchive:
+    """
+    Recorded responses indexed by method and URL, for :class:`RequestReplayer`.
+
+    A URL requested several times in the recording is answered with its
+    responses in recorded order, the last one repeating. Requests whose
+    exact URL wasn't recorded fall back to the first recording of the
+    same URL without query string.
+    """
+
+    def __init__(self):
+        # (method, url) -> deque of responses
+        self._responses: dict[tuple[str, str], deque] = {}
+        self._by_path: dict[tuple[str, str], dict] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of responses recorded."""
+        return self._count
+
+    @classmethod
+    def from_entries(cls, entries) -> 'ReplayArchive':
+        archive = cls()
+        for entry in entries:
+            archive.add(entry)
+        return archive
+
+    @classmethod
+    def from_har(cls, source: str) -> 'ReplayArchive':
+        """Loads every entry of a HAR or NDJSON file (see :class:`~web_inspector_mcp.har_files.HarReader`)."""
+        return cls.from_entries(HarReader(source))
+
+    def add(self, entry: dict):
+        req = entry.get('request', {})
+        resp = entry.get('response', {})
+        content = resp.get('content', {})
+        text = content.get('text') or ''
+        if content.get('encoding') == 'base64':
+            body = text
+        else:
+            body = base64.b64encode(text.encode('utf-8')).decode('ascii')
+        response = {
+            'status': resp.get('status', 0),
+            'status_text': resp.get('statusText') or None,
+            'headers': [
+                {'name': h['name'], 'value': h['value']}
+                for h in resp.get('headers', [])
+                if h.get('name', '').lower() not in _DROPPED_HEADERS
+            ],
+            'body': body,
+            'time_ms': max(entry.get('time') or 0, 0),
+        }
+        key = _key(req.get('method', 'GET'), req.get('url', ''))
+        self._responses.setdefault(key, deque()).append(response)
+        self._count += 1
+        self._by_path.setdefault(_key(key[0], key[1].split('?', 1)[0]), response)
+
+    def match(self, method: str, url: str) -> dict | None:
+        key = _key(method, url)
+        responses = self._responses.get(key)
+        if responses:
+            return responses.popleft() if len(responses) > 1 else responses[0]
+        return self._by_path.get(_key(method, key[1].split('?', 1)[0]))
+
+
+class RequestReplayer:
+    """
+    Answers every request of a tab from a :class:`ReplayArchive` through
+    ``Fetch`` interception, so a page loads without touching the network.
+
+    Responses are delayed by the recorded request time (``latency=
+    'recorded'``), a fixed number of milliseconds, or not at all (``0``).
+    Requests missing from the archive fail as if offline
+    (``unmatched='fail'``) or go to the network (``'passthrough'``).
+    Enter it after the Network domain is enabled and before navigating.
+    """
+
+    def __init__(self, tab, archive: ReplayArchive, latency: str | float = 'recorded', unmatched: str = 'fail'):
+        if unmatched not in ('fail', 'passthrough'):
+            raise ValueError(f"unmatched must be 'fail' or 'passthrough', not {unmatched!r}")
+        if latency != 'recorded' and not isinstance(latency, (int, float)):
+            raise ValueError(f"latency must be 'recorded' or milliseconds, not {latency!r}")
+        self._tab = tab
+        self.archive = archive
+        self.latency = latency
+        self.unmatched = unmatched
+        self._callback_id = None
+        self._tasks: set[asyncio.Task] = set()
+        self.served = 0
+        self.missed = 0
+
+    def stats(self) -> dict:
+        return {'served': self.served, 'unmatched': self.missed}
+
+    def _delay(self, response: dict) -> float:
+        if self.latency == 'recorded':
+            return response['time_ms'] / 1000
+        return max(float(self.latency), 0) / 1000
+
+    async def _respond(self, request_id: str, response: dict | None):
+        if response is None:
+            self.missed += 1
+            if self.unmatched == 'passthrough':
+                command = FetchCommands.continue_request(request_id)
+            else:
+                command = FetchCommands.fail_request(request_id, ErrorReason.INTERNET_DISCONNECTED)
+        else:
+            self.served += 1
+            delay = self._delay(response)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if response['status'] <= 0:
+                command = FetchCommands.fail_request(request_id, ErrorReason.FAILED)
+            else:
+                command = FetchCommands.fulfill_request(
+                    request_id,
+                    response['status'],
+                    response['headers'],
+                    response['body'],
+                    response['status_text'],
+                )
+        with contextlib.suppress(Exception):
+            await self._tab._execute_command(command)
+
+    async def _on_paused(self, event: dict):
+        params = event['params']
+        request = params.get('request', {})
+        response = self.archive.match(request.get('method', 'GET'), request.get('url', ''))
+        # Latencies overlap like real requests, so each waits in its own task
+        task = asyncio.create_task(self._respond(params['requestId'], response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def __aenter__(self):
+        self._callback_id = await self._tab.on(FetchEvent.REQUEST_PAUSED, self._on_paused)
+        await self._tab._execute_command(Command(
+            method=FetchMethod.ENABLE,
+            params=EnableParams(
+                patterns=[{'urlPattern': '*', 'requestStage': 'Request'}],
+                handleAuthRequests=False,
+            ),
+        ))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        with contextlib.suppress(Exception):
+            await self._tab._execute_command(FetchCommands.disable())
+        with contextlib.suppress(Exception):
+            await self._tab.remove_callback(self._callback_id)
@@ -0,0 +1,224 @@
+import fnmatch
+import re
+
+# Spec keys accepted by RequestFilter.from_spec
+SPEC_KEYS = (
+    'include', 'exclude', 'regex', 'exclude_regex',
+    'methods', 'status', 'resource_types', 'content_types',
+)
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, (str, int)):
+        return [value]
+    return list(value)
+
+
+def _prefix(glob: str) -> str | None:
+    """The literal prefix of a glob whose only wildcard is a trailing ``*``."""
+    if glob.endswith('*') and not any(c in glob[:-1] for c in '*?['):
+        return glob[:-1]
+    return None
+
+
+def _compile_globs(globs: list[str]) -> tuple[tuple[str, ...], re.Pattern | None]:
+    """
+    Compiles lower-cased globs into a prefix tuple (for ``str.startswith``)
+    plus one alternation regex for the rest.
+    """
+    prefixes, others = [], []
+    for glob in globs:
+        glob = glob.lower()
+        prefix = _prefix(glob)
+        if prefix is not None:
+            prefixes.append(prefix)
+        else:
+            others.append(fnmatch.translate(glob))
+    regex = re.compile('|'.join(f'(?:{p})' for p in others)) if others else None
+    return tuple(prefixes), regex
+
+
+def _compile_regexes(patterns: list[str]) -> re.Pattern | None:
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+
+
+def _parse_status(value) -> tuple[int, int]:
+    """``404`` -> (404, 404); ``'4xx'`` -> (400, 499); ``'200-299'`` -> (200, 299)."""
+    text = str(value).strip().lower()
+    if len(text) == 3 and text.endswith('xx') and text[0].isdigit():
+        base = int(text[0]) * 100
+        return base, base + 99
+    if '-' in text:
+        low, high = text.split('-', 1)
+        return int(low), int(high)
+    return int(text), int(text)
+
+
+def _mime_type(entry: dict) -> str:
+    response = entry.get('response', {})
+    mime = response.get('content', {}).get('mimeType') or ''
+    if not mime:
+        for header in response.get('headers', []):
+            if header.get('name', '').lower() == 'content-type':
+                mime = header.get('value', '')
+                break
+    return mime.split(';', 1)[0].strip().lower()
+
+
+class RequestFilter:
+    """
+    A request filter compiled once and applied to many requests.
+
+    URL globs (case-insensitive) are compiled into a prefix tuple plus a
+    single alternation regex, and user regexes into another, so each URL
+    is tested once however many patterns there are. A request matches when
+    it matches any include glob or regex (or there are none), no exclude,
+    and every method, status, resource-type and content-type predicate
+    that is set.
+
+    Args:
+        include:        URL globs to keep, e.g. ``['*api*', '*graphql*']``.
+        exclude:        URL globs to drop.
+        regex:          URL regexes to keep (searched, case-insensitive).
+        exclude_regex:  URL regexes to drop.
+        methods:        HTTP methods, e.g. ``['GET', 'POST']``.
+        status:         Status codes or ranges: ``200``, ``'4xx'``, ``'200-299'``.
+        resource_types: CDP resource types, e.g. ``['XHR', 'Fetch']``.
+        content_types:  MIME type globs, e.g. ``['application/json', '*+json']``.
+    """
+
+    def __init__(
+        self,
+        include=None,
+        exclude=None,
+        regex=None,
+        exclude_regex=None,
+        methods=None,
+        status=None,
+        resource_types=None,
+        content_types=None,
+    ):
+        self.spec = {
+            'include': _as_list(include),
+            'exclude': _as_list(exclude),
+            'regex': _as_list(regex),
+            'exclude_regex': _as_list(exclude_regex),
+            'methods': _as_list(methods),
+            'status': _as_list(status),
+            'resource_types': _as_list(resource_types),
+            'content_types': _as_list(content_types),
+        }
+        self._include_prefixes, self._include_globs = _compile_globs(self.spec['include'])
+        self._exclude_prefixes, self._exclude_globs = _compile_globs(self.spec['exclude'])
+        self._include_regex = _compile_regexes(self.spec['regex'])
+        self._exclude_regex = _compile_regexes(self.spec['exclude_regex'])
+        self._has_include = bool(self.spec['include'] or self.spec['regex'])
+        self._methods = frozenset(m.upper() for m in self.spec['methods'])
+        self._status = tuple(_parse_status(s) for s in self.spec['status'])
+        self._resource_types = frozenset(t.lower() for t in self.spec['resource_types'])
+        self._content_prefixes, self._content_globs = _compile_globs(self.spec['content_types'])
+        self._has_content = bool(self.spec['content_types'])
+
+    @classmethod
+    def from_spec(cls, spec: dict | None = None, pattern: str | None = None) -> 'RequestFilter':
+        """
+        Builds a filter from a tool's ``match`` dict, falling back to
+        ``pattern`` as the include glob when the spec has no include rules.
+
+        Raises:
+            ValueError: For unknown spec keys or malformed status values.
+        """
+        spec = dict(spec or {})
+        unknown = sorted(set(spec) - set(SPEC_KEYS))
+        if unknown:
+            raise ValueError(f'Unknown filter keys {unknown}; expected any of {list(SPEC_KEYS)}')
+        if pattern and not (spec.get('include') or spec.get('regex')):
+            spec['include'] = [pattern]
+        return cls(**spec)
+
+    @classmethod
+    def coerce(cls, value) -> 'RequestFilter':
+        """Accepts a filter, a glob string or a spec dict."""
+        if isinstance(value, RequestFilter):
+            return value
+        if isinstance(value, dict):
+            return cls.from_spec(value)
+        return cls(include=value)
+
+    @property
+    def key(self) -> tuple:
+        """Hashable description, for cache keys."""
+        return tuple((k, tuple(str(v) for v in values)) for k, values in self.spec.items() if values)
+
+    def describe(self):
+        """The single include glob when that is all there is, else the spec."""
+        rules = {k: v for k, v in self.spec.items() if v}
+        if list(rules) == ['include'] and len(rules['include']) == 1:
+            return rules['include'][0]
+        return rules
+
+    @staticmethod
+    def _glob_match(text: str, prefixes: tuple, regex: re.Pattern | None) -> bool:
+        return (bool(prefixes) and text.startswith(prefixes)) or (
+            regex is not None and regex.match(text) is not None
+        )
+
+    def matches_url(self, url: str) -> bool:
+        """Applies only the URL rules (include/exclude globs and regexes)."""
+        lowered = url.lower()
+        if self._has_include and not (
+            self._glob_match(lowered, self._include_prefixes, self._include_globs)
+            or (self._include_regex is not None and self._include_regex.search(url))
+        ):
+            return False
+        if self._glob_match(lowered, self._exclude_prefixes, self._exclude_globs):
+            return False
+        return not (self._exclude_regex is not None and self._exclude_regex.search(url))
+
+    def matches_request(
+        self,
+        url: str,
+        method: str = '',
+        status: int | None = None,
+        resource_type: str = '',
+        content_type: str = '',
+    ) -> bool:
+        """Applies every rule; ``status=None`` skips the status check."""
+        if self._methods and method.upper() not in self._methods:
+            return False
+        if self._resource_types and resource_type.lower() not in self._resource_types:
+            return False
+        if self._status and status is not None and not any(
+            low <= status <= high for low, high in self._status
+        ):
+            return False
+        if self._has_content and not self._glob_match(
+            content_type.lower(), self._content_prefixes, self._content_globs
+        ):
+            return False
+        return self.matches_url(url)
+
+    def matches(self, entry: dict) -> bool:
+        """Applies every rule to a HAR entry."""
+        req = entry.get('request', {})
+        return self.matches_request(
+            req.get('url', ''),
+            req.get('method', ''),
+            entry.get('response', {}).get('status', 0),
+            entry.get('_resourceType', ''),
+            _mime_type(entry) if self._has_content else '',
+        )
+
+    def matches_record(self, record) -> bool:
+        """Applies every rule to a :class:`~web_inspector_mcp.records.RequestRecord`."""
+        return self.matches_request(
+            record.url, record.method, record.status, record.resource_type, record.mime_type,
+        )
+
+    def apply(self, entries: list[dict]) -> list[dict]:
+        """The HAR entries that match, in one pass."""
+        return [entry for entry in entries if self.matches(entry)]
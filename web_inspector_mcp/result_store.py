@@ -0,0 +1,118 @@
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+from web_inspector_mcp.capture_cache import estimate_size
+
+
+def _project(row, fields: list[str]):
+    """Keeps only ``fields`` of a row; dotted names reach into nested dicts."""
+    if not isinstance(row, dict):
+        return row
+    projected = {}
+    for name in fields:
+        value, found = row, True
+        for part in name.split('.'):
+            if isinstance(value, dict) and part in value:
+                value = value[part]
+            else:
+                found = False
+                break
+        if found:
+            projected[name] = value
+    return projected
+
+class ResultStore:
+    """
+    Holds oversized tool results so they can be paged through with
+    ``fetch_results`` instead of being sent in one response. Entries expire
+    after ``ttl`` seconds; past ``max_handles`` handles or ``max_bytes`` of
+    (estimated) rows, the least recently used are dropped. The newest
+    handle is always kept, so the one just returned stays readable.
+    """
+
+    def __init__(self, ttl: float = 600, max_handles: int = 64, max_bytes: int = 128 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_handles = max_handles
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        # handle -> (expires_at, size, rows, meta)
+        self._items: OrderedDict = OrderedDict()
+
+    def _remove(self, handle: str):
+        _, size, _, _ = self._items.pop(handle)
+        self.bytes -= size
+
+    def _expire(self):
+        now = time.monotonic()
+        for handle in [h for h, (expires_at, _, _, _) in self._items.items() if expires_at < now]:
+            self._remove(handle)
+
+    def put(self, rows: list, meta: dict | None = None) -> str:
+        """Stores ``rows`` and returns the handle to fetch them by."""
+        self._expire()
+        handle = uuid.uuid4().hex[:12]
+        size = estimate_size(rows)
+        self._items[handle] = (time.monotonic() + self.ttl, size, rows, meta or {})
+        self.bytes += size
+        while len(self._items) > 1 and (len(self._items) > self.max_handles or self.bytes > self.max_bytes):
+            self._remove(next(iter(self._items)))
+        return handle
+
+    def page(self, handle: str, offset: int = 0, limit: int = 50, fields: list[str] | None = None) -> dict:
+        """
+        Returns ``limit`` rows starting at ``offset``, optionally projected
+        to ``fields``.
+
+        Raises:
+            ValueError: If the handle is unknown or has expired.
+        """
+        self._expire()
+        item = self._items.get(handle)
+        if item is None:
+            raise ValueError(f'Unknown or expired result handle {handle!r}')
+        self._items.move_to_end(handle)
+        _, _, rows, meta = item
+        offset = max(offset, 0)
+        limit = max(limit, 0)
+        page = rows[offset:offset + limit]
+        if fields:
+            page = [_project(row, fields) for row in page]
+        end = offset + len(page)
+        return {
+            **meta,
+            'handle': handle,
+            'total': len(rows),
+            'offset': offset,
+            'rows': page,
+            'next_offset': end if end < len(rows) else None,
+        }
+
+    def paginate(self, result: dict, key: str, page_size: int) -> dict:
+        """
+        Keeps the first ``page_size`` rows of ``result[key]`` inline and, if
+        there are more, stores the full list and adds ``handle`` and
+        ``total_rows`` so the rest can be fetched with ``fetch_results``.
+        """
+        rows = result.get(key)
+        if not isinstance(rows, list) or len(rows) <= page_size:
+            return result
+        handle = self.put(rows, {'source': key})
+        return {
+            **result,
+            key: rows[:page_size],
+            'handle': handle,
+            'total_rows': len(rows),
+        }
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+
+result_store = ResultStore(
+    ttl=float(os.environ.get('WEB_INSPECTOR_RESULT_TTL', '600')),
+    max_handles=int(os.environ.get('WEB_INSPECTOR_RESULT_HANDLES', '64')),
+    max_bytes=int(float(os.environ.get('WEB_INSPECTOR_RESULT_MAX_MB', '128')) * 1024 * 1024),
+)
@@ -0,0 +1,144 @@
+import asyncio
+from collections import defaultdict, deque
+
+
+class Scheduler:
+    """
+    Admission control for browser work.
+
+    At most ``max_concurrent`` browser tabs run at once across all clients,
+    and each client has at most ``max_per_client`` calls running. Waiting
+    calls are admitted round-robin across clients, so one busy agent can't
+    starve the others. Every call has a deadline covering both queueing and
+    execution; when it passes, the call is cancelled, which unwinds its
+    ``browser_session()`` and shuts the browser down.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        max_per_client: int = 2,
+        default_deadline: float = 120,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_client = max_per_client
+        self.default_deadline = default_deadline
+        self._active_weight = 0
+        self._active_calls: dict[str, int] = defaultdict(int)
+        self._queues: dict[str, deque] = {}
+        self._order: deque[str] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def stats(self) -> dict:
+        return {
+            'active': self._active_weight,
+            'max_concurrent': self.max_concurrent,
+            'queued': self.queue_depth,
+            'clients': {
+                client: {
+                    'active': self._active_calls.get(client, 0),
+                    'queued': len(self._queues.get(client, ())),
+                }
+                for client in set(self._active_calls) | set(self._queues)
+            },
+        }
+
+    def _prune(self):
+        """Drops cancelled waiters and clients with nothing queued."""
+        for client in list(self._order):
+            queue = self._queues[client]
+            while queue and queue[0][0].done():
+                queue.popleft()
+            if not queue:
+                self._order.remove(client)
+                del self._queues[client]
+
+    def _next_client(self) -> str | None:
+        """Next client in round-robin order that is below its own limit."""
+        for _ in range(len(self._order)):
+            client = self._order[0]
+            self._order.rotate(-1)
+            if self._active_calls.get(client, 0) < self.max_per_client:
+                return client
+        return None
+
+    def _dispatch(self):
+        """Admits queued calls, round-robin across clients, while capacity allows."""
+        while True:
+            self._prune()
+            client = self._next_client()
+            if client is None:
+                return
+            queue = self._queues[client]
+            future, weight = queue[0]
+            if self._active_weight + weight > self.max_concurrent:
+                self._order.rotate(1)  # keep this client first in line
+                return
+            queue.popleft()
+            self._active_weight += weight
+            self._active_calls[client] += 1
+            future.set_result(None)
+
+    def _release(self, client: str, weight: int):
+        self._active_weight -= weight
+        self._active_calls[client] -= 1
+        if not self._active_calls[client]:
+            del self._active_calls[client]
+        self._dispatch()
+
+    async def _admit(self, client: str, weight: int):
+        future = asyncio.get_running_loop().create_future()
+        if client not in self._queues:
+            self._queues[client] = deque()
+            self._order.append(client)
+        self._queues[client].append((future, weight))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted right as we were cancelled: hand the slot back
+                self._release(client, weight)
+            else:
+                future.cancel()
+                self._dispatch()
+            raise
+
+    async def run(self, client: str, func, deadline: float | None = None, weight: int = 1):
+        """
+        Runs ``func()`` once admitted and returns ``(result, stats)``.
+
+        Args:
+            client:   Identifies the caller for per-client limits and fairness.
+            func:     Zero-argument callable returning the coroutine to run.
+            deadline: Seconds allowed for queueing plus execution
+                      (default: ``default_deadline``).
+            weight:   Slots the call occupies (default: 1).
+
+        Raises:
+            TimeoutError: If the deadline passes; the call is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        weight = max(1, min(weight, self.max_concurrent))
+        deadline = deadline or self.default_deadline
+        stats = {'queue_depth': self.queue_depth, 'active_at_arrival': self._active_weight}
+        queued_at = loop.time()
+
+        async def admitted():
+            await self._admit(client, weight)
+            stats['queued_ms'] = round((loop.time() - queued_at) * 1000, 1)
+            started_at = loop.time()
+            try:
+                return await func()
+            finally:
+                stats['run_ms'] = round((loop.time() - started_at) * 1000, 1)
+                self._release(client, weight)
+
+        try:
+            result = await asyncio.wait_for(admitted(), timeout=deadline)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f'Call exceeded its {deadline}s deadline') from None
+        return result, stats
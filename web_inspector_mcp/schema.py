@@ -0,0 +1,194 @@
+import random
+
+# Array elements examined per array; longer arrays are sampled
+DEFAULT_SAMPLE_SIZE = 100
+# Distinct keys tracked per object; further keys are only counted
+DEFAULT_MAX_PROPERTIES = 200
+
+
+def json_type(value) -> str:
+    """The JSON type name of a parsed value."""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'integer'
+    if isinstance(value, float):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list):
+        return 'array'
+    if isinstance(value, dict):
+        return 'object'
+    return type(value).__name__
+
+
+class SchemaNode:
+    """
+    Schema merged from every value observed at one position of a JSON
+    document: the types seen there (with counts), the union of object
+    properties and the merged schema of array items.
+
+    Values are walked with an explicit stack, so deeply nested payloads
+    don't hit the recursion limit. Arrays longer than ``sample_size`` are
+    represented by a uniform random sample of that many elements, and
+    objects track at most ``max_properties`` keys, which keeps the work
+    per document linear and the tree bounded in size.
+
+    Args:
+        sample_size:    Elements examined per array (default: 100).
+        max_properties: Keys tracked per object (default: 200).
+        max_depth:      Nesting depth to descend to (default: unlimited).
+        seed:           Seed for array sampling, so results are repeatable.
+    """
+
+    __slots__ = (
+        'count', 'types', 'properties', 'extra_keys', 'items',
+        'min_length', 'max_length', 'elements', 'sampled', '_options',
+    )
+
+    def __init__(
+        self,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        max_properties: int = DEFAULT_MAX_PROPERTIES,
+        max_depth: int | None = None,
+        seed: int = 0,
+        _options=None,
+    ):
+        self.count = 0
+        self.types: dict[str, int] = {}
+        self.properties: dict[str, SchemaNode] = {}
+        self.extra_keys = 0
+        self.items: SchemaNode | None = None
+        self.min_length: int | None = None
+        self.max_length = 0
+        self.elements = 0
+        self.sampled = 0
+        # Shared by the whole tree: (sample_size, max_properties, max_depth, rng)
+        self._options = _options or (sample_size, max_properties, max_depth, random.Random(seed))
+
+    @classmethod
+    def from_value(cls, value, **options) -> 'SchemaNode':
+        node = cls(**options)
+        node.observe(value)
+        return node
+
+    def _child(self) -> 'SchemaNode':
+        return SchemaNode(_options=self._options)
+
+    def observe(self, value):
+        """Merges one JSON value into the schema."""
+        sample_size, max_properties, max_depth, rng = self._options
+        stack = [(self, value, 0)]
+        while stack:
+            node, value, depth = stack.pop()
+            kind = json_type(value)
+            node.count += 1
+            node.types[kind] = node.types.get(kind, 0) + 1
+            if max_depth is not None and depth >= max_depth:
+                continue
+
+            if kind == 'object':
+                properties = node.properties
+                pending = []
+                for key, child_value in value.items():
+                    child = properties.get(key)
+                    if child is None:
+                        if len(properties) >= max_properties:
+                            node.extra_keys += 1
+                            continue
+                        child = properties[key] = node._child()
+                    pending.append((child, child_value, depth + 1))
+                # Reversed so properties are visited in document order
+                stack.extend(reversed(pending))
+
+            elif kind == 'array':
+                length = len(value)
+                node.min_length = length if node.min_length is None else min(node.min_length, length)
+                node.max_length = max(node.max_length, length)
+                node.elements += length
+                if not length:
+                    continue
+                if node.items is None:
+                    node.items = node._child()
+                if length > sample_size:
+                    value = [value[i] for i in sorted(rng.sample(range(length), sample_size))]
+                node.sampled += len(value)
+                stack.extend((node.items, item, depth + 1) for item in reversed(value))
+
+    def merge(self, other: 'SchemaNode'):
+        """Folds another schema, e.g. one inferred in a worker process, into this one."""
+        max_properties = self._options[1]
+        stack = [(self, other)]
+        while stack:
+            node, source = stack.pop()
+            node.count += source.count
+            for kind, count in source.types.items():
+                node.types[kind] = node.types.get(kind, 0) + count
+            node.extra_keys += source.extra_keys
+            if source.min_length is not None:
+                node.min_length = source.min_length if node.min_length is None else min(node.min_length, source.min_length)
+            node.max_length = max(node.max_length, source.max_length)
+            node.elements += source.elements
+            node.sampled += source.sampled
+
+            for key, child in source.properties.items():
+                target = node.properties.get(key)
+                if target is None:
+                    if len(node.properties) >= max_properties:
+                        node.extra_keys += child.count
+                        continue
+                    target = node.properties[key] = node._child()
+                stack.append((target, child))
+            if source.items is not None:
+                if node.items is None:
+                    node.items = node._child()
+                stack.append((node.items, source.items))
+
+    def _describe(self) -> dict:
+        non_null = [t for t in self.types if t != 'null']
+        out = {}
+        if not non_null:
+            out['type'] = 'null'
+        elif len(non_null) == 1:
+            out['type'] = non_null[0]
+        else:
+            out['type'] = non_null
+            out['type_counts'] = {t: self.types[t] for t in non_null}
+        if non_null and 'null' in self.types:
+            out['nullable'] = True
+        out['count'] = self.count
+        if 'array' in self.types:
+            out['min_length'] = self.min_length
+            out['max_length'] = self.max_length
+            if self.sampled < self.elements:
+                out['sampled'] = self.sampled
+        if self.extra_keys:
+            out['untracked_keys'] = self.extra_keys
+        return out
+
+    def to_dict(self) -> dict:
+        """
+        The merged schema. Properties missing from some of the objects seen
+        are marked ``optional``, positions that were sometimes ``null`` are
+        ``nullable``, and mixed types are listed with their counts.
+        """
+        root = {}
+        stack = [(self, root)]
+        while stack:
+            node, out = stack.pop()
+            out.update(node._describe())
+            objects = node.types.get('object', 0)
+            if node.properties:
+                properties = out['properties'] = {}
+                for key, child in node.properties.items():
+                    child_out = properties[key] = {}
+                    if child.count < objects:
+                        child_out['optional'] = True
+                    stack.append((child, child_out))
+            if node.items is not None:
+                items = out['items'] = {}
+                stack.append((node.items, items))
+        return root
@@ -1,19 +1,126 @@
-from mcp.server.fastmcp import FastMCP
+import os
+from contextlib import asynccontextmanager
 
+from mcp.server.fastmcp import Context, FastMCP
+
+from web_inspector_mcp import offload
+from web_inspector_mcp.browser_session import browser_pool, get_pool
+from web_inspector_mcp.capture_cache import capture_cache
+from web_inspector_mcp.result_store import result_store
+from web_inspector_mcp.scheduler import Scheduler
+from web_inspector_mcp.tools.analyze_page import analyze_page
+from web_inspector_mcp.tools.batch_capture import batch_capture
 from web_inspector_mcp.tools.capture_network import capture_network
+from web_inspector_mcp.tools.crawl_site import crawl_site
 from web_inspector_mcp.tools.discover_endpoints import discover_endpoints
+from web_inspector_mcp.tools.export_har import export_har
 from web_inspector_mcp.tools.extract_api_schema import extract_api_schema
 from web_inspector_mcp.tools.intercept_api import intercept_api
 from web_inspector_mcp.tools.measure_performance import measure_performance
 
-mcp = FastMCP("web-inspector")
+
+def _pool_size() -> int:
+    return int(os.environ.get('WEB_INSPECTOR_POOL_SIZE', '2'))
+
+
+@asynccontextmanager
+async def lifespan(server):
+    """
+    Keeps a pool of warm Chrome processes for the lifetime of the server.
+
+    ``WEB_INSPECTOR_POOL_SIZE`` sets how many browsers stay warm (0 disables
+    pooling) and ``WEB_INSPECTOR_POOL_MAX_USES`` how many calls a browser
+    serves before it is recycled. Worker processes started for large
+    response bodies are stopped on the way out.
+    """
+    size = _pool_size()
+    try:
+        if size <= 0:
+            yield {}
+            return
+        max_uses = int(os.environ.get('WEB_INSPECTOR_POOL_MAX_USES', '50'))
+        async with browser_pool(size=size, max_uses=max_uses):
+            yield {}
+    finally:
+        offload.shutdown()
+
+
+mcp = FastMCP("web-inspector", lifespan=lifespan)
+
+
+def _max_concurrent() -> int:
+    """
+    ``WEB_INSPECTOR_MAX_CONCURRENT``, or the pool size: each admitted call
+    leases a pooled browser, so admitting more calls than there are
+    browsers would only move the queue into the pool, out of the
+    scheduler's fair ordering. Without a pool every call launches its own.
+    """
+    if 'WEB_INSPECTOR_MAX_CONCURRENT' in os.environ:
+        return int(os.environ['WEB_INSPECTOR_MAX_CONCURRENT'])
+    size = _pool_size()
+    return size if size > 0 else 4
+
+
+scheduler = Scheduler(
+    max_concurrent=_max_concurrent(),
+    max_per_client=int(os.environ.get('WEB_INSPECTOR_MAX_PER_CLIENT', '2')),
+    default_deadline=float(os.environ.get('WEB_INSPECTOR_DEADLINE', '120')),
+)
+
+
+def _client_id(ctx: Context | None) -> str:
+    """Identifies the calling MCP client for per-client scheduling."""
+    if ctx is None:
+        return 'default'
+    try:
+        return ctx.client_id or f'session-{id(ctx.session)}'
+    except ValueError:
+        return 'default'
+
+
+def _progress(ctx: Context | None):
+    """
+    Progress callback for streamed captures, or ``None`` when the client
+    didn't ask for progress (so the tool captures without streaming).
+    """
+    if ctx is None:
+        return None
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:
+        return None
+    if meta is None or meta.progressToken is None:
+        return None
+
+    async def report(count: int, summary: str):
+        await ctx.report_progress(count, None, summary)
+
+    return report
+
+
+async def _scheduled(ctx: Context | None, deadline: float | None, func):
+    """Runs browser work through the scheduler and reports how it was queued."""
+    result, stats = await scheduler.run(_client_id(ctx), func, deadline)
+    return {**result, 'scheduler': stats}
+
 
 # ──────────────────────────────────────────────
 # Network Intelligence
 # ──────────────────────────────────────────────
 
 @mcp.tool()
-async def network_capture(url: str, wait: int = 5):
+async def network_capture(
+    url: str,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    match: dict | None = None,
+    max_requests: int = 0,
+    page_size: int = 50,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
     """
     Opens a page and captures ALL network requests made during page load.
     Returns a summary with total request count, breakdown by resource type
@@ -21,75 +128,533 @@ async def network_capture(url: str, wait: int = 5):
 
     Use this to see everything a page loads: APIs, scripts, images, fonts, etc.
 
+    If the client sends a progress token, the capture is streamed and
+    partial results arrive as progress notifications while the page loads.
+
+    When there are more than ``page_size`` requests, only the first page is
+    returned inline along with a ``handle``; page through the rest with
+    fetch_results.
+
     Args:
-        url:  The full URL to load and monitor.
-        wait: Seconds to wait for network activity after page load (default: 5).
+        url:  The full URL to load and monitor, or a saved .har / .har.gz /
+              .ndjson capture to analyze offline.
+        wait: Upper bound, in seconds, on waiting for network activity after
+              page load (default: 5). The wait ends early once the network
+              is idle.
+        wait_until: 'networkidle0' (no requests in flight), 'networkidle2'
+                    (at most two in flight) or 'fixed' (always wait the full
+                    ``wait`` seconds). Default: 'networkidle0'.
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        fresh: Ignore cached captures of this page and reload it (default: False).
+        match: Request filter rules, any of 'include' / 'exclude' (URL globs),
+               'regex' / 'exclude_regex', 'methods', 'status' (codes or ranges
+               like '2xx'), 'resource_types' and 'content_types' (MIME globs).
+        max_requests: Stop loading once this many matching requests have been
+                      captured (default: 0, disabled).
+        page_size: Requests returned inline before the rest are kept behind a
+                   handle (default: 50).
+        deadline: Seconds allowed for queueing plus page load before the call
+                  is cancelled (default: server setting, 120).
     """
-    return await capture_network(url, wait)
+    result = await _scheduled(
+        ctx, deadline,
+        lambda: capture_network(
+            url, wait, wait_until, idle_ms, fresh, match, max_requests, _progress(ctx),
+        ),
+    )
+    return result_store.paginate(result, 'requests', page_size)
 
 
 @mcp.tool()
-async def api_interceptor(url: str, pattern: str = '*api*', wait: int = 5):
+async def api_interceptor(
+    url: str,
+    pattern: str = '*api*',
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    min_matches: int = 0,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    match: dict | None = None,
+    page_size: int = 20,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
     """
     Monitors network requests matching a URL pattern and returns their
     response bodies. Intercepts API calls the frontend makes and shows
     exactly what data they return.
 
+    When more than ``page_size`` requests match, only the first page is
+    returned inline along with a ``handle``; page through the rest with
+    fetch_results.
+
     Args:
-        url:     The page to load.
+        url:     The page to load, or a saved .har / .har.gz / .ndjson capture.
         pattern: Glob pattern to match against request URLs (default: '*api*').
                  Examples: '*api*', '*.json', '*graphql*', '*v1/*', '*search*'
-        wait:    Seconds to wait for network activity (default: 5).
+        wait:    Upper bound, in seconds, on waiting for network activity
+                 (default: 5). The wait ends early once the network is idle.
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        min_matches: Stop waiting as soon as this many requests matching
+                     ``pattern`` have loaded (default: 0, disabled).
+        fresh: Ignore cached captures of this page and reload it (default: False).
+        block: Requests to block before loading, e.g. ["image", "font", "media"].
+               Accepts resource types, the profiles 'static', 'analytics', 'ads'
+               and 'api' (all three), or URL patterns; blocked counts are
+               reported under "blocked".
+        match: Request filter rules, any of 'include' / 'exclude' (URL globs),
+               'regex' / 'exclude_regex', 'methods', 'status' (codes or ranges
+               like '2xx'), 'resource_types' and 'content_types' (MIME globs).
+        page_size: Matches returned inline before the rest are kept behind a
+                   handle (default: 20).
+        deadline: Seconds allowed for queueing plus page load before the call
+                  is cancelled (default: server setting, 120).
     """
-    return await intercept_api(url, pattern, wait)
+    result = await _scheduled(
+        ctx, deadline,
+        lambda: intercept_api(
+            url, pattern, wait, wait_until, idle_ms, min_matches, fresh, block, match,
+        ),
+    )
+    return result_store.paginate(result, 'results', page_size)
 
 
 @mcp.tool()
-async def endpoint_discovery(url: str, wait: int = 5):
+async def endpoint_discovery(
+    url: str,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    match: dict | None = None,
+    max_endpoints: int = 0,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
     """
     Discovers all API endpoints called by a page's frontend.
     Filters out static assets (images, CSS, JS, fonts) and returns only
     the dynamic requests (XHR/Fetch) — the actual API calls the app makes.
 
+    Paths are grouped into templates: /api/users/123 and /api/users/456
+    become one endpoint /api/users/{id}, with its request count, example
+    URLs and the query parameter names seen.
+
     Useful for reverse-engineering what APIs a SPA or web app consumes.
 
+    If the client sends a progress token, the capture is streamed and
+    partial results arrive as progress notifications while the page loads.
+
     Args:
-        url:  The page to load and analyze.
-        wait: Seconds to wait for network activity (default: 5).
+        url:  The page to load and analyze, or a saved .har / .har.gz /
+              .ndjson capture.
+        wait: Upper bound, in seconds, on waiting for network activity
+              (default: 5). The wait ends early once the network is idle.
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        fresh: Ignore cached captures of this page and reload it (default: False).
+        block: Requests to block before loading, e.g. ["image", "font", "media"].
+               Accepts resource types, the profiles 'static', 'analytics', 'ads'
+               and 'api' (all three), or URL patterns; blocked counts are
+               reported under "blocked".
+        match: Request filter rules, any of 'include' / 'exclude' (URL globs),
+               'regex' / 'exclude_regex', 'methods', 'status' (codes or ranges
+               like '2xx'), 'resource_types' and 'content_types' (MIME globs).
+        max_endpoints: Stop loading once this many distinct endpoints have been
+                       found (default: 0, disabled).
+        deadline: Seconds allowed for queueing plus page load before the call
+                  is cancelled (default: server setting, 120).
     """
-    return await discover_endpoints(url, wait)
+    return await _scheduled(
+        ctx, deadline,
+        lambda: discover_endpoints(
+            url, wait, wait_until, idle_ms, fresh, block, match, max_endpoints, _progress(ctx),
+        ),
+    )
 
 
 @mcp.tool()
-async def performance_metrics(url: str, wait: int = 5):
+async def performance_metrics(
+    url: str,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    replay: str | None = None,
+    replay_latency: str | float = 'recorded',
+    runs: int = 1,
+    cache: str = 'both',
+    vitals: bool = False,
+    throttle: list[str] | None = None,
+    coverage: bool = False,
+    audit: bool = False,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
     """
     Measures network performance for a page load.
-    Returns: TTFB, DOM content loaded time, total transfer size,
-    request count, status code distribution, and the top 10
-    slowest and largest resources.
+    Returns: Navigation Timing (TTFB, DNS, connect, TLS, DOM content
+    loaded, load), total transfer size, request count, status code
+    distribution, the top 10 slowest and largest resources, time per
+    HAR phase (blocked, dns, connect, ssl, send, wait, receive) for the
+    page and per origin, a request waterfall, the critical request
+    chain up to the load event, and per-origin connection usage
+    (HTTP/1.1 vs h2 vs h3, connections opened and reused, DNS/TCP/TLS
+    setup time, requests queued behind the HTTP/1.1 connection limit).
+
+    If the client sends a progress token, the capture is streamed and
+    partial results arrive as progress notifications while the page loads.
 
     Args:
-        url:  The page to load and measure.
-        wait: Seconds to wait for network activity (default: 5).
+        url:  The page to load and measure, or a saved .har / .har.gz /
+              .ndjson capture.
+        wait: Upper bound, in seconds, on waiting for network activity
+              (default: 5). The wait ends early once the network is idle.
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        fresh: Ignore cached captures of this page and reload it (default: False).
+        replay: A saved capture (e.g. from har_export) whose responses are
+                served to the browser instead of the network, so runs are
+                repeatable and offline. Requests it doesn't contain fail.
+        replay_latency: 'recorded' (default) delays each replayed response
+                        by its recorded time; a number is a fixed delay in ms.
+        runs: Load the page this many times per cache mode and report the
+              median, p75, p95, stddev and range of each metric, outliers
+              trimmed, instead of a single load (default: 1). Every run
+              reloads the page, so fresh, coverage, audit and saved
+              captures are rejected.
+        cache: With runs above 1: 'cold' (empty, disabled HTTP cache),
+               'warm' (cache primed by an extra load) or 'both' (default).
+        vitals: Also record a Chrome trace of the load and report Core Web
+                Vitals (FCP, LCP with its element, CLS, Total Blocking Time,
+                long tasks) and main-thread time per script (default: False).
+        throttle: Emulate slower conditions: one network profile ('slow-3g',
+                  'fast-3g', 'slow-4g', 'fast-4g'), a CPU slowdown
+                  ('cpu-2x', 'cpu-4x', ...) or 'mobile' (slow-4g + cpu-4x).
+                  Applies to every run and is recorded in the result.
+        coverage: Also report, per script and stylesheet, total, used and
+                  unused bytes and the unused share of its transfer size,
+                  biggest savings first (default: False; single runs only).
+        audit: Also audit the responses for fixes, ranked by bytes and ms
+               saved: uncompressed text (savings measured by compressing
+               the body), missing or short cache lifetimes, duplicate
+               downloads and heavy or legacy-format images (default: False;
+               single runs only, and progress isn't streamed).
+        deadline: Seconds allowed for queueing plus page load before the call
+                  is cancelled (default: server setting, 120).
     """
-    return await measure_performance(url, wait)
+    return await _scheduled(
+        ctx, deadline,
+        lambda: measure_performance(
+            url, wait, wait_until, idle_ms, fresh, _progress(ctx),
+            replay=replay, replay_latency=replay_latency, runs=runs, cache=cache,
+            vitals=vitals, throttle=throttle, coverage=coverage, audit=audit,
+        ),
+    )
 
 
 @mcp.tool()
-async def api_schema_extractor(url: str, pattern: str = '*api*', wait: int = 5):
+async def api_schema_extractor(
+    url: str,
+    pattern: str = '*api*',
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    min_matches: int = 0,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    match: dict | None = None,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
     """
     Captures API responses from a page load and reverse-engineers their
-    JSON schema — field names, data types, nesting structure.
+    JSON schema — field names, data types, nesting structure. Every array
+    element (a sample of long arrays) and every response to the same
+    endpoint is merged into one schema per endpoint, with optional and
+    nullable fields, mixed types and occurrence counts marked.
 
     Useful for documenting undocumented APIs by observing what the frontend
     actually receives.
 
     Args:
-        url:     The page to load and analyze.
+        url:     The page to load and analyze, or a saved .har / .har.gz /
+                 .ndjson capture.
         pattern: Glob pattern to filter API URLs (default: '*api*').
-        wait:    Seconds to wait for network activity (default: 5).
+        wait:    Upper bound, in seconds, on waiting for network activity
+                 (default: 5). The wait ends early once the network is idle.
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        min_matches: Stop waiting as soon as this many requests matching
+                     ``pattern`` have loaded (default: 0, disabled).
+        fresh: Ignore cached captures of this page and reload it (default: False).
+        block: Requests to block before loading, e.g. ["image", "font", "media"].
+               Accepts resource types, the profiles 'static', 'analytics', 'ads'
+               and 'api' (all three), or URL patterns; blocked counts are
+               reported under "blocked".
+        match: Request filter rules, any of 'include' / 'exclude' (URL globs),
+               'regex' / 'exclude_regex', 'methods', 'status' (codes or ranges
+               like '2xx'), 'resource_types' and 'content_types' (MIME globs).
+        deadline: Seconds allowed for queueing plus page load before the call
+                  is cancelled (default: server setting, 120).
+    """
+    return await _scheduled(
+        ctx, deadline,
+        lambda: extract_api_schema(
+            url, pattern, wait, wait_until, idle_ms, min_matches, fresh, block, match,
+        ),
+    )
+
+
+@mcp.tool()
+async def page_analysis(
+    url: str,
+    analyses: list[str] | None = None,
+    pattern: str = '*api*',
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
+    """
+    Loads a page ONCE and runs several analyses over that single capture.
+    Prefer this over calling network_capture, api_interceptor,
+    endpoint_discovery, performance_metrics and api_schema_extractor one
+    after another on the same URL — each of those reloads the page.
+
+    Args:
+        url:      The page to load and analyze, or a saved .har / .har.gz /
+                  .ndjson capture.
+        analyses: Any of 'network', 'intercept', 'endpoints', 'performance',
+                  'schema', 'audit', 'connections' (default: all of them).
+        pattern:  Glob pattern used by 'intercept' and 'schema' (default: '*api*').
+        wait:     Upper bound, in seconds, on waiting for network activity
+                  (default: 5). The wait ends early once the network is idle.
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        fresh: Ignore cached captures of this page and reload it (default: False).
+        deadline: Seconds allowed for queueing plus page load before the call
+                  is cancelled (default: server setting, 120).
+    """
+    return await _scheduled(
+        ctx, deadline,
+        lambda: analyze_page(url, analyses, pattern, wait, wait_until, idle_ms, fresh),
+    )
+
+
+@mcp.tool()
+async def batch_analysis(
+    urls: list[str],
+    analyses: list[str] | None = None,
+    pattern: str = '*api*',
+    concurrency: int = 4,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
+    """
+    Loads MANY pages concurrently (tabs of one shared browser) and runs the
+    selected analyses on each. Returns per-URL results plus an aggregate:
+    total requests, requests per domain and the list of failed URLs.
+    Progress is reported as each URL finishes.
+
+    Args:
+        urls:        The pages to load (saved captures work too).
+        analyses:    Any of 'network', 'intercept', 'endpoints', 'performance',
+                     'schema', 'audit', 'connections' (default: ['network']).
+        pattern:     Glob pattern used by 'intercept' and 'schema' (default: '*api*').
+        concurrency: Maximum number of pages loading at once, as tabs of the
+                     one browser the batch leases (default: 4). Echoed in
+                     the result.
+        wait:        Upper bound, in seconds, on waiting for network activity
+                     per page (default: 5).
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        fresh: Ignore cached captures and reload every page (default: False).
+        deadline: Seconds allowed for queueing plus page load before the call
+                  is cancelled (default: server setting, 120).
+    """
+    async def on_result(item, done, total):
+        if ctx is None:
+            return
+        status = f"{item['total_requests']} requests" if item['ok'] else item['error']
+        await ctx.report_progress(done, total, f"{item['url']}: {status}")
+
+    # A batch leases one browser, so it takes one scheduler slot; its
+    # tabs are bounded by its own concurrency
+    return await _scheduled(
+        ctx, deadline,
+        lambda: batch_capture(
+            urls, analyses, pattern, concurrency,
+            wait, wait_until, idle_ms, fresh,
+            on_result=on_result,
+        ),
+    )
+
+
+@mcp.tool()
+async def site_crawl(
+    url: str,
+    max_pages: int = 20,
+    max_depth: int = 2,
+    concurrency: int = 4,
+    stop_after: int = 5,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    match: dict | None = None,
+    page_size: int = 50,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
+    """
+    Crawls a site from ``url``, following same-origin links breadth-first,
+    and merges the API endpoints every visited page calls into one
+    inventory. Use this instead of endpoint_discovery when an app's APIs
+    live behind several routes. Progress is reported as each page finishes.
+
+    Args:
+        url:         The page to start from.
+        max_pages:   Maximum number of pages to load (default: 20).
+        max_depth:   Maximum number of links away from ``url`` (default: 2).
+        concurrency: Pages loading at once (default: 4).
+        stop_after:  Stop once this many pages in a row found no new
+                     endpoint (default: 5; 0 disables).
+        wait:        Upper bound, in seconds, on waiting for network activity
+                     per page (default: 5).
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        fresh: Ignore cached captures and reload every page (default: False).
+        block: Requests to block on every page, e.g. ["static"], as in
+               endpoint_discovery.
+        match: Request filter rules for the endpoints, as in endpoint_discovery.
+        page_size: Endpoints returned inline before the rest are kept behind a
+                   handle for fetch_results (default: 50).
+        deadline: Seconds allowed for queueing plus the crawl before the call
+                  is cancelled (default: server setting, 120).
+    """
+    async def on_page(page, done, total_endpoints):
+        if ctx is None:
+            return
+        status = f"{page['new_endpoints']} new endpoints" if page['ok'] else page['error']
+        await ctx.report_progress(done, max_pages, f"{page['url']}: {status} ({total_endpoints} total)")
+
+    # A crawl leases one browser, so it takes one scheduler slot; its
+    # tabs are bounded by its own concurrency
+    result = await _scheduled(
+        ctx, deadline,
+        lambda: crawl_site(
+            url, max_pages, max_depth, concurrency, stop_after,
+            wait, wait_until, idle_ms, fresh, block, match,
+            on_page=on_page,
+        ),
+    )
+    return result_store.paginate(result, 'endpoints', page_size)
+
+
+@mcp.tool()
+async def har_export(
+    url: str,
+    path: str,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    deadline: float | None = None,
+    ctx: Context | None = None,
+):
+    """
+    Captures a page (with response bodies) and saves it to disk. Every
+    analysis tool accepts the saved file in place of a URL, so the page can
+    be analyzed again later without reloading it.
+
+    Args:
+        url:  The page to load.
+        path: File to write: '.har' or '.har.gz' for HAR, '.ndjson' or
+              '.jsonl' (optionally '.gz') for one entry per line. Relative
+              to, and confined to, WEB_INSPECTOR_HAR_DIR (default:
+              ~/.web_inspector/captures).
+        wait: Upper bound, in seconds, on waiting for network activity
+              (default: 5). The wait ends early once the network is idle.
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms: Milliseconds of network quiet that count as idle (default: 500).
+        fresh: Ignore cached captures of this page and reload it (default: False).
+        block: Requests to block before loading, as in endpoint_discovery.
+        deadline: Seconds allowed for queueing plus page load before the call
+                  is cancelled (default: server setting, 120).
+    """
+    return await _scheduled(
+        ctx, deadline,
+        lambda: export_har(url, path, wait, wait_until, idle_ms, fresh, block),
+    )
+
+
+@mcp.tool()
+async def fetch_results(
+    handle: str,
+    offset: int = 0,
+    limit: int = 50,
+    fields: list[str] | None = None,
+):
+    """
+    Pages through a result too large to return in one go. network_capture,
+    api_interceptor and site_crawl return a ``handle`` and ``total_rows``
+    when their output exceeds ``page_size``; pass that handle here to read
+    the rest.
+    Handles expire after 10 minutes (``WEB_INSPECTOR_RESULT_TTL``).
+
+    Args:
+        handle: The handle returned by the tool.
+        offset: Index of the first row to return (default: 0).
+        limit:  Maximum number of rows to return (default: 50).
+        fields: Only return these keys of each row, e.g. ["url", "status"];
+                dotted names such as "response.body" reach into nested
+                objects (default: all fields).
+    """
+    return result_store.page(handle, offset, limit, fields)
+
+
+@mcp.tool()
+async def cache_stats(clear: bool = False):
+    """
+    Reports the page-capture cache: stored entries, bytes used, hit/miss
+    counters and hit rate. Results of the tools above are served from this
+    cache when the same URL is analyzed again with the same options (their
+    ``from_cache`` field says so); pass ``fresh=True`` to a tool to bypass it.
+
+    Args:
+        clear: Drop every cached capture after reporting (default: False).
+    """
+    stats = capture_cache.stats()
+    if clear:
+        capture_cache.clear()
+    return stats
+
+
+@mcp.tool()
+async def server_status():
+    """
+    Reports what the server is doing: scheduler load (calls running and
+    queued, per client), the browser pool (size, idle browsers) and the
+    page-capture cache. Useful to see why a call is waiting.
     """
-    return await extract_api_schema(url, pattern, wait)
+    pool = get_pool()
+    return {
+        'scheduler': scheduler.stats(),
+        'pool': pool.stats() if pool is not None else None,
+        'cache': capture_cache.stats(),
+    }
 
 
 def main():
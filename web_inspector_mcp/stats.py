@@ -0,0 +1,57 @@
+import math
+import statistics
+
+# Tukey's fences: values further than this many IQRs outside the
+# quartiles are outliers
+IQR_FENCE = 1.5
+# Fewer samples than this are too few to call any of them an outlier
+MIN_TRIM_SAMPLES = 4
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """
+    The ``q``-th percentile (0-100) of an already sorted, non-empty list,
+    interpolating linearly between the closest ranks.
+    """
+    position = (len(ordered) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def trim_outliers(values: list[float]) -> tuple[list[float], list[float]]:
+    """
+    Splits ``values`` into ``(kept, outliers)`` with Tukey's fences. Both
+    lists are sorted; samples smaller than :data:`MIN_TRIM_SAMPLES` are
+    kept whole.
+    """
+    ordered = sorted(values)
+    if len(ordered) < MIN_TRIM_SAMPLES:
+        return ordered, []
+    q1, q3 = percentile(ordered, 25), percentile(ordered, 75)
+    fence = (q3 - q1) * IQR_FENCE
+    low, high = q1 - fence, q3 + fence
+    kept = [v for v in ordered if low <= v <= high]
+    return kept, [v for v in ordered if v < low or v > high]
+
+
+def summarize(values: list[float], trim: bool = True, digits: int = 1) -> dict:
+    """
+    Median, p75, p95, mean, standard deviation and range of repeated
+    measurements, after dropping outliers when ``trim`` is set (see
+    :func:`trim_outliers`). ``outliers`` lists what was dropped.
+    """
+    kept, outliers = trim_outliers(values) if trim else (sorted(values), [])
+    if not kept:
+        return {'n': 0}
+    return {
+        'n': len(kept),
+        'median': round(percentile(kept, 50), digits),
+        'p75': round(percentile(kept, 75), digits),
+        'p95': round(percentile(kept, 95), digits),
+        'mean': round(statistics.fmean(kept), digits),
+        'stddev': round(statistics.stdev(kept), digits) if len(kept) > 1 else 0.0,
+        'min': round(kept[0], digits),
+        'max': round(kept[-1], digits),
+        'outliers': [round(v, digits) for v in outliers],
+    }
@@ -0,0 +1,124 @@
+import contextlib
+import re
+from dataclasses import dataclass
+
+from pydoll.commands import NetworkCommands
+from pydoll.protocol.base import Command
+
+# network profile -> round-trip latency (ms) and throughput (kbit/s),
+# matching the Chrome DevTools and Lighthouse presets
+NETWORK_PROFILES = {
+    'slow-3g': {'latency_ms': 2000, 'download_kbps': 400, 'upload_kbps': 400},
+    'fast-3g': {'latency_ms': 562.5, 'download_kbps': 1440, 'upload_kbps': 675},
+    'slow-4g': {'latency_ms': 150, 'download_kbps': 1600, 'upload_kbps': 750},
+    'fast-4g': {'latency_ms': 165, 'download_kbps': 8100, 'upload_kbps': 1350},
+}
+# profile name -> profiles it combines
+PROFILES = {
+    # Lighthouse's default mobile conditions
+    'mobile': ['slow-4g', 'cpu-4x'],
+}
+# 'cpu-4x' slows the CPU down four times; any factor from 1 to 20 works
+_CPU = re.compile(r'cpu-(\d+(?:\.\d+)?)x')
+MAX_CPU_RATE = 20
+
+
+@dataclass(frozen=True)
+class Throttling:
+    """Resolved network and CPU conditions for a page load."""
+
+    names: tuple[str, ...] = ()
+    network: str | None = None
+    cpu_rate: float = 1
+
+    def __bool__(self) -> bool:
+        return self.network is not None or self.cpu_rate != 1
+
+    def describe(self) -> dict:
+        out = {'profiles': list(self.names), 'cpu_slowdown': self.cpu_rate}
+        if self.network is not None:
+            out['network'] = {'name': self.network, **NETWORK_PROFILES[self.network]}
+        return out
+
+
+def resolve_throttle(throttle: list[str] | str | None) -> Throttling:
+    """
+    Combines profile names into one :class:`Throttling`: at most one
+    network profile (see ``NETWORK_PROFILES``), a CPU slowdown such as
+    ``'cpu-4x'``, or a preset of both (see ``PROFILES``).
+
+    Raises:
+        ValueError: For an unknown name, a CPU factor outside 1-20, or two
+                    different network profiles.
+    """
+    if isinstance(throttle, str):
+        throttle = [throttle]
+    names = tuple(dict.fromkeys(name.lower() for name in throttle or []))
+    network, cpu_rate = None, 1.0
+    pending = list(names)
+    while pending:
+        name = pending.pop(0)
+        cpu = _CPU.fullmatch(name)
+        if name in PROFILES:
+            pending.extend(PROFILES[name])
+        elif cpu:
+            rate = float(cpu.group(1))
+            if not 1 <= rate <= MAX_CPU_RATE:
+                raise ValueError(f'CPU slowdown must be between 1x and {MAX_CPU_RATE}x, not {name!r}')
+            cpu_rate = max(cpu_rate, rate)
+        elif name in NETWORK_PROFILES:
+            if network not in (None, name):
+                raise ValueError(f'Only one network profile can apply; got {network!r} and {name!r}')
+            network = name
+        else:
+            raise ValueError(
+                f'Unknown throttle profile {name!r}; expected cpu-<N>x or one of '
+                f'{sorted([*NETWORK_PROFILES, *PROFILES])}'
+            )
+    return Throttling(names, network, int(cpu_rate) if cpu_rate.is_integer() else cpu_rate)
+
+
+def _kbps(value: float) -> float:
+    """kbit/s as the bytes per second CDP expects."""
+    return value * 1024 / 8
+
+
+class Throttler:
+    """
+    Applies a :class:`Throttling` to a tab for the duration of the block:
+    network conditions through ``Network.emulateNetworkConditions`` and CPU
+    slowdown through ``Emulation.setCPUThrottlingRate``. Both are reset on
+    exit. Enter it after the Network domain is enabled.
+    """
+
+    def __init__(self, tab, throttling: Throttling):
+        self._tab = tab
+        self.throttling = throttling
+
+    async def __aenter__(self):
+        if self.throttling.network is not None:
+            profile = NETWORK_PROFILES[self.throttling.network]
+            await self._tab._execute_command(NetworkCommands.emulate_network_conditions(
+                offline=False,
+                latency=profile['latency_ms'],
+                download_throughput=_kbps(profile['download_kbps']),
+                upload_throughput=_kbps(profile['upload_kbps']),
+            ))
+        if self.throttling.cpu_rate != 1:
+            await self._tab._execute_command(Command(
+                method='Emulation.setCPUThrottlingRate',
+                params={'rate': self.throttling.cpu_rate},
+            ))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.throttling.network is not None:
+            with contextlib.suppress(Exception):
+                await self._tab._execute_command(NetworkCommands.emulate_network_conditions(
+                    offline=False, latency=0, download_throughput=-1, upload_throughput=-1,
+                ))
+        if self.throttling.cpu_rate != 1:
+            with contextlib.suppress(Exception):
+                await self._tab._execute_command(Command(
+                    method='Emulation.setCPUThrottlingRate', params={'rate': 1},
+                ))
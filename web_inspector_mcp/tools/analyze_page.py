@@ -0,0 +1,78 @@
+import asyncio
+import inspect
+
+from web_inspector_mcp.audit import audit_capture
+from web_inspector_mcp.capture import capture_page
+from web_inspector_mcp.connections import connection_report
+from web_inspector_mcp.request_filter import RequestFilter
+from web_inspector_mcp.tools.capture_network import analyze_network
+from web_inspector_mcp.tools.discover_endpoints import analyze_endpoints
+from web_inspector_mcp.tools.extract_api_schema import analyze_api_schemas
+from web_inspector_mcp.tools.intercept_api import analyze_api_responses
+from web_inspector_mcp.tools.measure_performance import analyze_performance
+
+# analysis name -> function(capture, pattern) -> dict, or a coroutine for the
+# analyses that parse response bodies
+ANALYSES = {
+    'network': lambda capture, pattern: analyze_network(capture),
+    'intercept': analyze_api_responses,
+    'endpoints': lambda capture, pattern: analyze_endpoints(capture),
+    'performance': lambda capture, pattern: analyze_performance(capture),
+    'schema': analyze_api_schemas,
+    'audit': lambda capture, pattern: asyncio.to_thread(audit_capture, capture),
+    'connections': lambda capture, pattern: connection_report(capture.records),
+}
+
+
+async def run_analysis(name: str, capture, request_filter: RequestFilter) -> dict:
+    """Runs one entry of ``ANALYSES``, awaiting it if it is asynchronous."""
+    result = ANALYSES[name](capture, request_filter)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def analyze_page(
+    url: str,
+    analyses: list[str] | None = None,
+    pattern: str = '*api*',
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+) -> dict:
+    """
+    Loads a page once and runs several analyses over the same capture.
+
+    Args:
+        url:        The page to load and analyze.
+        analyses:   Which analyses to run: any of 'network', 'intercept',
+                    'endpoints', 'performance', 'schema', 'audit',
+                    'connections' (default: all).
+        pattern:    Glob pattern used by 'intercept' and 'schema' (default: '*api*').
+        wait:       Upper bound, in seconds, on waiting for network activity
+                    after page load (default: 5).
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:    Milliseconds of network quiet that end the wait (default: 500).
+        fresh:      Ignore cached captures and reload the page (default: False).
+    """
+    selected = list(analyses) if analyses else list(ANALYSES)
+    unknown = [name for name in selected if name not in ANALYSES]
+    if unknown:
+        raise ValueError(f'Unknown analyses {unknown}; expected any of {list(ANALYSES)}')
+    request_filter = RequestFilter.coerce(pattern)
+
+    capture = await capture_page(
+        url, wait, wait_until, idle_ms,
+        with_timing='performance' in selected, fresh=fresh,
+    )
+
+    result = {
+        'page_url': url,
+        'total_requests': len(capture.entries),
+        'analyses': selected,
+        'from_cache': capture.from_cache,
+    }
+    for name in selected:
+        result[name] = await run_analysis(name, capture, request_filter)
+    return result
@@ -0,0 +1,100 @@
+import asyncio
+from collections import Counter
+
+from web_inspector_mcp.browser_session import shared_browser
+from web_inspector_mcp.capture import capture_page
+from web_inspector_mcp.request_filter import RequestFilter
+from web_inspector_mcp.tools.analyze_page import ANALYSES, run_analysis
+
+
+async def batch_capture(
+    urls: list[str],
+    analyses: list[str] | None = None,
+    pattern: str = '*api*',
+    concurrency: int = 4,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    on_result=None,
+) -> dict:
+    """
+    Captures many pages concurrently in isolated tabs of one shared browser
+    and runs the selected analyses on each.
+
+    Args:
+        urls:        The pages to load.
+        analyses:    Analyses to run per page, as in ``analyze_page``
+                     (default: ['network']).
+        pattern:     Glob pattern used by 'intercept' and 'schema' (default: '*api*').
+        concurrency: Maximum number of pages loading at once (default: 4).
+        wait:        Upper bound, in seconds, on waiting for network activity
+                     after each page load (default: 5).
+        wait_until:  'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:     Milliseconds of network quiet that end the wait (default: 500).
+        fresh:       Ignore cached captures and reload every page (default: False).
+        on_result:   Optional ``async (item, done, total)`` callback invoked as
+                     soon as each URL finishes, for streaming partial results.
+    """
+    selected = list(analyses) if analyses else ['network']
+    unknown = [name for name in selected if name not in ANALYSES]
+    if unknown:
+        raise ValueError(f'Unknown analyses {unknown}; expected any of {list(ANALYSES)}')
+    request_filter = RequestFilter.coerce(pattern)
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: list[dict | None] = [None] * len(urls)
+    domain_counts = Counter()
+    total_requests = 0
+    done = 0
+
+    async with shared_browser() as browser:
+
+        async def run(index: int, url: str):
+            nonlocal total_requests, done
+            async with semaphore:
+                # A failed capture or analysis is this URL's error, not the batch's
+                try:
+                    capture = await capture_page(
+                        url, wait, wait_until, idle_ms,
+                        with_timing='performance' in selected,
+                        fresh=fresh,
+                        browser=browser,
+                    )
+                    item = {
+                        'url': url,
+                        'ok': True,
+                        'from_cache': capture.from_cache,
+                        'total_requests': len(capture.entries),
+                    }
+                    for name in selected:
+                        item[name] = await run_analysis(name, capture, request_filter)
+                except Exception as e:
+                    item = {'url': url, 'ok': False, 'error': f'{type(e).__name__}: {e}'}
+                else:
+                    total_requests += len(capture.entries)
+                    for record in capture.records:
+                        if record.domain:
+                            domain_counts[record.domain] += 1
+
+            results[index] = item
+            done += 1
+            if on_result is not None:
+                await on_result(item, done, len(urls))
+
+        await asyncio.gather(*(run(i, url) for i, url in enumerate(urls)))
+
+    failures = [{'url': r['url'], 'error': r['error']} for r in results if not r['ok']]
+    return {
+        'total_urls': len(urls),
+        'succeeded': len(urls) - len(failures),
+        'failed': len(failures),
+        'analyses': selected,
+        'concurrency': concurrency,
+        'total_requests': total_requests,
+        'by_domain': dict(domain_counts.most_common()),
+        'failures': failures,
+        'results': results,
+    }
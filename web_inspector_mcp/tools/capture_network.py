@@ -1,11 +1,79 @@
-import asyncio
 from collections import Counter
-from urllib.parse import urlparse
 
-from web_inspector_mcp.browser_session import browser_session
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.pipeline import aggregate_page
+from web_inspector_mcp.records import RequestRecord
+from web_inspector_mcp.request_filter import RequestFilter
 
 
-async def capture_network(url: str, wait: int = 5) -> dict:
+class NetworkAggregator:
+    """
+    Builds the ``network_capture`` summary one request at a time, so it can
+    be updated while the page is still loading.
+    """
+
+    def __init__(self, request_filter: RequestFilter | None = None):
+        self.request_filter = request_filter
+        self.records: list[RequestRecord] = []
+        self.type_counts = Counter()
+        self.domain_counts = Counter()
+
+    def add(self, entry: dict):
+        self.add_record(RequestRecord.from_entry(entry))
+
+    def add_record(self, record: RequestRecord):
+        if self.request_filter is not None and not self.request_filter.matches_record(record):
+            return
+        self.records.append(record)
+        self.type_counts[record.resource_type or 'Other'] += 1
+        if record.domain:
+            self.domain_counts[record.domain] += 1
+
+    def summary(self) -> str:
+        return f'{len(self.records)} requests from {len(self.domain_counts)} domains'
+
+    def result(self, page_url: str) -> dict:
+        return {
+            'page_url': page_url,
+            'total_requests': len(self.records),
+            'by_type': dict(self.type_counts),
+            'by_domain': dict(self.domain_counts),
+            'requests': [
+                {
+                    'method': r.method,
+                    'url': r.url,
+                    'status': r.status,
+                    'type': r.resource_type or 'Other',
+                    'timestamp': r.started,
+                    'size': r.body_size,
+                }
+                for r in self.records
+            ],
+        }
+
+
+def analyze_network(capture: PageCapture, request_filter: RequestFilter | None = None) -> dict:
+    """
+    Summarizes every request in a capture (or those ``request_filter``
+    keeps): total count, breakdown by resource type and domain, and the
+    full list of requests.
+    """
+    aggregator = NetworkAggregator(request_filter)
+    for record in capture.records:
+        aggregator.add_record(record)
+    return aggregator.result(capture.url)
+
+
+async def capture_network(
+    url: str,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    match: dict | None = None,
+    max_requests: int = 0,
+    on_progress=None,
+) -> dict:
     """
     Opens a page and captures ALL network requests made during page load.
 
@@ -13,51 +81,33 @@ async def capture_network(url: str, wait: int = 5) -> dict:
     and the full list of captured requests.
 
     Args:
-        url:  The full URL to load and monitor.
-        wait: Seconds to wait for network activity after page load (default: 5).
+        url:        The full URL to load and monitor.
+        wait:       Upper bound, in seconds, on waiting for network activity
+                    after page load (default: 5).
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:    Milliseconds of network quiet that end the wait (default: 500).
+        fresh:      Ignore cached captures and reload the page (default: False).
+        match:      Request filter rules, any of 'include', 'exclude', 'regex',
+                    'exclude_regex', 'methods', 'status' (e.g. '2xx'),
+                    'resource_types', 'content_types' (default: none).
+        max_requests: Stop loading once this many matching requests have been
+                      captured (default: 0, disabled).
+        on_progress: Optional ``async (count, summary)`` callback; when set the
+                     capture is streamed and reports partial results.
     """
-    async with browser_session() as tab:
-        # Use HAR recording to capture all network activity
-        async with tab.request.record() as capture:
-            await tab.go_to(url)
-            await asyncio.sleep(wait)
-
-        # Process captured entries
-        requests = []
-        type_counts = Counter()
-        domain_counts = Counter()
-
-        for entry in capture.entries:
-            req = entry['request']
-            resp = entry['response']
-
-            # Extract request info
-            request_info = {
-                'method': req['method'],
-                'url': req['url'],
-                'status': resp['status'],
-                'type': entry.get('_resourceType', 'Other'),
-                'timestamp': entry['startedDateTime'],
-                'size': resp.get('bodySize', 0),
-            }
-            requests.append(request_info)
-
-            # Count by type
-            resource_type = entry.get('_resourceType', 'Other')
-            type_counts[resource_type] += 1
-
-            # Count by domain
-            try:
-                domain = urlparse(req['url']).netloc
-                if domain:
-                    domain_counts[domain] += 1
-            except Exception:
-                pass
+    request_filter = RequestFilter.from_spec(match) if match else None
+    aggregator = NetworkAggregator(request_filter)
+    stop_when = None
+    if max_requests > 0:
+        def stop_when(agg: NetworkAggregator) -> bool:
+            return len(agg.records) >= max_requests
 
-        return {
-            'page_url': url,
-            'total_requests': len(requests),
-            'by_type': dict(type_counts),
-            'by_domain': dict(domain_counts),
-            'requests': requests,
-        }
+    capture = await aggregate_page(
+        url, aggregator, on_progress, stop_when,
+        wait=wait, wait_until=wait_until, idle_ms=idle_ms, with_timing=False, fresh=fresh,
+    )
+    return {
+        **aggregator.result(capture.url),
+        'from_cache': capture.from_cache,
+        'settled_by': capture.settled_by,
+    }
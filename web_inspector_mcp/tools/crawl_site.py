@@ -0,0 +1,202 @@
+import asyncio
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from web_inspector_mcp.browser_session import shared_browser
+from web_inspector_mcp.capture import capture_page
+from web_inspector_mcp.capture_cache import normalize_url as normalize_cache_url
+from web_inspector_mcp.request_filter import RequestFilter
+from web_inspector_mcp.tools.discover_endpoints import EndpointAggregator
+
+# Links to files rather than pages; not worth loading in a tab
+SKIP_EXTENSIONS = (
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.pdf', '.zip',
+    '.gz', '.mp3', '.mp4', '.webm', '.css', '.js', '.json', '.xml', '.txt',
+)
+
+
+def normalize_url(url: str, base: str | None = None) -> str | None:
+    """
+    Canonical form of a link for de-duplicating pages: resolved against
+    ``base``, ``utm_*`` parameters dropped, then normalized as cache keys
+    are (see :func:`~web_inspector_mcp.capture_cache.normalize_url`).
+    ``None`` for anything that isn't an http(s) URL.
+    """
+    if base is not None:
+        url = urljoin(base, url)
+    try:
+        parts = urlsplit(url.strip())
+        if parts.scheme.lower() not in ('http', 'https') or not parts.hostname:
+            return None
+        query = urlencode([
+            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith('utm_')
+        ])
+        return normalize_cache_url(urlunsplit((parts.scheme, parts.netloc, parts.path, query, '')))
+    except ValueError:
+        return None
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+async def crawl_site(
+    url: str,
+    max_pages: int = 20,
+    max_depth: int = 2,
+    concurrency: int = 4,
+    stop_after: int = 5,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    match: dict | None = None,
+    on_page=None,
+) -> dict:
+    """
+    Crawls a site breadth-first from ``url`` and merges the API endpoints
+    of every visited page into one inventory.
+
+    Pages are loaded in parallel tabs of one shared browser. Each page's
+    same-origin links are normalized (see :func:`normalize_url`) and
+    queued once, until ``max_pages`` pages have been visited, the queue
+    runs dry, or ``stop_after`` pages in a row found no new endpoint.
+    If the start page redirects to another origin, that origin is crawled
+    too; other pages that redirect off the site are reported with
+    ``redirected_to`` and their links are not followed. A page that fails
+    is reported with its ``error`` and the crawl goes on.
+
+    Args:
+        url:         The page to start from.
+        max_pages:   Maximum number of pages to load (default: 20).
+        max_depth:   Maximum link distance from ``url`` (default: 2).
+        concurrency: Pages loading at once (default: 4).
+        stop_after:  Stop once this many consecutive pages found no new
+                     endpoint (default: 5; 0 disables).
+        wait:        Upper bound, in seconds, on waiting for network activity
+                     per page (default: 5).
+        wait_until:  'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:     Milliseconds of network quiet that end the wait (default: 500).
+        fresh:       Ignore cached captures and reload every page (default: False).
+        block:       Resource types, profiles or URL patterns to block on
+                     every page (default: none).
+        match:       Request filter rules applied to the endpoints, as in
+                     ``discover_endpoints`` (default: none).
+        on_page:     Optional ``async (page, done, total_endpoints)`` callback
+                     invoked as each page finishes.
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+    start = normalize_url(url)
+    if start is None:
+        raise ValueError(f'Not an http(s) URL: {url!r}')
+    # The start page's origin, plus where it redirects to
+    origins = {_origin(start)}
+
+    aggregator = EndpointAggregator(RequestFilter.from_spec(match) if match else None)
+    queue: asyncio.Queue = asyncio.Queue()
+    queue.put_nowait((start, 0))
+    seen = {start}
+    pages: list[dict] = []
+    state = {'started': 0, 'stalled': 0, 'stopped_by': 'exhausted'}
+
+    def stopping() -> bool:
+        if stop_after > 0 and state['stalled'] >= stop_after:
+            state['stopped_by'] = 'no_new_endpoints'
+            return True
+        if state['started'] >= max_pages:
+            state['stopped_by'] = 'max_pages'
+            return True
+        return False
+
+    def links_of(capture, page_url: str, depth: int, page: dict) -> int:
+        """Queues the page's new same-origin links; returns how many."""
+        base = page_url
+        final = normalize_url(capture.final_url) if capture.final_url else None
+        if final is not None and final != page_url:
+            page['redirected_to'] = final
+            base = final
+            if _origin(final) not in origins:
+                if depth > 0:
+                    return 0  # left the site; its links aren't ours to follow
+                # The start page redirected (e.g. to https or www): crawl there
+                origins.add(_origin(final))
+        if depth >= max_depth:
+            return 0
+        queued = 0
+        for link in capture.links or []:
+            link = normalize_url(link, base)
+            if (
+                link is None or link in seen
+                or _origin(link) not in origins
+                or urlsplit(link).path.lower().endswith(SKIP_EXTENSIONS)
+            ):
+                continue
+            seen.add(link)
+            queue.put_nowait((link, depth + 1))
+            queued += 1
+        return queued
+
+    async def visit(browser, page_url: str, depth: int):
+        page = {'url': page_url, 'depth': depth}
+        # Anything going wrong with one page is that page's error; the
+        # worker carries on with the next one
+        try:
+            capture = await capture_page(
+                page_url, wait, wait_until, idle_ms,
+                with_timing=False, fresh=fresh, browser=browser,
+                bodies=False, block=block, with_links=True,
+            )
+            before = len(aggregator.templates)
+            for record in capture.records:
+                aggregator.add_record(record)
+            new_endpoints = len(aggregator.templates) - before
+            state['stalled'] = 0 if new_endpoints else state['stalled'] + 1
+            page.update({
+                'ok': True,
+                'requests': len(capture.entries),
+                'new_endpoints': new_endpoints,
+                'links_queued': links_of(capture, page_url, depth, page),
+                'from_cache': capture.from_cache,
+            })
+        except Exception as e:
+            page.update({'ok': False, 'error': f'{type(e).__name__}: {e}'})
+        pages.append(page)
+        if on_page is not None:
+            try:
+                await on_page(page, len(pages), len(aggregator.templates))
+            except Exception as e:
+                page['callback_error'] = f'{type(e).__name__}: {e}'
+
+    async with shared_browser() as browser:
+
+        async def worker():
+            while True:
+                page_url, depth = await queue.get()
+                try:
+                    if not stopping():
+                        state['started'] += 1
+                        await visit(browser, page_url, depth)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    result = aggregator.result(start)
+    return {
+        'start_url': start,
+        'pages_visited': len(pages),
+        'stopped_by': state['stopped_by'],
+        'total_endpoints': result['total_endpoints'],
+        'by_domain': result['by_domain'],
+        'pages': pages,
+        'endpoints': result['endpoints'],
+    }
@@ -1,77 +1,139 @@
-import asyncio
-from urllib.parse import urlparse
+from web_inspector_mcp.blocking import blocked_summary
+from web_inspector_mcp.capture import PageCapture
+from web_inspector_mcp.pipeline import aggregate_page
+from web_inspector_mcp.records import RequestRecord
+from web_inspector_mcp.request_filter import RequestFilter
+from web_inspector_mcp.url_templates import PathTemplates
 
-from web_inspector_mcp.browser_session import browser_session
+STATIC_TYPES = {'Image', 'Stylesheet', 'Font', 'Script', 'Media', 'Manifest'}
 
 
-async def discover_endpoints(url: str, wait: int = 5) -> dict:
+class EndpointAggregator:
+    """
+    Maps API endpoints one entry at a time, skipping static assets and the
+    document itself. URLs are clustered into path templates such as
+    ``/api/users/{id}`` (see :class:`~web_inspector_mcp.url_templates.PathTemplates`),
+    so requests for different records of one resource count as one endpoint.
     """
-    Discovers all API endpoints called by a page's frontend.
 
-    Filters out static assets (images, CSS, fonts, scripts) and returns
-    only XHR/Fetch requests — the actual API calls the app makes.
+    def __init__(self, request_filter: RequestFilter | None = None):
+        self.request_filter = request_filter
+        self.templates = PathTemplates()
 
-    Args:
-        url:  The page to load and analyze.
-        wait: Seconds to wait for network activity (default: 5).
-    """
-    STATIC_TYPES = {'Image', 'Stylesheet', 'Font', 'Script', 'Media', 'Manifest'}
-
-    async with browser_session() as tab:
-        async with tab.request.record() as capture:
-            await tab.go_to(url)
-            await asyncio.sleep(wait)
-
-        endpoints = {}
-
-        for entry in capture.entries:
-            req = entry['request']
-            req_url = req['url']
-            resource_type = entry.get('_resourceType', '')
-            method = req['method']
-
-            if not req_url or resource_type in STATIC_TYPES:
-                continue
-
-            # Skip the document itself
-            if resource_type == 'Document':
-                continue
-
-            # Build a unique key for deduplication
-            try:
-                parsed = urlparse(req_url)
-                # Remove query params for grouping
-                clean_url = f'{parsed.scheme}://{parsed.netloc}{parsed.path}'
-            except Exception:
-                clean_url = req_url
-
-            key = f'{method} {clean_url}'
-            if key not in endpoints:
-                endpoints[key] = {
-                    'method': method,
-                    'url': clean_url,
-                    'full_url': req_url,
-                    'type': resource_type,
-                    'domain': parsed.netloc if parsed else '?',
-                    'count': 0,
-                    'has_query_params': bool(parsed.query) if parsed else False,
-                    'has_post_data': 'postData' in req,
-                }
-            endpoints[key]['count'] += 1
-
-        endpoint_list = sorted(endpoints.values(), key=lambda e: e['count'], reverse=True)
+    def add(self, entry: dict):
+        self.add_record(RequestRecord.from_entry(entry))
+
+    def add_record(self, record: RequestRecord):
+        if self.request_filter is not None and not self.request_filter.matches_record(record):
+            return
+        # Skip static assets and the document itself
+        if not record.url or record.resource_type in STATIC_TYPES:
+            return
+        if record.resource_type == 'Document':
+            return
+        self.templates.add(
+            record.method, record.scheme, record.domain, record.path, record.url,
+            record.resource_type, record.has_post_data,
+        )
+
+    def summary(self) -> str:
+        return f'{len(self.templates)} endpoints across {len(self.templates.hosts)} domains'
+
+    def result(self, page_url: str) -> dict:
+        endpoint_list = [
+            {
+                'method': t['method'],
+                'url': t['template'],
+                'full_url': t['examples'][0],
+                'examples': t['examples'],
+                'type': t['type'],
+                'domain': t['domain'],
+                'count': t['count'],
+                'has_query_params': bool(t['query_keys']),
+                'query_keys': t['query_keys'],
+                'has_post_data': t['has_post_data'],
+            }
+            for t in self.templates.templates()
+        ]
 
         # Group by domain
         domains = {}
         for ep in endpoint_list:
-            d = ep['domain']
-            if d not in domains:
-                domains[d] = []
-            domains[d].append(ep)
+            domains[ep['domain']] = domains.get(ep['domain'], 0) + 1
 
         return {
-            'page_url': url,
+            'page_url': page_url,
             'total_endpoints': len(endpoint_list),
-            'by_domain': {d: len(eps) for d, eps in domains.items()},
+            'by_domain': domains,
             'endpoints': endpoint_list,
         }
+
+
+def analyze_endpoints(capture: PageCapture, request_filter: RequestFilter | None = None) -> dict:
+    """
+    Maps the API endpoints in a capture (see :class:`EndpointAggregator`).
+    Only requests kept by ``request_filter`` are considered, if given.
+    """
+    aggregator = EndpointAggregator(request_filter)
+    for record in capture.records:
+        aggregator.add_record(record)
+    return aggregator.result(capture.url)
+
+
+async def discover_endpoints(
+    url: str,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    match: dict | None = None,
+    max_endpoints: int = 0,
+    on_progress=None,
+) -> dict:
+    """
+    Discovers all API endpoints called by a page's frontend.
+
+    Filters out static assets (images, CSS, fonts, scripts) and returns
+    only XHR/Fetch requests — the actual API calls the app makes. Paths
+    are grouped into templates like ``/api/users/{id}`` with request counts,
+    example URLs and the query parameter names seen.
+
+    Args:
+        url:        The page to load and analyze.
+        wait:       Upper bound, in seconds, on waiting for network activity
+                    after page load (default: 5).
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:    Milliseconds of network quiet that end the wait (default: 500).
+        fresh:      Ignore cached captures and reload the page (default: False).
+        block:      Resource types ('image', 'font', 'media', ...), profiles
+                    ('static', 'analytics', 'ads', 'api') or URL patterns to
+                    block before loading the page (default: none).
+        match:      Request filter rules, any of 'include', 'exclude', 'regex',
+                    'exclude_regex', 'methods', 'status' (e.g. '2xx'),
+                    'resource_types', 'content_types' (default: none).
+        max_endpoints: Stop loading once this many distinct endpoints have
+                       been seen (default: 0, disabled).
+        on_progress: Optional ``async (count, summary)`` callback; when set the
+                     capture is streamed and reports partial results.
+    """
+    request_filter = RequestFilter.from_spec(match) if match else None
+    aggregator = EndpointAggregator(request_filter)
+    stop_when = None
+    if max_endpoints > 0:
+        def stop_when(agg: EndpointAggregator) -> bool:
+            return len(agg.templates) >= max_endpoints
+
+    capture = await aggregate_page(
+        url, aggregator, on_progress, stop_when,
+        wait=wait, wait_until=wait_until, idle_ms=idle_ms,
+        with_timing=False, fresh=fresh, block=block,
+    )
+    result = {
+        **aggregator.result(capture.url),
+        'from_cache': capture.from_cache,
+        'settled_by': capture.settled_by,
+    }
+    if block:
+        result['blocked'] = blocked_summary(capture.entries)
+    return result
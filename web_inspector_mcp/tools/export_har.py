@@ -0,0 +1,41 @@
+from web_inspector_mcp.capture import capture_page
+
+
+async def export_har(
+    url: str,
+    path: str,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    block: list[str] | None = None,
+) -> dict:
+    """
+    Captures a page and saves it to disk for offline analysis.
+
+    Every tool accepts the saved file in place of a URL, so the page can
+    be re-analyzed without loading it again (or without Chrome at all).
+
+    Args:
+        url:        The page to load.
+        path:       Where to write the capture: ``.har``, ``.har.gz``,
+                    ``.ndjson`` or ``.jsonl`` (optionally gzipped).
+        wait:       Upper bound, in seconds, on waiting for network activity
+                    after page load (default: 5).
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:    Milliseconds of network quiet that end the wait (default: 500).
+        fresh:      Ignore cached captures and reload the page (default: False).
+        block:      Resource types, profiles or URL patterns to block before
+                    loading the page (default: none).
+    """
+    capture = await capture_page(
+        url, wait, wait_until, idle_ms,
+        fresh=fresh, block=block, save_har=path,
+    )
+    return {
+        'page_url': capture.url,
+        'path': path,
+        'entries': len(capture.entries),
+        'from_cache': capture.from_cache,
+        'settled_by': capture.settled_by,
+    }
@@ -1,108 +1,170 @@
-import asyncio
-import json
-from urllib.parse import urlparse
-
-from web_inspector_mcp.browser_session import browser_session
-
-
-def _infer_type(value) -> str:
-    """Infer a simple type name from a JSON value."""
-    if value is None:
-        return 'null'
-    if isinstance(value, bool):
-        return 'boolean'
-    if isinstance(value, int):
-        return 'integer'
-    if isinstance(value, float):
-        return 'number'
-    if isinstance(value, str):
-        return 'string'
-    if isinstance(value, list):
-        if value:
-            return f'array<{_infer_type(value[0])}>'
-        return 'array<unknown>'
-    if isinstance(value, dict):
-        return 'object'
-    return type(value).__name__
-
-
-def _infer_schema(data, max_depth: int = 3, depth: int = 0) -> dict:
-    """Recursively infer a JSON schema-like structure from data."""
-    if depth >= max_depth:
-        return {'type': _infer_type(data)}
-
-    if isinstance(data, dict):
-        properties = {}
-        for key, value in data.items():
-            properties[key] = _infer_schema(value, max_depth, depth + 1)
-        return {'type': 'object', 'properties': properties}
-
-    if isinstance(data, list) and data:
-        item_schema = _infer_schema(data[0], max_depth, depth + 1)
-        return {'type': 'array', 'items': item_schema, 'length': len(data)}
-
-    return {'type': _infer_type(data)}
-
-
-async def extract_api_schema(url: str, pattern: str = '*api*', wait: int = 5) -> dict:
+from urllib.parse import urlsplit
+
+from web_inspector_mcp.blocking import blocked_summary
+from web_inspector_mcp.capture import PageCapture, capture_page
+from web_inspector_mcp.offload import loads, run_sized
+from web_inspector_mcp.request_filter import RequestFilter
+from web_inspector_mcp.schema import SchemaNode
+
+
+def _endpoint(url: str) -> str:
+    try:
+        parsed = urlsplit(url)
+    except ValueError:
+        return url
+    return f'{parsed.scheme}://{parsed.netloc}{parsed.path}'
+
+
+def infer_body_schema(body: str, schema_options: dict) -> tuple[SchemaNode, list | None] | None:
     """
-    Captures API responses from a page load and infers their JSON schema.
+    Parses one response body and infers its schema; returns the schema
+    and the top-level keys, or ``None`` if the body isn't JSON. A plain
+    function so large bodies can be handed to a worker process.
+    """
+    try:
+        parsed = loads(body)
+    except (ValueError, TypeError, RecursionError):
+        return None
+    keys = list(parsed) if isinstance(parsed, dict) else None
+    return SchemaNode.from_value(parsed, **schema_options), keys
 
-    Finds all requests matching the pattern that return JSON, then
-    reverse-engineers the response structure (field names, types, nesting).
 
-    Args:
-        url:     The page to load and analyze.
-        pattern: Glob pattern to filter API URLs (default: '*api*').
-        wait:    Seconds to wait for network activity (default: 5).
+class SchemaAggregator:
+    """
+    Merges the JSON responses of every matching request into one schema
+    per endpoint (method plus URL without query string). Each body is
+    parsed, reduced to a :class:`SchemaNode` and dropped, so memory grows
+    with the number of distinct fields, not with the bodies.
     """
-    import fnmatch
-
-    async with browser_session() as tab:
-        async with tab.request.record() as capture:
-            await tab.go_to(url)
-            await asyncio.sleep(wait)
-
-        schemas = []
-        for entry in capture.entries:
-            req = entry['request']
-            resp = entry['response']
-            req_url = req['url']
-
-            if not fnmatch.fnmatch(req_url.lower(), pattern.lower()):
-                continue
-
-            body_raw = resp.get('content', {}).get('text')
-            if not body_raw:
-                continue
-
-            try:
-                body = body_raw if isinstance(body_raw, str) else str(body_raw)
-
-                parsed = json.loads(body)
-                schema = _infer_schema(parsed)
-
-                try:
-                    parsed_url = urlparse(req_url)
-                    endpoint = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
-                except Exception:
-                    endpoint = req_url
-
-                schemas.append({
-                    'endpoint': endpoint,
-                    'method': req['method'],
-                    'full_url': req_url,
-                    'response_schema': schema,
-                    'sample_keys': list(parsed.keys()) if isinstance(parsed, dict) else None,
-                })
-            except (json.JSONDecodeError, TypeError):
-                continue
-            except Exception:
-                continue
 
+    def __init__(self, request_filter: RequestFilter | None = None, **schema_options):
+        self.request_filter = request_filter
+        self.schema_options = schema_options
+        # (method, endpoint) -> {'full_url', 'responses', 'schema', 'keys'}
+        self.endpoints: dict[tuple[str, str], dict] = {}
+
+    def _body(self, entry: dict) -> str | None:
+        if self.request_filter is not None and not self.request_filter.matches(entry):
+            return None
+        body = entry.get('response', {}).get('content', {}).get('text')
+        if not body:
+            return None
+        return body if isinstance(body, str) else str(body)
+
+    async def add_offloaded(self, entry: dict):
+        """Merges the schema of one entry's body, parsing large bodies off the event loop."""
+        body = self._body(entry)
+        if body is not None:
+            inferred = await run_sized(infer_body_schema, body, self.schema_options, size=len(body))
+            self.add_schema(entry, inferred)
+
+    def add_schema(self, entry: dict, inferred: tuple[SchemaNode, list | None] | None):
+        if inferred is None:
+            return
+        schema, keys = inferred
+        req = entry['request']
+        key = (req['method'], _endpoint(req['url']))
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.endpoints[key] = {
+                'full_url': req['url'],
+                'responses': 0,
+                'schema': SchemaNode(**self.schema_options),
+                'keys': {},
+            }
+        endpoint['responses'] += 1
+        endpoint['schema'].merge(schema)
+        if keys is not None:
+            endpoint['keys'].update(dict.fromkeys(keys))
+
+    def summary(self) -> str:
+        responses = sum(e['responses'] for e in self.endpoints.values())
+        return f'{responses} JSON responses from {len(self.endpoints)} endpoints'
+
+    def result(self, page_url: str) -> dict:
+        schemas = [
+            {
+                'endpoint': endpoint,
+                'method': method,
+                'full_url': e['full_url'],
+                'responses': e['responses'],
+                'response_schema': e['schema'].to_dict(),
+                'sample_keys': list(e['keys']) if 'object' in e['schema'].types else None,
+            }
+            for (method, endpoint), e in self.endpoints.items()
+        ]
+        return {
+            'page_url': page_url,
+            'apis_found': len(schemas),
+            'schemas': schemas,
+        }
+
+
+async def analyze_api_schemas(capture: PageCapture, pattern: RequestFilter | str = '*api*') -> dict:
+    """
+    Infers a JSON schema for every endpoint matching ``pattern`` (a URL
+    glob or ``RequestFilter``), merged across all of its JSON responses.
+    Large bodies are parsed and reduced in a worker process.
+    """
+    request_filter = RequestFilter.coerce(pattern)
+    aggregator = SchemaAggregator(request_filter)
+    for entry in capture.entries:
+        await aggregator.add_offloaded(entry)
     return {
-        'page_url': url,
-        'pattern': pattern,
-        'apis_found': len(schemas),
-        'schemas': schemas,
+        'page_url': capture.url,
+        'pattern': request_filter.describe(),
+        **aggregator.result(capture.url),
     }
+
+
+async def extract_api_schema(
+    url: str,
+    pattern: str = '*api*',
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    min_matches: int = 0,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    match: dict | None = None,
+) -> dict:
+    """
+    Captures API responses from a page load and infers their JSON schema.
+
+    Finds all requests matching the pattern that return JSON, then
+    reverse-engineers the response structure (field names, types, nesting),
+    merging every array element (or a sample of long arrays) and every
+    response to the same endpoint into one schema.
+
+    Args:
+        url:         The page to load and analyze.
+        pattern:     Glob pattern to filter API URLs (default: '*api*').
+        wait:        Upper bound, in seconds, on waiting for network activity
+                     after page load (default: 5).
+        wait_until:  'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:     Milliseconds of network quiet that end the wait (default: 500).
+        min_matches: Stop waiting once this many requests matching ``pattern``
+                     have finished loading (default: 0, disabled).
+        fresh:       Ignore cached captures and reload the page (default: False).
+        block:       Resource types ('image', 'font', 'media', ...), profiles
+                     ('static', 'analytics', 'ads', 'api') or URL patterns to
+                     block before loading the page (default: none).
+        match:       Extra request filter rules, any of 'include', 'exclude',
+                     'regex', 'exclude_regex', 'methods', 'status' (e.g. '2xx'),
+                     'resource_types', 'content_types'; 'include' or 'regex'
+                     replace ``pattern`` (default: none).
+    """
+    # Only matching requests need their bodies fetched; optionally stop
+    # waiting once enough of them have loaded
+    request_filter = RequestFilter.from_spec(match, pattern)
+    until = request_filter.matches_url if min_matches > 0 else None
+
+    capture = await capture_page(
+        url, wait, wait_until, idle_ms,
+        until=until, until_count=min_matches, with_timing=False, fresh=fresh,
+        bodies=request_filter, block=block,
+    )
+    result = {**await analyze_api_schemas(capture, request_filter), 'from_cache': capture.from_cache}
+    if block:
+        result['blocked'] = blocked_summary(capture.entries)
+    return result
@@ -1,73 +1,113 @@
-import asyncio
-import fnmatch
-import json
+from web_inspector_mcp.blocking import blocked_summary
+from web_inspector_mcp.capture import PageCapture, capture_page
+from web_inspector_mcp.offload import loads, run_sized
+from web_inspector_mcp.request_filter import RequestFilter
 
-from web_inspector_mcp.browser_session import browser_session
 
-
-async def intercept_api(url: str, pattern: str = '*api*', wait: int = 5) -> dict:
+async def analyze_api_responses(capture: PageCapture, pattern: RequestFilter | str = '*api*') -> dict:
     """
-    Monitors network requests matching a URL pattern and returns their
-    response bodies. Useful for seeing what APIs a page calls.
-
-    Args:
-        url:     The page to load.
-        pattern: Glob pattern to match against request URLs (default: '*api*').
-                 Examples: '*api*', '*.json', '*graphql*', '*v1/*'
-        wait:    Seconds to wait for network activity (default: 5).
+    Returns the response bodies of the captured requests matching
+    ``pattern`` (a URL glob or ``RequestFilter``), parsed as JSON when possible.
+    Large bodies are parsed in a worker thread.
     """
-    async with browser_session() as tab:
-        async with tab.request.record() as capture:
-            await tab.go_to(url)
-            await asyncio.sleep(wait)
-
-        # Try to get response bodies for matched requests
-        results = []
-        for entry in capture.entries:
-            req = entry['request']
-            resp = entry['response']
-            req_url = req['url']
+    # Try to get response bodies for matched requests
+    request_filter = RequestFilter.coerce(pattern)
+    results = []
+    for entry in request_filter.apply(capture.entries):
+        req = entry['request']
+        resp = entry['response']
+        req_url = req['url']
 
-            if not fnmatch.fnmatch(req_url.lower(), pattern.lower()):
-                continue
+        body_raw = resp.get('content', {}).get('text')
 
-            body_raw = resp.get('content', {}).get('text')
+        req_info = {
+            'url': req_url,
+            'method': req.get('method', '?'),
+            'type': entry.get('_resourceType'),
+            'headers': req.get('headers', {}),
+        }
 
-            req_info = {
-                'url': req_url,
-                'method': req.get('method', '?'),
-                'type': entry.get('_resourceType'),
-                'headers': req.get('headers', {}),
-            }
+        try:
+            # If body_raw is None, we just set body to empty string for parsing check,
+            # but keep track that it's actually missing
+            body = body_raw if isinstance(body_raw, str) else str(body_raw) if body_raw is not None else ""
 
-            try:
-                # If body_raw is None, we just set body to empty string for parsing check,
-                # but keep track that it's actually missing
-                body = body_raw if isinstance(body_raw, str) else str(body_raw) if body_raw is not None else ""
+            # Try to parse as JSON
+            parsed = None
+            if body_raw is not None:
+                try:
+                    # The parsed body is returned, so a process hop would
+                    # only add the cost of pickling it back
+                    parsed = await run_sized(loads, body, size=len(body), processes=False)
+                except (ValueError, TypeError):
+                    pass
 
-                # Try to parse as JSON
-                parsed = None
-                if body_raw is not None:
-                    try:
-                        parsed = json.loads(body)
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-
-                results.append({
-                    **req_info,
-                    'response_body': parsed if parsed else (body[:2000] if body_raw is not None else None),
-                    'is_json': parsed is not None,
-                })
-            except Exception as e:
-                results.append({
-                    **req_info,
-                    'response_body': None,
-                    'error': str(e),
-                })
+            results.append({
+                **req_info,
+                'response_body': parsed if parsed else (body[:2000] if body_raw is not None else None),
+                'is_json': parsed is not None,
+                **({'truncated': True} if entry.get('_bodyTruncated') else {}),
+            })
+        except Exception as e:
+            results.append({
+                **req_info,
+                'response_body': None,
+                'error': str(e),
+            })
 
     return {
-        'page_url': url,
-        'pattern': pattern,
+        'page_url': capture.url,
+        'pattern': request_filter.describe(),
         'matched_count': len(results),
         'results': results,
     }
+
+
+async def intercept_api(
+    url: str,
+    pattern: str = '*api*',
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    min_matches: int = 0,
+    fresh: bool = False,
+    block: list[str] | None = None,
+    match: dict | None = None,
+) -> dict:
+    """
+    Monitors network requests matching a URL pattern and returns their
+    response bodies. Useful for seeing what APIs a page calls.
+
+    Args:
+        url:         The page to load.
+        pattern:     Glob pattern to match against request URLs (default: '*api*').
+                     Examples: '*api*', '*.json', '*graphql*', '*v1/*'
+        wait:        Upper bound, in seconds, on waiting for network activity
+                     after page load (default: 5).
+        wait_until:  'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:     Milliseconds of network quiet that end the wait (default: 500).
+        min_matches: Stop waiting once this many requests matching ``pattern``
+                     have finished loading (default: 0, disabled).
+        fresh:       Ignore cached captures and reload the page (default: False).
+        block:       Resource types ('image', 'font', 'media', ...), profiles
+                     ('static', 'analytics', 'ads', 'api') or URL patterns to
+                     block before loading the page (default: none).
+        match:       Extra request filter rules, any of 'include', 'exclude',
+                     'regex', 'exclude_regex', 'methods', 'status' (e.g. '2xx'),
+                     'resource_types', 'content_types'; 'include' or 'regex'
+                     replace ``pattern`` (default: none).
+    """
+    # Only matching requests need their bodies fetched; optionally stop
+    # waiting once enough of them have loaded
+    request_filter = RequestFilter.from_spec(match, pattern)
+    until = request_filter.matches_url if min_matches > 0 else None
+
+    capture = await capture_page(
+        url, wait, wait_until, idle_ms,
+        until=until, until_count=min_matches, with_timing=False, fresh=fresh,
+        bodies=request_filter, block=block,
+    )
+    result = {**await analyze_api_responses(capture, request_filter), 'from_cache': capture.from_cache}
+    if block:
+        result['blocked'] = blocked_summary(capture.entries)
+    return result
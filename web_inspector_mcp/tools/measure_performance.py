@@ -1,94 +1,373 @@
 import asyncio
-from urllib.parse import urlparse
+import contextlib
+import heapq
+from itertools import count
 
-from web_inspector_mcp.browser_session import browser_session, extract_result
+from web_inspector_mcp.audit import DEFAULT_THROUGHPUT_KBPS, audit_capture
+from web_inspector_mcp.browser_session import isolated_tab, shared_browser
+from web_inspector_mcp.capture import PageCapture, capture_page
+from web_inspector_mcp.code_coverage import coverage_report
+from web_inspector_mcp.connections import ConnectionAggregator
+from web_inspector_mcp.har_files import har_path
+from web_inspector_mcp.pipeline import aggregate_page
+from web_inspector_mcp.records import RequestRecord
+from web_inspector_mcp.stats import summarize
+from web_inspector_mcp.throttling import NETWORK_PROFILES, resolve_throttle
+from web_inspector_mcp.waterfall import TimingAggregator, phases
 
+TOP_N = 10
+# Navigation timing fields compared across runs
+RUN_METRICS = ('ttfb', 'dom_interactive', 'dom_content_loaded', 'load_event', 'dns', 'connect', 'tls')
+# Trace metrics compared across runs when vitals are measured
+VITALS_METRICS = ('fcp_ms', 'lcp_ms', 'cls', 'tbt_ms')
+CACHE_MODES = ('cold', 'warm', 'both')
 
-async def measure_performance(url: str, wait: int = 5) -> dict:
+
+class PerformanceAggregator:
+    """
+    Accumulates transfer sizes, the status distribution and the
+    slowest/largest resources one entry at a time, plus the per-phase
+    timing breakdown (see :class:`~web_inspector_mcp.waterfall.TimingAggregator`)
+    and connection usage per origin (see
+    :class:`~web_inspector_mcp.connections.ConnectionAggregator`).
+    The top lists are bounded heaps, but the timing and connection
+    breakdowns keep a span per request, since the critical chain and
+    connection-limit queueing need every request's start and end. Memory
+    therefore grows with the number of requests, not with response sizes.
+    """
+
+    def __init__(self, top_n: int = TOP_N):
+        self.top_n = top_n
+        self.total_requests = 0
+        self.total_bytes = 0
+        self.status_dist = {}
+        self.domain_sizes = {}
+        self._seq = count()
+        self._slowest = []
+        self._largest = []
+        self.timings = TimingAggregator()
+        self.connections = ConnectionAggregator()
+
+    def _push(self, heap: list, key, record: RequestRecord):
+        # Ties keep arrival order: earlier entries rank higher
+        item = (key, -next(self._seq), record)
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def add(self, entry: dict):
+        self.add_record(RequestRecord.from_entry(entry))
+
+    def add_record(self, record: RequestRecord):
+        size = record.transfer_bytes
+        duration_ms = round(record.time_ms, 1)
+        self.total_requests += 1
+        self.total_bytes += size
+        self._push(self._slowest, duration_ms, record)
+        self._push(self._largest, (size, duration_ms), record)
+
+        # Status code distribution
+        status = str(record.status)
+        self.status_dist[status] = self.status_dist.get(status, 0) + 1
+
+        # Domain breakdown
+        self.domain_sizes[record.domain] = self.domain_sizes.get(record.domain, 0) + size
+        self.timings.add_record(record)
+        self.connections.add_record(record)
+
+    def summary(self) -> str:
+        return f'{self.total_requests} requests, {round(self.total_bytes / 1024, 1)} KB'
+
+    @staticmethod
+    def _ranked(heap: list) -> list[dict]:
+        ranked = sorted(heap, key=lambda item: item[:2], reverse=True)
+        return [
+            {
+                'url': r.url[:120],
+                'method': r.method,
+                'type': r.resource_type or '?',
+                'status': r.status,
+                'size_bytes': r.transfer_bytes,
+                'duration_ms': round(r.time_ms, 1),
+                'phases': phases(r),
+            }
+            for _, _, r in ranked
+        ]
+
+    def result(self, page_url: str, timing: dict) -> dict:
+        return {
+            'page_url': page_url,
+            'timing': timing,
+            'total_requests': self.total_requests,
+            'total_transfer_bytes': self.total_bytes,
+            'total_transfer_kb': round(self.total_bytes / 1024, 1),
+            'status_codes': self.status_dist,
+            'transfer_by_domain': {d: round(s / 1024, 1) for d, s in self.domain_sizes.items()},
+            'slowest_resources': self._ranked(self._slowest),
+            'largest_resources': self._ranked(self._largest),
+            **self.timings.result(timing),
+            'connections': self.connections.result(),
+        }
+
+
+def analyze_performance(capture: PageCapture) -> dict:
+    """
+    Computes transfer sizes, status distribution and the slowest/largest
+    resources of a capture, alongside its navigation timing.
+    """
+    aggregator = PerformanceAggregator()
+    for record in capture.records:
+        aggregator.add_record(record)
+    return aggregator.result(capture.url, capture.timing)
+
+
+class RunSeries:
+    """
+    Timing of repeated loads of one page under one cache mode, summarized
+    per metric and per resource once the runs are done.
+    """
+
+    def __init__(self, top_n: int = TOP_N):
+        self.top_n = top_n
+        self.metrics: dict[str, list[float]] = {}
+        # (method, url) -> resource type and duration per run
+        self.resources: dict[tuple[str, str], dict] = {}
+        self.errors: list[str] = []
+
+    def add(self, capture: PageCapture):
+        values = {k: capture.timing[k] for k in RUN_METRICS if isinstance(capture.timing.get(k), (int, float))}
+        records = capture.records
+        values['total_requests'] = len(records)
+        values['total_transfer_bytes'] = sum(r.transfer_bytes for r in records)
+        if capture.trace is not None:
+            vitals = capture.trace.result()
+            values.update((k, vitals[k]) for k in VITALS_METRICS if isinstance(vitals.get(k), (int, float)))
+        for name, value in values.items():
+            self.metrics.setdefault(name, []).append(value)
+
+        seen = set()
+        for r in records:
+            # A resource loaded twice in one run counts once, at its first load
+            key = (r.method, r.url)
+            if key in seen:
+                continue
+            seen.add(key)
+            resource = self.resources.setdefault(key, {'type': r.resource_type or '?', 'durations': []})
+            resource['durations'].append(r.time_ms)
+
+    def result(self) -> dict:
+        resources = [
+            {'url': url[:120], 'method': method, 'type': r['type'], **summarize(r['durations'])}
+            for (method, url), r in self.resources.items()
+        ]
+        resources.sort(key=lambda r: r.get('median', 0), reverse=True)
+        return {
+            'runs': len(self.metrics.get('total_requests', [])),
+            'failed_runs': self.errors,
+            'metrics': {name: summarize(values) for name, values in self.metrics.items()},
+            'slowest_resources': resources[:self.top_n],
+        }
+
+
+async def measure_runs(
+    url: str,
+    runs: int = 5,
+    cache: str = 'both',
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    on_progress=None,
+    replay: str | None = None,
+    replay_latency: str | float = 'recorded',
+    vitals: bool = False,
+    throttle: list[str] | str | None = None,
+) -> dict:
+    """
+    Loads a page ``runs`` times per cache mode in one browser and reports
+    median, p75, p95, standard deviation and range of every timing metric
+    and of the slowest resources, after trimming outliers (see
+    :func:`~web_inspector_mcp.stats.summarize`).
+
+    Cold runs each get a fresh browser context with the HTTP cache
+    disabled. Warm runs share one context whose cache is primed by an
+    extra, unreported load; if that load fails, it is listed under the
+    warm ``failed_runs`` and only the cold runs are measured.
+
+    Args:
+        url:        The page to measure.
+        runs:       Loads per cache mode (default: 5).
+        cache:      'cold', 'warm' or 'both' (default: 'both').
+        wait, wait_until, idle_ms, replay, replay_latency, vitals, throttle:
+                    As for :func:`measure_performance`.
+        on_progress: Optional ``async (count, summary)`` callback awaited
+                     after every run.
+    """
+    if runs < 1:
+        raise ValueError('runs must be at least 1')
+    if har_path(url) is not None:
+        # Every run would read the same file: identical numbers, not a distribution
+        raise ValueError('Repeated runs need a live page, not a saved capture')
+    if cache not in CACHE_MODES:
+        raise ValueError(f"cache must be one of {', '.join(CACHE_MODES)}, not {cache!r}")
+    throttling = resolve_throttle(throttle)
+    modes = ['cold', 'warm'] if cache == 'both' else [cache]
+    series = {mode: RunSeries() for mode in modes}
+    options = {
+        'wait': wait, 'wait_until': wait_until, 'idle_ms': idle_ms,
+        'fresh': True, 'bodies': False, 'trace': vitals, 'throttle': throttle,
+    }
+    if replay:
+        options.update(replay=replay, replay_latency=replay_latency)
+    replay_stats = {}
+    done = 0
+
+    async def run(mode: str, tab):
+        nonlocal done
+        try:
+            capture = await capture_page(url, tab=tab, disable_cache=mode == 'cold', **options)
+        except Exception as e:
+            series[mode].errors.append(f'{type(e).__name__}: {e}')
+            summary = f'{mode} run failed'
+        else:
+            series[mode].add(capture)
+            for name, value in capture.replay_stats.items():
+                replay_stats[name] = replay_stats.get(name, 0) + value
+            summary = f'{mode} run: {len(capture.entries)} requests'
+        done += 1
+        if on_progress is not None:
+            with contextlib.suppress(Exception):
+                await on_progress(done, summary)
+
+    async with shared_browser() as browser:
+        for mode in modes:
+            if mode == 'cold':
+                for _ in range(runs):
+                    async with isolated_tab(browser) as tab:
+                        await run(mode, tab)
+                continue
+            async with isolated_tab(browser) as tab:
+                try:
+                    await capture_page(url, tab=tab, **options)
+                except Exception as e:
+                    series[mode].errors.append(f'cache priming load: {type(e).__name__}: {e}')
+                    continue
+                for _ in range(runs):
+                    await run(mode, tab)
+
+    result = {'page_url': url, 'runs': runs, 'cache': cache}
+    if throttling:
+        result['throttle'] = throttling.describe()
+    for mode in modes:
+        result[mode] = series[mode].result()
+    if replay:
+        result['replay'] = replay_stats
+    return result
+
+
+async def measure_performance(
+    url: str,
+    wait: int = 5,
+    wait_until: str = 'networkidle0',
+    idle_ms: int = 500,
+    fresh: bool = False,
+    on_progress=None,
+    replay: str | None = None,
+    replay_latency: str | float = 'recorded',
+    runs: int = 1,
+    cache: str = 'both',
+    vitals: bool = False,
+    throttle: list[str] | str | None = None,
+    coverage: bool = False,
+    audit: bool = False,
+) -> dict:
     """
     Measures network performance metrics for a page load.
 
     Returns timing data, request counts, total transfer size,
-    and identifies the slowest/largest resources.
+    and identifies the slowest/largest resources. With ``runs`` above 1
+    the page is loaded repeatedly instead and every metric is reported as
+    a distribution (see :func:`measure_runs`).
 
     Args:
-        url:  The page to load and measure.
-        wait: Seconds to wait for network activity (default: 5).
+        url:        The page to load and measure.
+        wait:       Upper bound, in seconds, on waiting for network activity
+                    after page load (default: 5).
+        wait_until: 'networkidle0', 'networkidle2' or 'fixed' (default: 'networkidle0').
+        idle_ms:    Milliseconds of network quiet that end the wait (default: 500).
+        fresh:      Ignore cached captures and reload the page (default: False).
+        on_progress: Optional ``async (count, summary)`` callback; when set the
+                     capture is streamed and reports partial results.
+        replay:     A saved capture (.har, .har.gz, .ndjson) to serve every
+                    request from instead of the network, for repeatable
+                    measurements (default: none, load live).
+        replay_latency: 'recorded' to delay replayed responses by their
+                        recorded time, or a fixed delay in milliseconds.
+        runs:       Loads per cache mode; above 1 switches to
+                    :func:`measure_runs` (default: 1).
+        cache:      Cache modes measured when ``runs`` is above 1: 'cold',
+                    'warm' or 'both' (default: 'both').
+        vitals:     Also trace the load for Core Web Vitals (LCP, CLS, TBT)
+                    and main-thread time per script (default: False).
+        throttle:   Network and CPU throttling profiles, e.g. 'slow-4g',
+                    'fast-3g', 'cpu-4x' or 'mobile' (see
+                    :func:`~web_inspector_mcp.throttling.resolve_throttle`),
+                    applied to every run (default: none).
+        coverage:   Also report used and unused bytes per script and
+                    stylesheet, merged with transfer sizes (default: False;
+                    single runs only).
+        audit:      Also audit compression, cache lifetimes, duplicate
+                    downloads and images, with savings in bytes and in ms
+                    at the throttled (else slow 4G) throughput (see
+                    :class:`~web_inspector_mcp.audit.AuditAggregator`;
+                    default: False). Needs response bodies, so the capture
+                    isn't streamed.
+
+    Raises:
+        ValueError: ``runs`` above 1 combined with ``coverage``, ``audit``
+                    or ``fresh``, which only apply to a single load, or
+                    with a saved capture as ``url``.
     """
-    async with browser_session() as tab:
-        async with tab.request.record() as capture:
-            await tab.go_to(url)
-            await asyncio.sleep(wait)
-
-        # Also get Navigation Timing from the browser
-        timing_raw = await tab.execute_script("""
-        (() => {
-          const t = performance.timing;
-          const nav = performance.getEntriesByType('navigation')[0] || {};
-          return JSON.stringify({
-            dom_content_loaded: t.domContentLoadedEventEnd - t.navigationStart,
-            load_event: t.loadEventEnd - t.navigationStart,
-            ttfb: t.responseStart - t.navigationStart,
-            dns: t.domainLookupEnd - t.domainLookupStart,
-            connect: t.connectEnd - t.connectStart,
-            transfer_size: nav.transferSize || 0,
-            decoded_body_size: nav.decodedBodySize || 0,
-          });
-        })()
-        """)
-        timing = extract_result(timing_raw)
-
-    # Compute metrics
-    resources = []
-    total_bytes = 0
-    for entry in capture.entries:
-        req = entry['request']
-        resp = entry['response']
-
-        size = resp.get('bodySize', 0)
-        if size < 0:
-            size = resp.get('_transferSize', 0)
-        if size < 0:
-            size = 0
-
-        total_bytes += size
-
-        duration_ms = entry.get('time', 0)
-
-        resources.append({
-            'url': req['url'][:120],
-            'method': req['method'],
-            'type': entry.get('_resourceType', '?'),
-            'status': resp.get('status', '?'),
-            'size_bytes': size,
-            'duration_ms': round(duration_ms, 1),
-        })
-
-    resources.sort(key=lambda r: r['duration_ms'], reverse=True)
-
-    # Status code distribution
-    status_dist = {}
-    for r in resources:
-        s = str(r['status'])
-        status_dist[s] = status_dist.get(s, 0) + 1
-
-    # Domain breakdown
-    domain_sizes = {}
-    for r in resources:
-        try:
-            domain = urlparse(r['url']).netloc
-        except Exception:
-            domain = 'unknown'
-        domain_sizes[domain] = domain_sizes.get(domain, 0) + r['size_bytes']
-
-    return {
-        'page_url': url,
-        'timing': timing if isinstance(timing, dict) else {},
-        'total_requests': len(resources),
-        'total_transfer_bytes': total_bytes,
-        'total_transfer_kb': round(total_bytes / 1024, 1),
-        'status_codes': status_dist,
-        'transfer_by_domain': {d: round(s / 1024, 1) for d, s in domain_sizes.items()},
-        'slowest_resources': resources[:10],
-        'largest_resources': sorted(resources, key=lambda r: r['size_bytes'], reverse=True)[:10],
-    }
+    if runs > 1:
+        single = [name for name, on in (('coverage', coverage), ('audit', audit), ('fresh', fresh)) if on]
+        if single:
+            # Repeated runs always reload the page and report distributions only
+            raise ValueError(f"{', '.join(single)} can't be combined with runs above 1")
+        return await measure_runs(
+            url, runs, cache, wait, wait_until, idle_ms, on_progress, replay, replay_latency, vitals, throttle,
+        )
+    aggregator = PerformanceAggregator()
+    options = {'replay': replay, 'replay_latency': replay_latency} if replay else {}
+    if vitals:
+        options['trace'] = True
+    if throttle:
+        options['throttle'] = throttle
+    if coverage:
+        options['coverage'] = True
+    if audit:
+        options['bodies'] = None  # every body, for the compression and duplicate checks
+    capture = await aggregate_page(
+        url, aggregator, None if audit else on_progress,
+        wait=wait, wait_until=wait_until, idle_ms=idle_ms, fresh=fresh,
+        **options,
+    )
+    result = {**aggregator.result(capture.url, capture.timing), 'from_cache': capture.from_cache}
+    if replay:
+        result['replay'] = capture.replay_stats
+    if throttle:
+        result['throttle'] = capture.throttle
+    if vitals:
+        if capture.trace is not None:
+            result['web_vitals'] = capture.trace.result(capture.records)
+        else:
+            result['web_vitals'] = {'error': 'Saved captures have no trace; load the page live'}
+    if audit:
+        network = resolve_throttle(throttle).network
+        throughput = NETWORK_PROFILES[network]['download_kbps'] if network else DEFAULT_THROUGHPUT_KBPS
+        result['audit'] = await asyncio.to_thread(audit_capture, capture, throughput)
+    if coverage:
+        if capture.coverage is not None:
+            result['coverage'] = coverage_report(capture.coverage, capture.records)
+        else:
+            result['coverage'] = {'error': 'Saved captures have no coverage; load the page live'}
+    return result
@@ -0,0 +1,253 @@
+import asyncio
+import contextlib
+import logging
+
+from pydoll.protocol.base import Command
+
+logger = logging.getLogger(__name__)
+
+# What the metrics below are computed from: navigation and paint markers,
+# layout shifts, main-thread tasks and script evaluation. Chrome records
+# only the included categories, so nothing needs excluding
+TRACE_CATEGORIES = [
+    'devtools.timeline',
+    'disabled-by-default-devtools.timeline',
+    'loading',
+    'blink.user_timing',
+    'toplevel',
+    'v8.execute',
+    '__metadata',
+]
+# Seconds to wait for Chrome to flush the trace after Tracing.end
+TRACE_FLUSH_TIMEOUT = 10.0
+
+# Tasks longer than this block input; the excess counts towards TBT
+LONG_TASK_MS = 50
+# CLS session windows: shifts less than 1 s apart, at most 5 s long
+CLS_GAP_MS = 1000
+CLS_WINDOW_MS = 5000
+# Script events shorter than this aren't kept for long-task attribution
+SCRIPT_SPAN_MS = 5
+MAX_SCRIPT_SPANS = 5000
+TOP_N = 10
+
+# Script work on the main thread, by trace event name
+_SCRIPT_EVENTS = {
+    'EvaluateScript': 'evaluate_ms',
+    'v8.compile': 'compile_ms',
+    'v8.compileModule': 'compile_ms',
+    'FunctionCall': 'function_call_ms',
+}
+
+
+class TraceMetrics:
+    """
+    Core Web Vitals and main-thread cost of a page load, folded from
+    Chrome trace events one batch at a time.
+
+    Only what the metrics need is kept (paint candidates, layout shifts,
+    long tasks, per-script totals and a bounded list of long script
+    events), so memory doesn't grow with the size of the trace.
+    Events may arrive in any order; everything is resolved in
+    :meth:`result`.
+    """
+
+    def __init__(self):
+        self.events = 0
+        # Set once Chrome has delivered the whole trace
+        self.complete = False
+        # (ts, pid, tid, url, frame) of main-frame navigations
+        self._navigations: list[tuple[float, int, int, str, str]] = []
+        # (ts, frame)
+        self._fcp: list[tuple[float, str]] = []
+        # (ts, size, type, url)
+        self._lcp: list[tuple[float, int, str, str]] = []
+        # (ts, url) of image paint candidates, to name the LCP image
+        self._images: list[tuple[float, str]] = []
+        self._shifts: list[tuple[float, float]] = []
+        # (pid, tid) -> [(start, dur)] of long tasks
+        self._long_tasks: dict[tuple[int, int], list[tuple[float, float]]] = {}
+        # url -> {evaluate_ms, compile_ms, function_call_ms}
+        self._scripts: dict[str, dict[str, float]] = {}
+        # (pid, tid, start, dur, url) of longer script events
+        self._script_spans: list[tuple[int, int, float, float, str]] = []
+
+    def add_events(self, events: list[dict]):
+        for event in events:
+            self.events += 1
+            name = event.get('name')
+            args = event.get('args') or {}
+            data = args.get('data') or {}
+            ts = event.get('ts', 0) / 1000
+            if name == 'RunTask':
+                dur = event.get('dur', 0) / 1000
+                if dur > LONG_TASK_MS:
+                    self._long_tasks.setdefault((event.get('pid'), event.get('tid')), []).append((ts, dur))
+            elif name in _SCRIPT_EVENTS:
+                url = data.get('url') or ''
+                dur = event.get('dur', 0) / 1000
+                if not url or dur <= 0:
+                    continue
+                totals = self._scripts.setdefault(url, {})
+                field = _SCRIPT_EVENTS[name]
+                totals[field] = totals.get(field, 0) + dur
+                if dur >= SCRIPT_SPAN_MS and field != 'compile_ms' and len(self._script_spans) < MAX_SCRIPT_SPANS:
+                    self._script_spans.append((event.get('pid'), event.get('tid'), ts, dur, url))
+            elif name == 'LayoutShift':
+                if data.get('had_recent_input') or data.get('is_main_frame') is False:
+                    continue
+                self._shifts.append((ts, data.get('weighted_score_delta', data.get('score', 0))))
+            elif name == 'navigationStart':
+                url = data.get('documentLoaderURL') or ''
+                if data.get('isLoadingMainFrame') and url.startswith(('http://', 'https://')):
+                    self._navigations.append((ts, event.get('pid'), event.get('tid'), url, args.get('frame', '')))
+            elif name == 'firstContentfulPaint':
+                self._fcp.append((ts, args.get('frame', '')))
+            elif name == 'largestContentfulPaint::Candidate':
+                if data.get('isMainFrame') is False:
+                    continue
+                self._lcp.append((ts, data.get('size', 0), data.get('type', ''), data.get('url', '')))
+            elif name == 'LargestImagePaint::Candidate' and data.get('imageUrl'):
+                self._images.append((ts, data['imageUrl']))
+
+    def _cls(self, start: float) -> float:
+        best = window = 0.0
+        window_start = previous = None
+        for ts, score in sorted(s for s in self._shifts if s[0] >= start):
+            if previous is None or ts - previous > CLS_GAP_MS or ts - window_start > CLS_WINDOW_MS:
+                window, window_start = 0.0, ts
+            window += score
+            previous = ts
+            best = max(best, window)
+        return round(best, 4)
+
+    def _attribute_task(self, thread: tuple, start: float, dur: float) -> str | None:
+        """The script that ran longest inside a task on ``thread``."""
+        time_by_url: dict[str, float] = {}
+        end = start + dur
+        for pid, tid, span_start, span_dur, url in self._script_spans:
+            if (pid, tid) != thread:
+                continue
+            overlap = min(end, span_start + span_dur) - max(start, span_start)
+            if overlap > 0:
+                time_by_url[url] = time_by_url.get(url, 0) + overlap
+        return max(time_by_url, key=time_by_url.get) if time_by_url else None
+
+    def result(self, records=None) -> dict:
+        """
+        The metrics, in ms from the main-frame navigation. ``records``
+        (the capture's :class:`~web_inspector_mcp.records.RequestRecord`
+        list) adds transfer size and resource type to each script URL.
+        """
+        if not self._navigations:
+            return {'events': self.events, 'complete': self.complete, 'error': 'No main-frame navigation in the trace'}
+        origin, pid, tid, page_url, frame = max(self._navigations)
+        thread = (pid, tid)
+        by_url = {r.url: r for r in records or []}
+
+        out = {'events': self.events, 'complete': self.complete, 'page_url': page_url}
+        fcp = min((ts for ts, f in self._fcp if ts >= origin and f == frame), default=None)
+        out['fcp_ms'] = round(fcp - origin, 1) if fcp is not None else None
+
+        candidates = [c for c in self._lcp if c[0] >= origin]
+        if candidates:
+            ts, size, kind, url = max(candidates)
+            if not url and kind == 'image':
+                url = max((i for i in self._images if origin <= i[0] <= ts), default=(0, None))[1]
+            out['lcp_ms'] = round(ts - origin, 1)
+            out['lcp_element'] = {'type': kind, 'size': size, 'url': url or None}
+        else:
+            out['lcp_ms'] = None
+
+        out['cls'] = self._cls(origin)
+        out['layout_shifts'] = sum(1 for ts, _ in self._shifts if ts >= origin)
+
+        # Lighthouse counts blocking time from first contentful paint on
+        tasks = sorted(t for t in self._long_tasks.get(thread, []) if t[0] + t[1] >= origin)
+        blocking_from = fcp if fcp is not None else origin
+        tbt = 0.0
+        for start, dur in tasks:
+            end = start + dur
+            if end > blocking_from:
+                tbt += max(end - max(start, blocking_from) - LONG_TASK_MS, 0)
+        out['tbt_ms'] = round(tbt, 1)
+        out['long_tasks'] = len(tasks)
+        out['max_potential_fid_ms'] = round(max((d for s, d in tasks if s + d > blocking_from), default=0), 1)
+        out['longest_tasks'] = [
+            {
+                'start_ms': round(start - origin, 1),
+                'duration_ms': round(dur, 1),
+                'url': self._attribute_task(thread, start, dur),
+            }
+            for start, dur in sorted(tasks, key=lambda t: -t[1])[:TOP_N]
+        ]
+
+        scripts = []
+        for url, totals in self._scripts.items():
+            row = {'url': url[:120], **{k: round(v, 1) for k, v in totals.items()}}
+            # Compilation happens inside evaluation, so it isn't added again
+            row['main_thread_ms'] = round(totals.get('evaluate_ms', 0) + totals.get('function_call_ms', 0), 1)
+            record = by_url.get(url)
+            if record is not None:
+                row['transfer_bytes'] = record.transfer_bytes
+                row['type'] = record.resource_type or '?'
+            scripts.append(row)
+        scripts.sort(key=lambda r: r['main_thread_ms'], reverse=True)
+        out['main_thread_by_script'] = scripts[:TOP_N]
+        return out
+
+
+class PageTracer:
+    """
+    Records a Chrome trace of everything inside the block and folds it
+    into :class:`TraceMetrics` as ``Tracing.dataCollected`` batches
+    arrive, so the trace itself is never held in memory or written out.
+
+    Use it around the navigation; ``metrics`` is final once the block has
+    exited (``metrics.complete`` is false if Chrome didn't finish flushing
+    the trace in time).
+    """
+
+    def __init__(self, tab, categories: list[str] | None = None):
+        self._tab = tab
+        self.categories = categories or TRACE_CATEGORIES
+        self.metrics = TraceMetrics()
+        self._done = asyncio.Event()
+        self._callback_ids: list[int] = []
+
+    def _on_data(self, event: dict):
+        self.metrics.add_events(event.get('params', {}).get('value', []))
+
+    def _on_complete(self, event: dict):
+        self._done.set()
+
+    async def __aenter__(self):
+        self._callback_ids = [
+            await self._tab.on('Tracing.dataCollected', self._on_data),
+            await self._tab.on('Tracing.tracingComplete', self._on_complete),
+        ]
+        await self._tab._execute_command(Command(
+            method='Tracing.start',
+            params={
+                'traceConfig': {'includedCategories': self.categories, 'recordMode': 'recordAsMuchAsPossible'},
+                'transferMode': 'ReportEvents',
+            },
+        ))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            await self._tab._execute_command(Command(method='Tracing.end'))
+            await asyncio.wait_for(self._done.wait(), TRACE_FLUSH_TIMEOUT)
+            self.metrics.complete = True
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
+            if exc_type is None:
+                raise
+            # Don't mask the error that ended the block
+            logger.warning('Failed to end trace', exc_info=True)
+        finally:
+            for callback_id in self._callback_ids:
+                with contextlib.suppress(Exception):
+                    await self._tab.remove_callback(callback_id)
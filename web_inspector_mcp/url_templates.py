@@ -0,0 +1,179 @@
+import re
+from urllib.parse import parse_qsl
+
+# Segments that are clearly values rather than names
+_UUID = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+_HEX = re.compile(r'[0-9a-f]{8,}', re.IGNORECASE)
+_TOKEN = re.compile(r'[A-Za-z0-9_\-]{20,}')
+
+# Distinct literal segments under one path position before they are
+# treated as values and collapsed into ``{param}``
+DEFAULT_MAX_LITERALS = 25
+# Example URLs kept per template
+MAX_EXAMPLES = 3
+
+
+def classify_segment(segment: str) -> str | None:
+    """
+    The placeholder for a path segment that looks like a value: ``{id}``
+    for numbers, ``{uuid}``, ``{hash}`` for long hex strings and ``{token}``
+    for long random-looking strings. ``None`` for anything else.
+    """
+    if not segment:
+        return None
+    if segment.isdigit():
+        return '{id}'
+    if len(segment) == 36 and _UUID.fullmatch(segment):
+        return '{uuid}'
+    if _HEX.fullmatch(segment) and any(c.isdigit() for c in segment):
+        return '{hash}'
+    if _TOKEN.fullmatch(segment) and sum(c.isdigit() for c in segment) >= 3:
+        return '{token}'
+    return None
+
+
+class _Node:
+    __slots__ = ('children', 'collapsed', 'methods')
+
+    def __init__(self):
+        # segment or placeholder -> _Node
+        self.children: dict[str, _Node] = {}
+        self.collapsed = False
+        # method -> stats of requests ending at this node
+        self.methods: dict[str, dict] = {}
+
+    def literal_count(self) -> int:
+        return sum(1 for segment in self.children if not segment.startswith('{'))
+
+
+def _merge_stats(target: dict, source: dict):
+    target['count'] += source['count']
+    target['has_post_data'] = target['has_post_data'] or source['has_post_data']
+    target['query_keys'].update(source['query_keys'])
+    if len(target['examples']) < MAX_EXAMPLES:
+        target['examples'].extend(u for u in source['examples'] if u not in target['examples'])
+        del target['examples'][MAX_EXAMPLES:]
+
+
+class PathTemplates:
+    """
+    Clusters request URLs into path templates with a trie per host.
+
+    Each path segment is either kept literally or replaced by a
+    placeholder (see :func:`classify_segment`). When one position collects
+    more than ``max_literals`` distinct literal segments they are taken to
+    be values too: the siblings are merged into a single ``{param}``
+    branch and later segments there go straight to it. Adding a URL costs
+    one step per segment, and each merge folds a subtree once, so
+    clustering stays near-linear in the number of URLs.
+
+    Args:
+        max_literals: Distinct literal segments allowed at one position
+                      before they collapse into ``{param}`` (default: 25).
+    """
+
+    def __init__(self, max_literals: int = DEFAULT_MAX_LITERALS):
+        self.max_literals = max_literals
+        # (scheme, host) -> root node
+        self.hosts: dict[tuple[str, str], _Node] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of distinct (method, template) pairs."""
+        return self._count
+
+    def add(
+        self,
+        method: str,
+        scheme: str,
+        host: str,
+        path: str,
+        url: str,
+        resource_type: str = '',
+        has_post_data: bool = False,
+    ):
+        node = self.hosts.get((scheme, host))
+        if node is None:
+            node = self.hosts[(scheme, host)] = _Node()
+        for segment in path.split('/')[1:] if path.startswith('/') else [path] if path else []:
+            node = self._step(node, segment)
+
+        stats = node.methods.get(method)
+        if stats is None:
+            stats = node.methods[method] = {
+                'count': 0,
+                'type': resource_type,
+                'has_post_data': False,
+                'query_keys': {},
+                'examples': [],
+            }
+            self._count += 1
+        stats['count'] += 1
+        stats['has_post_data'] = stats['has_post_data'] or has_post_data
+        if '?' in url:
+            query = url.split('?', 1)[1].split('#', 1)[0]
+            stats['query_keys'].update(dict.fromkeys(k for k, _ in parse_qsl(query, keep_blank_values=True)))
+        if len(stats['examples']) < MAX_EXAMPLES and url not in stats['examples']:
+            stats['examples'].append(url)
+
+    def _step(self, node: _Node, segment: str) -> _Node:
+        key = classify_segment(segment) or ('{param}' if node.collapsed else segment)
+        child = node.children.get(key)
+        if child is None:
+            child = node.children[key] = _Node()
+            if not key.startswith('{') and node.literal_count() > self.max_literals:
+                return self._collapse(node)
+        return child
+
+    def _collapse(self, node: _Node) -> _Node:
+        """Merges the literal children of ``node`` into its ``{param}`` child and returns it."""
+        node.collapsed = True
+        target = node.children.get('{param}') or _Node()
+        literals = [key for key in node.children if not key.startswith('{')]
+        for key in literals:
+            self._merge(target, node.children.pop(key))
+        node.children['{param}'] = target
+        return target
+
+    def _merge(self, target: _Node, source: _Node):
+        stack = [(target, source)]
+        while stack:
+            into, src = stack.pop()
+            into.collapsed = into.collapsed or src.collapsed
+            for method, stats in src.methods.items():
+                existing = into.methods.get(method)
+                if existing is None:
+                    into.methods[method] = stats
+                else:
+                    _merge_stats(existing, stats)
+                    self._count -= 1
+            for key, child in src.children.items():
+                if into.collapsed and not key.startswith('{'):
+                    key = '{param}'
+                existing = into.children.get(key)
+                if existing is None:
+                    into.children[key] = child
+                else:
+                    stack.append((existing, child))
+
+    def templates(self) -> list[dict]:
+        """Every template with its per-method stats, most requested first."""
+        results = []
+        for (scheme, host), root in self.hosts.items():
+            stack = [(root, '')]
+            while stack:
+                node, path = stack.pop()
+                for method, stats in node.methods.items():
+                    results.append({
+                        'method': method,
+                        'template': f'{scheme}://{host}{path}',
+                        'domain': host,
+                        'count': stats['count'],
+                        'type': stats['type'],
+                        'has_post_data': stats['has_post_data'],
+                        'query_keys': sorted(stats['query_keys']),
+                        'examples': list(stats['examples']),
+                    })
+                stack.extend((child, f'{path}/{key}') for key, child in reversed(node.children.items()))
+        results.sort(key=lambda t: t['count'], reverse=True)
+        return results
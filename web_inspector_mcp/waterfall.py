@@ -0,0 +1,137 @@
+import bisect
+import re
+from datetime import datetime
+
+from web_inspector_mcp.records import HAR_PHASES, RequestRecord
+
+# Phases that add up to a request's total time (``ssl`` is inside ``connect``)
+_TOTAL_PHASES = tuple(p for p in HAR_PHASES if p != 'ssl')
+# Rows of the waterfall returned; the chain and totals cover every request
+WATERFALL_ROWS = 50
+# Fraction and UTC offset of an ISO 8601 timestamp, which Python 3.10's
+# fromisoformat only accepts as 3 or 6 digits and '+HH:MM'
+_ISO_TAIL = re.compile(r'(?:\.(\d+))?(Z|[+-]\d{2}:?\d{2})?$', re.IGNORECASE)
+
+
+def started_ms(started: str) -> float | None:
+    """Milliseconds since the epoch of a HAR ``startedDateTime``, or ``None``."""
+    if not started:
+        return None
+    match = _ISO_TAIL.search(started)
+    fraction, offset = match.groups()
+    text = started[:match.start()]
+    if fraction:
+        text += '.' + fraction[:6].ljust(6, '0')
+    if offset:
+        text += '+00:00' if offset in 'Zz' else f'{offset[:3]}:{offset[-2:]}'
+    try:
+        return datetime.fromisoformat(text).timestamp() * 1000
+    except ValueError:
+        return None
+
+
+def phases(record: RequestRecord) -> dict[str, float]:
+    """A record's HAR timings by phase, with phases that didn't apply as 0."""
+    return {
+        name: round(value, 1) if isinstance(value, (int, float)) and value > 0 else 0
+        for name, value in zip(HAR_PHASES, record.timings, strict=False)
+    }
+
+
+def _add_phases(totals: dict, values: dict):
+    for name, value in values.items():
+        totals[name] = totals.get(name, 0) + value
+
+
+class TimingAggregator:
+    """
+    Explains where a page load spent its time from the per-phase HAR
+    ``timings`` of each request (blocked, dns, connect, ssl, send, wait,
+    receive): totals for the page and per origin, a waterfall of request
+    offsets, and the critical request chain.
+
+    HAR entries don't record which request triggered which, so the chain
+    is inferred from timing: walking back from the last request to finish
+    before the load event, each step goes to the request that finished
+    most recently before the current one started.
+    """
+
+    def __init__(self, rows: int = WATERFALL_ROWS):
+        self.rows = rows
+        self.totals: dict[str, float] = {}
+        self.by_origin: dict[str, dict] = {}
+        # (start_ms, end_ms, record) for requests with a known start
+        self._spans: list[tuple[float, float, RequestRecord]] = []
+
+    def add_record(self, record: RequestRecord):
+        values = phases(record)
+        if values:
+            _add_phases(self.totals, values)
+            origin = self.by_origin.setdefault(f'{record.scheme}://{record.domain}', {'requests': 0})
+            origin['requests'] += 1
+            _add_phases(origin, values)
+        start = started_ms(record.started)
+        if start is not None:
+            self._spans.append((start, start + max(record.time_ms or 0, 0), record))
+
+    def _row(self, start: float, end: float, record: RequestRecord, origin: float) -> dict:
+        return {
+            'url': record.url[:120],
+            'type': record.resource_type or '?',
+            'start_ms': round(start - origin, 1),
+            'end_ms': round(end - origin, 1),
+            'duration_ms': round(end - start, 1),
+            'phases': phases(record),
+        }
+
+    def critical_chain(self, load_event_ms: float | None = None) -> list[dict]:
+        """
+        The chain of requests leading up to the load event (or to the last
+        request, when it isn't known), first request first. Each row's
+        ``gap_ms`` is the time between the previous request finishing and
+        this one starting.
+        """
+        if not self._spans:
+            return []
+        spans = sorted(self._spans, key=lambda s: s[1])
+        ends = [s[1] for s in spans]
+        origin = min(s[0] for s in spans)
+        cutoff = len(spans)
+        if load_event_ms:
+            cutoff = bisect.bisect_right(ends, origin + load_event_ms) or len(spans)
+        position = cutoff - 1
+        chain = [spans[position]]
+        while True:
+            # The latest other request to finish before this one started;
+            # positions only decrease, so the walk always ends
+            position = min(bisect.bisect_right(ends, spans[position][0]), position) - 1
+            if position < 0:
+                break
+            chain.append(spans[position])
+        chain.reverse()
+        rows = []
+        previous_end = None
+        for start, end, record in chain:
+            row = self._row(start, end, record, origin)
+            row['gap_ms'] = round(start - previous_end, 1) if previous_end is not None else 0
+            rows.append(row)
+            previous_end = end
+        return rows
+
+    def result(self, timing: dict | None = None) -> dict:
+        total = sum(self.totals.get(p, 0) for p in _TOTAL_PHASES)
+        spans = sorted(self._spans, key=lambda s: s[0])
+        origin = spans[0][0] if spans else 0
+        return {
+            'phase_totals_ms': {p: round(v, 1) for p, v in self.totals.items()},
+            'phase_share': {
+                p: round(self.totals.get(p, 0) / total, 3) for p in _TOTAL_PHASES
+            } if total else {},
+            'phases_by_origin': {
+                o: {k: round(v, 1) for k, v in stats.items()}
+                for o, stats in sorted(self.by_origin.items(), key=lambda item: -item[1].get('wait', 0))
+            },
+            'waterfall': [self._row(start, end, record, origin) for start, end, record in spans[:self.rows]],
+            'waterfall_total': len(spans),
+            'critical_chain': self.critical_chain((timing or {}).get('load_event')),
+        }